@@ -8,6 +8,11 @@ from .providers import (
     LLMInitializationError,
     LLMProviders,
 )
+from .hedging import HedgedChatModel, get_all_hedge_stats
+from .response_cache import CachedChatModel, get_response_cache_stats
+from .http_clients import HttpClientRegistry, get_http_pool_stats
+from .rate_limiter import RateLimitedChatModel, get_rate_limit_stats
+from .single_flight import SingleFlightChatModel, get_single_flight_stats
 
 __all__ = [
     "LLMConfig",
@@ -15,4 +20,14 @@ __all__ = [
     "get_llm",
     "LLMInitializationError",
     "LLMProviders",
+    "HedgedChatModel",
+    "get_all_hedge_stats",
+    "CachedChatModel",
+    "get_response_cache_stats",
+    "HttpClientRegistry",
+    "get_http_pool_stats",
+    "RateLimitedChatModel",
+    "get_rate_limit_stats",
+    "SingleFlightChatModel",
+    "get_single_flight_stats",
 ]
@@ -0,0 +1,226 @@
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+# Hedging is opt-in: LLM_HEDGING_ENABLED=true makes LLMFactory.create_hedged_llm wrap the primary model
+LLM_HEDGING_ENABLED = os.getenv("LLM_HEDGING_ENABLED", "false").lower() == "true"
+# The backup fires once the primary is slower than this percentile of its recent first-token latencies
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "0.95"))
+# Delay used until enough latencies have been observed, and bounds of the computed delay (seconds)
+LLM_HEDGE_DEFAULT_DELAY = float(os.getenv("LLM_HEDGE_DEFAULT_DELAY", "2.0"))
+LLM_HEDGE_MIN_DELAY = float(os.getenv("LLM_HEDGE_MIN_DELAY", "0.3"))
+LLM_HEDGE_MAX_DELAY = float(os.getenv("LLM_HEDGE_MAX_DELAY", "10.0"))
+
+_LATENCY_SAMPLES = 200
+_MIN_SAMPLES = 20
+
+
+class HedgeStats:
+    """First-token latencies of the primary model and hedging outcomes for one node"""
+
+    def __init__(self, node_name: str):
+        self.node_name = node_name
+        self._latencies: Deque[float] = deque(maxlen=_LATENCY_SAMPLES)
+        self.requests = 0
+        self.hedged = 0
+        self.primary_wins = 0
+        self.backup_wins = 0
+        self.failures = 0
+
+    def record_latency(self, latency: float):
+        self._latencies.append(latency)
+
+    def hedge_delay(self) -> float:
+        if len(self._latencies) < _MIN_SAMPLES:
+            return LLM_HEDGE_DEFAULT_DELAY
+        samples = sorted(self._latencies)
+        delay = samples[min(int(len(samples) * LLM_HEDGE_PERCENTILE), len(samples) - 1)]
+        return min(max(delay, LLM_HEDGE_MIN_DELAY), LLM_HEDGE_MAX_DELAY)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_rate": self.hedged / self.requests if self.requests else 0.0,
+            "primary_wins": self.primary_wins,
+            "backup_wins": self.backup_wins,
+            "backup_win_rate": self.backup_wins / self.hedged if self.hedged else 0.0,
+            "failures": self.failures,
+            "hedge_delay_ms": round(self.hedge_delay() * 1000, 1),
+        }
+
+
+_hedge_stats: Dict[str, HedgeStats] = {}
+
+
+def get_hedge_stats(node_name: str) -> HedgeStats:
+    stats = _hedge_stats.get(node_name)
+    if stats is None:
+        stats = _hedge_stats[node_name] = HedgeStats(node_name)
+    return stats
+
+
+def get_all_hedge_stats() -> Dict[str, Dict[str, Any]]:
+    """Hedge rate and win rate per node (for monitoring)"""
+    return {node_name: stats.get_stats() for node_name, stats in _hedge_stats.items()}
+
+
+async def _first_chunk(stream: AsyncIterator[AIMessageChunk]) -> Tuple[AsyncIterator[AIMessageChunk], AIMessageChunk]:
+    return stream, await stream.__anext__()
+
+
+async def _cancel(task: asyncio.Task):
+    task.cancel()
+    try:
+        await task
+    except BaseException:
+        pass
+
+
+async def _close_stream(stream: AsyncIterator[AIMessageChunk]):
+    try:
+        await stream.aclose()
+    except Exception:
+        pass
+
+
+class HedgedChatModel(BaseChatModel):
+    """
+    Chat model that hedges a slow primary with a backup model on another provider.
+
+    The primary is called first. If its first token (or its whole response, for non-streaming
+    calls) has not arrived after the node's hedge delay, the same request goes to the backup.
+    Whichever answers first is used and the other one is cancelled. A primary that fails
+    before answering is replaced by the backup right away.
+    """
+    primary: BaseChatModel
+    backup: BaseChatModel
+    node_name: str
+
+    @property
+    def _llm_type(self) -> str:
+        return "hedged"
+
+    @property
+    def stats(self) -> HedgeStats:
+        return get_hedge_stats(self.node_name)
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        # Synchronous calls are not on the request path; no hedging there
+        message = self.primary.invoke(messages, stop=stop, **kwargs)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _race(self, start_primary, start_backup) -> Tuple[asyncio.Task, bool, Optional[asyncio.Task]]:
+        """
+        Run the primary, hedge with the backup after the delay.
+        Returns the finished winning task, whether it is the backup, and the losing task (still running).
+        """
+        stats = self.stats
+        stats.requests += 1
+        started = time.monotonic()
+
+        primary = asyncio.ensure_future(start_primary())
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=stats.hedge_delay())
+        except asyncio.CancelledError:
+            primary.cancel()
+            raise
+        if done and primary.exception() is None:
+            stats.record_latency(time.monotonic() - started)
+            stats.primary_wins += 1
+            return primary, False, None
+
+        stats.hedged += 1
+        backup = asyncio.ensure_future(start_backup())
+        pending = {backup} if done else {primary, backup}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        continue
+                    if task is primary:
+                        stats.record_latency(time.monotonic() - started)
+                        stats.primary_wins += 1
+                        return primary, False, backup if backup in pending else None
+                    stats.backup_wins += 1
+                    if primary in pending:
+                        # Censored sample: the primary took at least this long
+                        stats.record_latency(time.monotonic() - started)
+                    return backup, True, primary if primary in pending else None
+        except asyncio.CancelledError:
+            primary.cancel()
+            backup.cancel()
+            raise
+
+        stats.failures += 1
+        raise primary.exception() or backup.exception()
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        winner, _, loser = await self._race(
+            lambda: self.primary.ainvoke(messages, stop=stop, **kwargs),
+            lambda: self.backup.ainvoke(messages, stop=stop, **kwargs),
+        )
+        if loser is not None:
+            await _cancel(loser)
+
+        message = winner.result()
+        if not isinstance(message, AIMessage):
+            message = AIMessage(content=message.content)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        primary_stream = self.primary.astream(messages, stop=stop, **kwargs)
+        backup_stream = self.backup.astream(messages, stop=stop, **kwargs)
+
+        try:
+            winner, is_backup, loser = await self._race(
+                lambda: _first_chunk(primary_stream),
+                lambda: _first_chunk(backup_stream),
+            )
+        except BaseException:
+            await _close_stream(primary_stream)
+            await _close_stream(backup_stream)
+            raise
+
+        if loser is not None:
+            await _cancel(loser)
+        await _close_stream(primary_stream if is_backup else backup_stream)
+
+        stream, chunk = winner.result()
+        try:
+            while True:
+                if run_manager is not None and isinstance(chunk.content, str):
+                    await run_manager.on_llm_new_token(chunk.content, chunk=ChatGenerationChunk(message=chunk))
+                yield ChatGenerationChunk(message=chunk)
+                try:
+                    chunk = await stream.__anext__()
+                except StopAsyncIteration:
+                    return
+        finally:
+            await _close_stream(stream)
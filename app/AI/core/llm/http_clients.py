@@ -0,0 +1,187 @@
+import os
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.utils.logger import logger
+
+try:
+    import h2  # noqa: F401
+    HAS_H2 = True
+except ImportError:
+    HAS_H2 = False
+
+# Set LLM_HTTP_SHARED_CLIENTS=false to let every SDK client open its own connections again
+LLM_HTTP_SHARED_CLIENTS = os.getenv("LLM_HTTP_SHARED_CLIENTS", "true").lower() == "true"
+# Pool size and keep-alive per provider host
+LLM_HTTP_MAX_CONNECTIONS = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "100"))
+LLM_HTTP_MAX_KEEPALIVE = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "20"))
+LLM_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "60"))
+# HTTP/2 needs the optional h2 package
+LLM_HTTP_HTTP2 = os.getenv("LLM_HTTP_HTTP2", "false").lower() == "true"
+# Seconds; the read timeout bounds the gap between two streamed chunks, not the whole response
+LLM_HTTP_CONNECT_TIMEOUT = float(os.getenv("LLM_HTTP_CONNECT_TIMEOUT", "5"))
+LLM_HTTP_READ_TIMEOUT = float(os.getenv("LLM_HTTP_READ_TIMEOUT", "60"))
+LLM_HTTP_POOL_TIMEOUT = float(os.getenv("LLM_HTTP_POOL_TIMEOUT", "10"))
+
+
+def host_key(url: str) -> str:
+    """scheme://host[:port] of a URL, the unit a pool is shared by"""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class _SharedTransport(httpx.AsyncBaseTransport):
+    """
+    Transport handed to clients whose owner closes them when done (e.g. MCP sessions):
+    requests go through the shared pool, closing the client leaves the pool open.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self):
+        pass
+
+
+class _HostPool:
+    """Pooled transport and request counters for one provider host"""
+
+    def __init__(self, host: str):
+        self.host = host
+        self.http2 = LLM_HTTP_HTTP2 and HAS_H2
+        self.transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(
+                max_connections=LLM_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=LLM_HTTP_KEEPALIVE_EXPIRY,
+            ),
+            http2=self.http2,
+        )
+        self.client = httpx.AsyncClient(
+            transport=self.transport,
+            timeout=default_timeout(),
+            event_hooks=self.event_hooks(),
+        )
+        self.requests = 0
+        self.peak_active = 0
+
+    async def _on_request(self, request: httpx.Request):
+        self.requests += 1
+
+    async def _on_response(self, response: httpx.Response):
+        # The response's connection is still busy while its body is read
+        self.peak_active = max(self.peak_active, self._active_connections())
+
+    def event_hooks(self) -> Dict[str, list]:
+        return {"request": [self._on_request], "response": [self._on_response]}
+
+    def _connections(self) -> list:
+        # httpcore keeps its connections on the pool; not public API, so read defensively
+        pool = getattr(self.transport, "_pool", None)
+        return list(getattr(pool, "connections", []) or [])
+
+    def _active_connections(self) -> int:
+        return sum(1 for connection in self._connections() if not connection.is_idle())
+
+    def get_stats(self) -> Dict[str, Any]:
+        connections = self._connections()
+        idle = sum(1 for connection in connections if connection.is_idle())
+        pool = getattr(self.transport, "_pool", None)
+        return {
+            "http2": self.http2,
+            "max_connections": LLM_HTTP_MAX_CONNECTIONS,
+            "max_keepalive": LLM_HTTP_MAX_KEEPALIVE,
+            "connections": len(connections),
+            "active": len(connections) - idle,
+            "idle": idle,
+            "queued_requests": sum(
+                1 for request in getattr(pool, "_requests", []) or [] if getattr(request, "connection", None) is None),
+            "peak_active": self.peak_active,
+            "requests": self.requests,
+            "utilization": (len(connections) - idle) / LLM_HTTP_MAX_CONNECTIONS if LLM_HTTP_MAX_CONNECTIONS else 0.0,
+        }
+
+
+def default_timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        connect=LLM_HTTP_CONNECT_TIMEOUT,
+        read=LLM_HTTP_READ_TIMEOUT,
+        write=LLM_HTTP_READ_TIMEOUT,
+        pool=LLM_HTTP_POOL_TIMEOUT,
+    )
+
+
+class HttpClientRegistry:
+    """
+    Singleton registry of process-wide async HTTP clients, one connection pool per provider host.
+
+    LLM clients, the Tavily search tool and MCP sessions all send their requests through these
+    pools, so keep-alive connections and TLS sessions are reused across nodes and requests.
+    """
+    _instance = None
+
+    def __init__(self):
+        self._pools: Dict[str, _HostPool] = {}
+
+        if LLM_HTTP_HTTP2 and not HAS_H2:
+            logger.warning("LLM_HTTP_HTTP2 is set but the h2 package is not installed, using HTTP/1.1")
+
+    @classmethod
+    def get_instance(cls) -> 'HttpClientRegistry':
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def _pool(self, url: str) -> _HostPool:
+        host = host_key(url)
+        pool = self._pools.get(host)
+        if pool is None:
+            pool = self._pools[host] = _HostPool(host)
+        return pool
+
+    def get_async_client(self, url: str) -> Optional[httpx.AsyncClient]:
+        """The shared client for the URL's host, or None when shared clients are disabled"""
+        if not LLM_HTTP_SHARED_CLIENTS:
+            return None
+        return self._pool(url).client
+
+    def client_factory(self, url: str) -> Optional[Callable[..., httpx.AsyncClient]]:
+        """
+        Factory of short-lived clients on the shared pool of the URL's host, for libraries that
+        create and close their own client (the MCP adapters' httpx_client_factory).
+        """
+        if not LLM_HTTP_SHARED_CLIENTS:
+            return None
+        pool = self._pool(url)
+
+        def factory(headers: Optional[Dict[str, str]] = None, timeout: Optional[httpx.Timeout] = None,
+                    auth: Optional[httpx.Auth] = None) -> httpx.AsyncClient:
+            return httpx.AsyncClient(
+                transport=_SharedTransport(pool.transport),
+                headers=headers,
+                timeout=timeout if timeout is not None else default_timeout(),
+                auth=auth,
+                event_hooks=pool.event_hooks(),
+            )
+        return factory
+
+    async def aclose(self):
+        for pool in self._pools.values():
+            try:
+                await pool.client.aclose()
+            except Exception as e:
+                logger.error(f"Error closing HTTP pool for {pool.host}: {e}")
+        self._pools = {}
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Connection pool utilization per provider host (for monitoring)"""
+        return {host: pool.get_stats() for host, pool in self._pools.items()}
+
+
+def get_http_pool_stats() -> Dict[str, Dict[str, Any]]:
+    return HttpClientRegistry.get_instance().get_stats()
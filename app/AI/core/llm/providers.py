@@ -1,19 +1,24 @@
 from typing import Optional, TypeAlias, Dict, Any
 from enum import Enum
 from pydantic import BaseModel, Field, SecretStr
-from langchain_deepseek import ChatDeepSeek
-from langchain_openai import ChatOpenAI
 from langchain_core.language_models.chat_models import BaseChatModel
-from dotenv import load_dotenv, find_dotenv
 from tenacity import retry, stop_after_attempt, wait_exponential
+import asyncio
 import os
 import logging
 import json
 
+from app.utils.env import load_env
+from .hedging import HedgedChatModel, LLM_HEDGING_ENABLED
+from .response_cache import CachedChatModel, LLM_RESPONSE_CACHE_ENABLED, LLM_RESPONSE_CACHE_FORCE
+from .http_clients import HttpClientRegistry
+from .rate_limiter import RateLimitedChatModel, RateLimiterRegistry
+from .single_flight import SingleFlightChatModel, LLM_SINGLE_FLIGHT_ENABLED
+
 logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(), format='%(asctime)s - %(levelname)s - %(name)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-load_dotenv(find_dotenv())
+load_env()
 
 # BasedLLMType: TypeAlias = BaseChatModel | LLM
 
@@ -23,6 +28,17 @@ OPENAI_API_KEY: Optional[str] = os.getenv("OPENAI_API_KEY") # Added for OpenAI
 HUGGINGFACE_API_KEY: Optional[str] = os.getenv("HUGGINGFACE_API_KEY")
 # Add other API keys here as you support more providers, e.g., ANTHROPIC_API_KEY
 
+_PROVIDER_API_KEYS: Dict[str, Optional[str]] = {
+    "deepseek": DEEPSEEK_API_KEY,
+    "openai": OPENAI_API_KEY,
+}
+
+# Endpoints the provider SDKs call, used to pick the shared connection pool
+_PROVIDER_BASE_URLS: Dict[str, str] = {
+    "deepseek": os.getenv("DEEPSEEK_API_BASE", "https://api.deepseek.com/v1"),
+    "openai": os.getenv("OPENAI_BASE_URL") or os.getenv("OPENAI_API_BASE") or "https://api.openai.com/v1",
+}
+
 if not DEEPSEEK_API_KEY:
     logger.warning("DEEPSEEK_API_KEY not found. DeepSeek LLM creation will fail if attempted.")
 if not OPENAI_API_KEY:
@@ -46,6 +62,10 @@ class LLMConfig(BaseModel):
     temperature: float = Field(0.1, ge=0.0, le=2.0, description="Sampling temperature (0.0 to 2.0).")
     model_kwargs: Optional[Dict[str, Any]] = None
 
+def _config_key(config: LLMConfig) -> str:
+    """Serialized model configuration, the part of a request key that identifies the model"""
+    return json.dumps(config.model_dump(exclude_none=True), sort_keys=True)
+
 class LLMFactory:
     """Factory for creating LLM instances based on configuration.
     Supports multiple providers like DeepSeek and OpenAI.
@@ -80,11 +100,18 @@ class LLMFactory:
         }
         if config.model_kwargs is not None:
             input_params["model_kwargs"] = config.model_kwargs
+        # Every instance for the same provider host shares one connection pool
+        http_async_client = HttpClientRegistry.get_instance().get_async_client(
+            _PROVIDER_BASE_URLS.get(config.provider, ""))
+        if http_async_client is not None:
+            input_params["http_async_client"] = http_async_client
 
         try:
             if config.provider == LLMProviders.DEEPSEEK.value:
                 if not DEEPSEEK_API_KEY:
                     raise LLMInitializationError("DEEPSEEK_API_KEY is not configured.")
+                # Provider SDKs are imported on first use, they dominate the app's import time
+                from langchain_deepseek import ChatDeepSeek
                 llm_instance = ChatDeepSeek(
                     api_key=SecretStr(DEEPSEEK_API_KEY),
                     **input_params
@@ -93,6 +120,7 @@ class LLMFactory:
             elif config.provider == LLMProviders.OPENAI.value:
                 if not OPENAI_API_KEY:
                     raise LLMInitializationError("OPENAI_API_KEY is not configured.")
+                from langchain_openai import ChatOpenAI
                 llm_instance = ChatOpenAI(
                     api_key=SecretStr(OPENAI_API_KEY),
                     **input_params
@@ -107,6 +135,11 @@ class LLMFactory:
             else:
                 raise LLMInitializationError(f"Unsupported LLM provider: {config.provider}")
 
+            # Calls to a model with a configured quota wait for admission instead of running into 429s
+            limiter = RateLimiterRegistry.get_instance().get(config.provider, config.model)
+            if limiter is not None:
+                llm_instance = RateLimitedChatModel(inner=llm_instance, limiter=limiter)
+
             # Cache the newly created instance
             cls._llm_cache[cache_key] = llm_instance
             return llm_instance
@@ -116,5 +149,103 @@ class LLMFactory:
         except Exception as e:
             raise LLMInitializationError(f"Error initializing LLM for '{config.provider}' model '{config.model}': {str(e)}") from e
 
+    @classmethod
+    def create_hedged_llm(cls, config: LLMConfig, backup_config: LLMConfig, node_name: str) -> BaseChatModel:
+        """Creates the primary LLM, hedged with the backup LLM when LLM_HEDGING_ENABLED is set.
+
+        Args:
+            config: LLMConfig of the primary model.
+            backup_config: LLMConfig of an equivalent model on another provider.
+            node_name: Name under which hedge rate and win rate are reported.
+        Returns:
+            A HedgedChatModel, or the primary model when hedging is disabled or the backup cannot be created;
+            behind single-flight coalescing and the response cache when they are enabled.
+        """
+        primary = cls.create_llm(config)
+        if not LLM_HEDGING_ENABLED:
+            return cls.with_response_cache(cls.with_single_flight(primary, config, node_name), config, node_name)
+        if not _PROVIDER_API_KEYS.get(backup_config.provider):
+            logger.warning(f"Hedging disabled for {node_name}, no API key for backup provider '{backup_config.provider}'")
+            return cls.with_response_cache(cls.with_single_flight(primary, config, node_name), config, node_name)
+
+        try:
+            backup = cls.create_llm(backup_config)
+        except Exception as e:
+            logger.error(f"Hedging disabled for {node_name}, backup LLM unavailable: {e}")
+            return cls.with_response_cache(cls.with_single_flight(primary, config, node_name), config, node_name)
+
+        hedged = HedgedChatModel(primary=primary, backup=backup, node_name=node_name)
+        return cls.with_response_cache(cls.with_single_flight(hedged, config, node_name), config, node_name)
+
+    @classmethod
+    def with_single_flight(cls, llm: BaseChatModel, config: LLMConfig, node_name: str) -> BaseChatModel:
+        """Wraps an LLM so that concurrent identical calls share one upstream request when
+        LLM_SINGLE_FLIGHT_ENABLED is set.
+
+        Args:
+            llm: The model created from config.
+            config: LLMConfig of the model, part of the request key.
+            node_name: Name under which the coalescing ratio is reported.
+        Returns:
+            A SingleFlightChatModel, or llm itself when coalescing is disabled.
+        """
+        if not LLM_SINGLE_FLIGHT_ENABLED:
+            return llm
+        return SingleFlightChatModel(inner=llm, node_name=node_name, config_key=_config_key(config))
+
+    @classmethod
+    def with_response_cache(cls, llm: BaseChatModel, config: LLMConfig, node_name: str, force: bool = False) -> BaseChatModel:
+        """Wraps an LLM in the exact-match response cache when LLM_RESPONSE_CACHE_ENABLED is set.
+
+        Args:
+            llm: The model created from config.
+            config: LLMConfig of the model, part of the cache key.
+            node_name: Name under which hits and misses are reported.
+            force: Cache responses even when the model samples with temperature > 0.
+        Returns:
+            A CachedChatModel, or llm itself when the cache is disabled.
+        """
+        if not LLM_RESPONSE_CACHE_ENABLED:
+            return llm
+        return CachedChatModel(
+            inner=llm,
+            node_name=node_name,
+            config_key=_config_key(config),
+            cacheable=config.temperature == 0 or force or LLM_RESPONSE_CACHE_FORCE,
+        )
+
+
+    @classmethod
+    async def preconnect(cls, timeout: float = 5.0) -> Dict[str, bool]:
+        """Opens a pooled connection to each provider used by the cached LLMs, so the first
+        request does not pay for DNS and the TLS handshake.
+
+        Sends one cheap authenticated request (list models) per provider endpoint through the
+        model's own async client; the connection stays in that client's pool.
+
+        Args:
+            timeout: Seconds to wait for each provider.
+        Returns:
+            Whether the request succeeded, keyed by provider base URL.
+        """
+        clients: Dict[str, Any] = {}
+        for llm_instance in cls._llm_cache.values():
+            # Unwrap rate-limited models to reach the SDK client
+            llm_instance = getattr(llm_instance, "inner", llm_instance)
+            client = getattr(llm_instance, "root_async_client", None)
+            if client is not None:
+                clients.setdefault(str(client.base_url), client)
+
+        async def _connect(base_url: str, client: Any) -> bool:
+            try:
+                await asyncio.wait_for(client.models.list(), timeout=timeout)
+                return True
+            except Exception as e:
+                logger.warning(f"Could not preconnect to {base_url}: {e}")
+                return False
+
+        results = await asyncio.gather(*(_connect(url, client) for url, client in clients.items()))
+        return dict(zip(clients, results))
+
 def get_llm(config: LLMConfig) -> BaseChatModel:
     return LLMFactory.create_llm(config)
\ No newline at end of file
@@ -0,0 +1,326 @@
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from app.utils.logger import logger
+
+# Quotas per model, e.g. "openai/gpt-4.1=500:30000,openai/*=3500:200000,deepseek/deepseek-chat=60"
+# (requests per minute, optional tokens per minute); models without an entry are not limited
+LLM_RATE_LIMITS = os.getenv("LLM_RATE_LIMITS", "")
+# Share of each quota the limiter admits, leaving room for other clients of the same key
+LLM_RATE_LIMIT_HEADROOM = float(os.getenv("LLM_RATE_LIMIT_HEADROOM", "0.9"))
+# Completion tokens assumed per call until the real usage is known
+LLM_RATE_LIMIT_COMPLETION_TOKENS = int(os.getenv("LLM_RATE_LIMIT_COMPLETION_TOKENS", "512"))
+
+# Queue wait times kept per model for the percentiles
+_WAIT_SAMPLES = 512
+# Rough characters per token of English text and JSON
+_CHARS_PER_TOKEN = 4
+
+
+def _parse_limits(value: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Parse LLM_RATE_LIMITS into {"provider/model": (rpm, tpm)}; a tpm of 0 means requests only.
+    "provider/*" applies to every model of the provider without an entry of its own.
+    """
+    limits: Dict[str, Tuple[int, int]] = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        try:
+            name, _, limit = item.partition("=")
+            rpm, _, tpm = limit.partition(":")
+            limits[name.strip()] = (int(rpm), int(tpm) if tpm else 0)
+        except ValueError:
+            logger.error(f"Invalid LLM_RATE_LIMITS entry ignored: {item}")
+    return limits
+
+
+def estimate_tokens(messages: List[BaseMessage], kwargs: Dict[str, Any]) -> int:
+    """Prompt tokens estimated from the message length, plus the expected completion"""
+    characters = 0
+    for message in messages:
+        content = message.content
+        characters += len(content) if isinstance(content, str) else len(json.dumps(content, default=str))
+    if "tools" in kwargs:
+        characters += len(json.dumps(kwargs["tools"], default=str))
+    completion = kwargs.get("max_tokens") or kwargs.get("max_completion_tokens") or LLM_RATE_LIMIT_COMPLETION_TOKENS
+    return characters // _CHARS_PER_TOKEN + completion
+
+
+class TokenBucket:
+    """Bucket refilled continuously at per_minute / 60 per second, holding at most per_minute"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.level = per_minute
+        self._updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, amount: float) -> float:
+        """Seconds until amount is available (after refill)"""
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+
+class ModelRateLimiter:
+    """
+    Admission control for one provider model: a requests-per-minute and a tokens-per-minute
+    bucket. Calls that do not fit wait in one FIFO queue, so a burst is spread over the quota
+    instead of turning into 429s, and a large request is not starved by small ones behind it.
+    """
+
+    def __init__(self, name: str, rpm: int, tpm: int = 0):
+        self.name = name
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = TokenBucket(rpm) if rpm > 0 else None
+        self._tokens = TokenBucket(tpm) if tpm > 0 else None
+        self._waiters: Deque[Tuple[asyncio.Future, int]] = deque()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        self.admitted = 0
+        self.queued = 0
+        self.peak_queue_depth = 0
+        self.estimated_tokens = 0
+        self.actual_tokens = 0
+        self._wait_samples: Deque[float] = deque(maxlen=_WAIT_SAMPLES)
+        self.max_wait_seen = 0.0
+
+    def _delay(self, tokens: int) -> float:
+        now = time.monotonic()
+        delay = 0.0
+        for bucket, amount in ((self._requests, 1), (self._tokens, tokens)):
+            if bucket is not None:
+                bucket.refill(now)
+                delay = max(delay, bucket.delay(amount))
+        return delay
+
+    def _take(self, tokens: int):
+        if self._requests is not None:
+            self._requests.level -= 1
+        if self._tokens is not None:
+            self._tokens.level -= tokens
+        self.admitted += 1
+        self.estimated_tokens += tokens
+
+    async def acquire(self, tokens: int) -> float:
+        """Wait for admission of a call estimated at tokens. Returns the seconds waited"""
+        if self._tokens is not None:
+            # A single call larger than the whole minute's quota is admitted once the bucket is full
+            tokens = min(tokens, int(self._tokens.capacity))
+
+        if not self._waiters and self._delay(tokens) == 0.0:
+            self._take(tokens)
+            self._record_wait(0.0)
+            return 0.0
+
+        started = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append((future, tokens))
+        self.queued += 1
+        self.peak_queue_depth = max(self.peak_queue_depth, len(self._waiters))
+        self._schedule(0.0)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Admitted just before the caller gave up; return what it took
+                self.reconcile(tokens, 0, refund_request=True)
+            else:
+                self._waiters = deque(waiter for waiter in self._waiters if waiter[0] is not future)
+            raise
+
+        waited = time.monotonic() - started
+        self._record_wait(waited)
+        return waited
+
+    def _schedule(self, delay: float):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = asyncio.get_running_loop().call_later(delay, self._drain)
+
+    def _drain(self):
+        """Admit waiters from the head of the queue while the buckets allow"""
+        self._timer = None
+        while self._waiters:
+            future, tokens = self._waiters[0]
+            if future.cancelled():
+                self._waiters.popleft()
+                continue
+            delay = self._delay(tokens)
+            if delay > 0:
+                self._schedule(delay)
+                return
+            self._waiters.popleft()
+            self._take(tokens)
+            future.set_result(None)
+
+    def reconcile(self, estimated: int, actual: int, refund_request: bool = False):
+        """Correct the token bucket once the real usage of an admitted call is known"""
+        if self._tokens is not None:
+            self._tokens.level = min(self._tokens.capacity, self._tokens.level + estimated - actual)
+        if refund_request and self._requests is not None:
+            self._requests.level = min(self._requests.capacity, self._requests.level + 1)
+        self.actual_tokens += actual
+
+    def _record_wait(self, waited: float):
+        self._wait_samples.append(waited)
+        self.max_wait_seen = max(self.max_wait_seen, waited)
+
+    def _percentile(self, fraction: float) -> float:
+        if not self._wait_samples:
+            return 0.0
+        samples = sorted(self._wait_samples)
+        return samples[min(int(len(samples) * fraction), len(samples) - 1)]
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        if self._requests is not None:
+            self._requests.refill(now)
+        if self._tokens is not None:
+            self._tokens.refill(now)
+        return {
+            "rpm": self.rpm,
+            "tpm": self.tpm,
+            "requests_available": round(self._requests.level, 1) if self._requests is not None else None,
+            "tokens_available": round(self._tokens.level) if self._tokens is not None else None,
+            "queue_depth": len(self._waiters),
+            "peak_queue_depth": self.peak_queue_depth,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "estimated_tokens": self.estimated_tokens,
+            "actual_tokens": self.actual_tokens,
+            "wait_p50_ms": round(self._percentile(0.5) * 1000, 1),
+            "wait_p95_ms": round(self._percentile(0.95) * 1000, 1),
+            "wait_max_ms": round(self.max_wait_seen * 1000, 1),
+        }
+
+
+class RateLimiterRegistry:
+    """
+    Singleton registry of per-model rate limiters, configured by LLM_RATE_LIMITS.
+    Limiters are shared by every node calling the same provider model.
+    """
+    _instance = None
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[int, int]]] = None, headroom: float = LLM_RATE_LIMIT_HEADROOM):
+        self._limits = limits if limits is not None else _parse_limits(LLM_RATE_LIMITS)
+        self.headroom = headroom
+        self._limiters: Dict[str, ModelRateLimiter] = {}
+
+    @classmethod
+    def get_instance(cls) -> 'RateLimiterRegistry':
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def get(self, provider: str, model: str) -> Optional[ModelRateLimiter]:
+        """The model's limiter, or None when no quota is configured for it"""
+        name = f"{provider}/{model}"
+        limiter = self._limiters.get(name)
+        if limiter is None:
+            limit = self._limits.get(name) or self._limits.get(f"{provider}/*")
+            if limit is None:
+                return None
+            rpm, tpm = (max(1, int(quota * self.headroom)) if quota > 0 else 0 for quota in limit)
+            limiter = ModelRateLimiter(name, rpm, tpm)
+            self._limiters[name] = limiter
+        return limiter
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Queue depth, wait times and bucket levels per model (for monitoring)"""
+        return {name: limiter.get_stats() for name, limiter in self._limiters.items()}
+
+
+def get_rate_limit_stats() -> Dict[str, Dict[str, Any]]:
+    return RateLimiterRegistry.get_instance().get_stats()
+
+
+def _total_tokens(message: BaseMessage) -> Optional[int]:
+    usage = getattr(message, "usage_metadata", None)
+    return usage.get("total_tokens") if usage else None
+
+
+class RateLimitedChatModel(BaseChatModel):
+    """Chat model that waits for admission by its ModelRateLimiter before every call"""
+    inner: BaseChatModel
+    limiter: ModelRateLimiter
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    @property
+    def _llm_type(self) -> str:
+        return "rate-limited"
+
+    def bind_tools(self, tools, **kwargs: Any):
+        # Let the wrapped model format the tools, and send them through this model
+        binding = self.inner.bind_tools(tools, **kwargs)
+        return self.bind(**binding.kwargs)
+
+    async def _admit(self, messages: List[BaseMessage], kwargs: Dict[str, Any]) -> int:
+        estimated = estimate_tokens(messages, kwargs)
+        waited = await self.limiter.acquire(estimated)
+        if waited > 1.0:
+            logger.info(f"{self.limiter.name} call waited {waited:.1f}s for its rate limit")
+        return estimated
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        # Synchronous calls are not on the request path; no admission control there
+        message = self.inner.invoke(messages, stop=stop, **kwargs)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        estimated = await self._admit(messages, kwargs)
+        try:
+            message = await self.inner.ainvoke(messages, stop=stop, **kwargs)
+        except BaseException:
+            self.limiter.reconcile(estimated, estimated)
+            raise
+        actual = _total_tokens(message)
+        self.limiter.reconcile(estimated, actual if actual is not None else estimated)
+
+        if not isinstance(message, AIMessage):
+            message = AIMessage(content=message.content)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        estimated = await self._admit(messages, kwargs)
+        actual: Optional[int] = None
+        try:
+            async for chunk in self.inner.astream(messages, stop=stop, **kwargs):
+                tokens = _total_tokens(chunk)
+                if tokens is not None:
+                    actual = (actual or 0) + tokens
+                if run_manager is not None and isinstance(chunk.content, str):
+                    await run_manager.on_llm_new_token(chunk.content, chunk=ChatGenerationChunk(message=chunk))
+                yield ChatGenerationChunk(message=chunk)
+        finally:
+            self.limiter.reconcile(estimated, actual if actual is not None else estimated)
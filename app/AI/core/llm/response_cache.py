@@ -0,0 +1,348 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    BaseMessage,
+    message_chunk_to_message,
+    message_to_dict,
+    messages_from_dict,
+)
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from app.utils.logger import logger
+
+try:
+    import aiosqlite
+    HAS_AIOSQLITE = True
+except ImportError:
+    aiosqlite = None
+    HAS_AIOSQLITE = False
+
+# The cache is opt-in: LLM_RESPONSE_CACHE_ENABLED=true makes LLMFactory wrap the models it returns
+LLM_RESPONSE_CACHE_ENABLED = os.getenv("LLM_RESPONSE_CACHE_ENABLED", "false").lower() == "true"
+LLM_RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("LLM_RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+LLM_RESPONSE_CACHE_TTL = float(os.getenv("LLM_RESPONSE_CACHE_TTL", "86400"))
+# On-disk tier shared by workers and restarts; empty keeps the cache in memory only
+LLM_RESPONSE_CACHE_SQLITE_PATH = os.getenv("LLM_RESPONSE_CACHE_SQLITE_PATH", "")
+# Responses sampled with temperature > 0 are not cached unless forced
+LLM_RESPONSE_CACHE_FORCE = os.getenv("LLM_RESPONSE_CACHE_FORCE", "false").lower() == "true"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_responses (
+    cache_key TEXT PRIMARY KEY,
+    node_name TEXT NOT NULL,
+    message TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_responses_expires ON llm_responses (expires_at);
+"""
+
+# Expired rows are purged every this many writes
+_PURGE_EVERY = 256
+
+
+class ResponseCacheStats:
+    """Hits per tier, misses and bypasses for one node"""
+
+    def __init__(self):
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.stores = 0
+        self.errors = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "bypassed": self.bypassed,
+            "stores": self.stores,
+            "errors": self.errors,
+        }
+
+
+class ResponseCache:
+    """
+    Singleton two-tier cache of LLM responses: an in-memory LRU in front of an optional
+    SQLite file. Both tiers expire entries after LLM_RESPONSE_CACHE_TTL seconds.
+    """
+    _instance = None
+
+    def __init__(self, max_entries: int = LLM_RESPONSE_CACHE_MAX_ENTRIES, ttl: float = LLM_RESPONSE_CACHE_TTL,
+                 db_path: str = LLM_RESPONSE_CACHE_SQLITE_PATH):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.db_path = db_path if HAS_AIOSQLITE else ""
+        self._entries: "OrderedDict[str, Tuple[float, BaseMessage]]" = OrderedDict()
+        self._conn = None
+        self._conn_lock = asyncio.Lock()
+        self._writes = 0
+        self._stats: Dict[str, ResponseCacheStats] = {}
+
+        if db_path and not HAS_AIOSQLITE:
+            logger.warning("aiosqlite is not installed, the LLM response cache stays in memory")
+
+    @classmethod
+    def get_instance(cls) -> 'ResponseCache':
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def stats_for(self, node_name: str) -> ResponseCacheStats:
+        stats = self._stats.get(node_name)
+        if stats is None:
+            stats = self._stats[node_name] = ResponseCacheStats()
+        return stats
+
+    async def _get_conn(self):
+        if self._conn is not None or not self.db_path:
+            return self._conn
+
+        async with self._conn_lock:
+            if self._conn is None:
+                directory = os.path.dirname(self.db_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                conn = await aiosqlite.connect(self.db_path, isolation_level=None)
+                await conn.execute("PRAGMA journal_mode=WAL")
+                await conn.execute("PRAGMA busy_timeout=5000")
+                await conn.executescript(_SCHEMA)
+                await conn.execute("DELETE FROM llm_responses WHERE expires_at <= ?", (time.time(),))
+                self._conn = conn
+                logger.info(f"Opened LLM response cache: {self.db_path}")
+        return self._conn
+
+    async def get(self, key: str, node_name: str) -> Optional[BaseMessage]:
+        stats = self.stats_for(node_name)
+        now = time.time()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, message = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                stats.memory_hits += 1
+                return message.model_copy()
+            del self._entries[key]
+
+        try:
+            conn = await self._get_conn()
+            if conn is not None:
+                async with conn.execute(
+                    "SELECT message, expires_at FROM llm_responses WHERE cache_key = ? AND expires_at > ?", (key, now)
+                ) as cursor:
+                    row = await cursor.fetchone()
+                if row is not None:
+                    message = messages_from_dict([json.loads(row[0])])[0]
+                    self._remember(key, row[1], message)
+                    stats.disk_hits += 1
+                    return message.model_copy()
+        except Exception as e:
+            stats.errors += 1
+            logger.error(f"LLM response cache read failed: {e}")
+
+        stats.misses += 1
+        return None
+
+    async def set(self, key: str, message: BaseMessage, node_name: str):
+        stats = self.stats_for(node_name)
+        expires_at = time.time() + self.ttl
+        self._remember(key, expires_at, message)
+        stats.stores += 1
+
+        try:
+            conn = await self._get_conn()
+            if conn is not None:
+                await conn.execute(
+                    "INSERT OR REPLACE INTO llm_responses (cache_key, node_name, message, expires_at) VALUES (?, ?, ?, ?)",
+                    (key, node_name, json.dumps(message_to_dict(message)), expires_at)
+                )
+                self._writes += 1
+                if self._writes % _PURGE_EVERY == 0:
+                    await conn.execute("DELETE FROM llm_responses WHERE expires_at <= ?", (time.time(),))
+        except Exception as e:
+            stats.errors += 1
+            logger.error(f"LLM response cache write failed: {e}")
+
+    def _remember(self, key: str, expires_at: float, message: BaseMessage):
+        self._entries[key] = (expires_at, message)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def aclose(self):
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Entries held and hit/miss counters per node (for monitoring)"""
+        return {
+            "enabled": LLM_RESPONSE_CACHE_ENABLED,
+            "memory_entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "disk_tier": bool(self.db_path),
+            "nodes": {node_name: stats.get_stats() for node_name, stats in self._stats.items()},
+        }
+
+
+def _normalize_message(message: BaseMessage) -> Dict[str, Any]:
+    content = message.content.strip() if isinstance(message.content, str) else message.content
+    normalized = {"type": message.type, "content": content}
+    for attribute in ("name", "tool_call_id"):
+        value = getattr(message, attribute, None)
+        if value:
+            normalized[attribute] = value
+    tool_calls = getattr(message, "tool_calls", None)
+    if tool_calls:
+        normalized["tool_calls"] = [{"name": call["name"], "args": call["args"]} for call in tool_calls]
+    return normalized
+
+
+def request_key(config_key: str, messages: List[BaseMessage], stop: Optional[List[str]], kwargs: Dict[str, Any]) -> str:
+    """Hash of the model configuration, the normalized messages, stop words and call arguments"""
+    payload = json.dumps(
+        {
+            "config": config_key,
+            "messages": [_normalize_message(message) for message in messages],
+            "stop": stop,
+            "kwargs": kwargs,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _to_chunk(message: BaseMessage) -> AIMessageChunk:
+    """A cached response as a single stream chunk"""
+    tool_calls = getattr(message, "tool_calls", None) or []
+    return AIMessageChunk(
+        content=message.content,
+        additional_kwargs=message.additional_kwargs,
+        response_metadata=message.response_metadata,
+        tool_call_chunks=[
+            {"name": call["name"], "args": json.dumps(call["args"]), "id": call.get("id"), "index": index}
+            for index, call in enumerate(tool_calls)
+        ],
+        id=message.id,
+    )
+
+
+def _is_cacheable(message: BaseMessage) -> bool:
+    return bool(message.content) or bool(getattr(message, "tool_calls", None))
+
+
+class CachedChatModel(BaseChatModel):
+    """
+    Chat model that answers byte-identical requests from the ResponseCache.
+
+    The key covers the model configuration, the normalized messages, stop words and call
+    arguments (e.g. bound tools). Requests to models sampled with temperature > 0 go
+    straight to the model unless the cache is forced for them.
+    """
+    inner: BaseChatModel
+    node_name: str
+    # Serialized model configuration, part of every cache key
+    config_key: str
+    cacheable: bool = True
+
+    @property
+    def _llm_type(self) -> str:
+        return "cached"
+
+    def bind_tools(self, tools, **kwargs: Any):
+        # Let the wrapped model format the tools, and send them through this model
+        binding = self.inner.bind_tools(tools, **kwargs)
+        return self.bind(**binding.kwargs)
+
+    def _cache_key(self, messages: List[BaseMessage], stop: Optional[List[str]], kwargs: Dict[str, Any]) -> str:
+        return request_key(self.config_key, messages, stop, kwargs)
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        # Synchronous calls are not on the request path; no caching there
+        message = self.inner.invoke(messages, stop=stop, **kwargs)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        cache = ResponseCache.get_instance()
+        if not self.cacheable:
+            cache.stats_for(self.node_name).bypassed += 1
+            message = await self.inner.ainvoke(messages, stop=stop, **kwargs)
+            return ChatResult(generations=[ChatGeneration(message=message)])
+
+        key = self._cache_key(messages, stop, kwargs)
+        message = await cache.get(key, self.node_name)
+        if message is None:
+            message = await self.inner.ainvoke(messages, stop=stop, **kwargs)
+            if _is_cacheable(message):
+                await cache.set(key, message, self.node_name)
+
+        if not isinstance(message, AIMessage):
+            message = AIMessage(content=message.content)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        cache = ResponseCache.get_instance()
+        key = None
+        if self.cacheable:
+            key = self._cache_key(messages, stop, kwargs)
+            message = await cache.get(key, self.node_name)
+            if message is not None:
+                chunk = _to_chunk(message)
+                if run_manager is not None and isinstance(chunk.content, str):
+                    await run_manager.on_llm_new_token(chunk.content, chunk=ChatGenerationChunk(message=chunk))
+                yield ChatGenerationChunk(message=chunk)
+                return
+        else:
+            cache.stats_for(self.node_name).bypassed += 1
+
+        full: Optional[AIMessageChunk] = None
+        async for chunk in self.inner.astream(messages, stop=stop, **kwargs):
+            full = chunk if full is None else full + chunk
+            if run_manager is not None and isinstance(chunk.content, str):
+                await run_manager.on_llm_new_token(chunk.content, chunk=ChatGenerationChunk(message=chunk))
+            yield ChatGenerationChunk(message=chunk)
+
+        # Only a stream that ran to completion is stored
+        if key is not None and full is not None:
+            message = message_chunk_to_message(full)
+            if _is_cacheable(message):
+                await cache.set(key, message, self.node_name)
+
+
+def get_response_cache_stats() -> Dict[str, Any]:
+    """Response cache size and hit/miss counters per node (for monitoring)"""
+    return ResponseCache.get_instance().get_stats()
@@ -0,0 +1,231 @@
+import asyncio
+import os
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from .response_cache import request_key
+
+# Set LLM_SINGLE_FLIGHT_ENABLED=false to send every call upstream even when an identical one is in flight
+LLM_SINGLE_FLIGHT_ENABLED = os.getenv("LLM_SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+
+
+class SingleFlightStats:
+    """Calls, upstream requests and coalesced followers for one node"""
+
+    def __init__(self):
+        self.calls = 0
+        self.upstream = 0
+        self.coalesced = 0
+        self.abandoned = 0
+        self.peak_followers = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "upstream_requests": self.upstream,
+            "coalesced": self.coalesced,
+            "coalescing_ratio": self.coalesced / self.calls if self.calls else 0.0,
+            "abandoned": self.abandoned,
+            "peak_followers": self.peak_followers,
+        }
+
+
+class _Flight:
+    """
+    One upstream call and the callers waiting for it. The call runs in a task of its own,
+    so a caller that is cancelled leaves without cancelling it for the others.
+    """
+
+    def __init__(self, key: str, streaming: bool):
+        self.key = key
+        self.streaming = streaming
+        self.subscribers = 0
+        self.chunks: List[AIMessageChunk] = []
+        self.message: Optional[BaseMessage] = None
+        self.error: Optional[BaseException] = None
+        self.done = False
+        self.changed = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+    def notify(self):
+        # Wake everyone waiting for the current event; later waiters wait for the next one
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    async def run(self, call: Callable[[], Any]):
+        try:
+            if self.streaming:
+                async for chunk in call():
+                    self.chunks.append(chunk)
+                    self.notify()
+            else:
+                self.message = await call()
+        except asyncio.CancelledError:
+            self.error = asyncio.CancelledError()
+            raise
+        except Exception as e:
+            # Handed to every subscriber instead of being raised from the task
+            self.error = e
+        finally:
+            self.done = True
+            self.notify()
+
+
+class SingleFlight:
+    """
+    Singleton registry of in-flight LLM calls by request key.
+
+    A call whose key matches one already in flight subscribes to it instead of going upstream:
+    a non-streaming call waits for the shared response, a streaming call replays the chunks
+    received so far and then follows the shared stream. Flights are dropped as soon as they
+    finish (remembering responses is the ResponseCache's job); a flight whose subscribers all
+    left is cancelled.
+    """
+    _instance = None
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self._stats: Dict[str, SingleFlightStats] = {}
+
+    @classmethod
+    def get_instance(cls) -> 'SingleFlight':
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def stats_for(self, node_name: str) -> SingleFlightStats:
+        stats = self._stats.get(node_name)
+        if stats is None:
+            stats = self._stats[node_name] = SingleFlightStats()
+        return stats
+
+    def join(self, key: str, streaming: bool, node_name: str, call: Callable[[], Any]) -> _Flight:
+        """Subscribe to the flight of key, starting it with call() when none is in flight"""
+        stats = self.stats_for(node_name)
+        stats.calls += 1
+        flight_key = f"{'stream' if streaming else 'invoke'}:{key}"
+        flight = self._flights.get(flight_key)
+        if flight is None:
+            flight = self._flights[flight_key] = _Flight(flight_key, streaming)
+            flight.task = asyncio.create_task(flight.run(call))
+            flight.task.add_done_callback(lambda _: self._forget(flight))
+            stats.upstream += 1
+        else:
+            stats.coalesced += 1
+        flight.subscribers += 1
+        stats.peak_followers = max(stats.peak_followers, flight.subscribers - 1)
+        return flight
+
+    def leave(self, flight: _Flight, node_name: str):
+        flight.subscribers -= 1
+        if flight.subscribers == 0 and not flight.done:
+            self.stats_for(node_name).abandoned += 1
+            self._forget(flight)
+            flight.task.cancel()
+
+    def _forget(self, flight: _Flight):
+        if self._flights.get(flight.key) is flight:
+            del self._flights[flight.key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Calls in flight and coalescing counters per node (for monitoring)"""
+        return {
+            "enabled": LLM_SINGLE_FLIGHT_ENABLED,
+            "in_flight": len(self._flights),
+            "nodes": {node_name: stats.get_stats() for node_name, stats in self._stats.items()},
+        }
+
+
+class SingleFlightChatModel(BaseChatModel):
+    """
+    Chat model that shares one upstream call between concurrent identical requests.
+    Requests are identical when their ResponseCache key is (same configuration, normalized
+    messages, stop words and call arguments).
+    """
+    inner: BaseChatModel
+    node_name: str
+    # Serialized model configuration, part of every request key
+    config_key: str
+
+    @property
+    def _llm_type(self) -> str:
+        return "single-flight"
+
+    def bind_tools(self, tools, **kwargs: Any):
+        # Let the wrapped model format the tools, and send them through this model
+        binding = self.inner.bind_tools(tools, **kwargs)
+        return self.bind(**binding.kwargs)
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        # Synchronous calls are not on the request path; no coalescing there
+        message = self.inner.invoke(messages, stop=stop, **kwargs)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        registry = SingleFlight.get_instance()
+        flight = registry.join(
+            request_key(self.config_key, messages, stop, kwargs), False, self.node_name,
+            lambda: self.inner.ainvoke(messages, stop=stop, **kwargs),
+        )
+        try:
+            await asyncio.shield(flight.task)
+        finally:
+            registry.leave(flight, self.node_name)
+
+        if flight.error is not None:
+            raise flight.error
+        message = flight.message.model_copy()
+        if not isinstance(message, AIMessage):
+            message = AIMessage(content=message.content)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        registry = SingleFlight.get_instance()
+        flight = registry.join(
+            request_key(self.config_key, messages, stop, kwargs), True, self.node_name,
+            lambda: self.inner.astream(messages, stop=stop, **kwargs),
+        )
+        position = 0
+        try:
+            while True:
+                while position < len(flight.chunks):
+                    chunk = flight.chunks[position]
+                    position += 1
+                    if run_manager is not None and isinstance(chunk.content, str):
+                        await run_manager.on_llm_new_token(chunk.content, chunk=ChatGenerationChunk(message=chunk))
+                    yield ChatGenerationChunk(message=chunk)
+                if flight.done:
+                    break
+                await flight.changed.wait()
+        finally:
+            registry.leave(flight, self.node_name)
+
+        if flight.error is not None:
+            raise flight.error
+
+
+def get_single_flight_stats() -> Dict[str, Any]:
+    """Coalescing ratio and abandoned upstream calls per node (for monitoring)"""
+    return SingleFlight.get_instance().get_stats()
@@ -1,11 +1,26 @@
-from app.AI.supervisor_workflow.departments.math_dept.math_dept_subgraph import math_dept_subgraph
-from app.AI.supervisor_workflow.departments.web_dept.web_dept_subgraph import web_dept_subgraph
-from app.AI.supervisor_workflow.departments.general_knowledge_dept.general_knowledge_subgraph import general_knowledge_subgraph
+from langchain_core.runnables.base import Runnable
+
+# Subgraphs are compiled on first use: importing them pulls in the department agents, their
+# tools and LLM clients, which the web process does not need until the main graph is built
+
+
+def get_math_dept_subgraph() -> Runnable:
+    from app.AI.supervisor_workflow.departments.math_dept.math_dept_subgraph import math_dept_subgraph
+    return math_dept_subgraph
 
-__all__ = [
-    "math_dept_subgraph",
-    "web_dept_subgraph",
-    "general_knowledge_subgraph",
-]
 
+def get_web_dept_subgraph() -> Runnable:
+    from app.AI.supervisor_workflow.departments.web_dept.web_dept_subgraph import web_dept_subgraph
+    return web_dept_subgraph
 
+
+def get_general_knowledge_subgraph() -> Runnable:
+    from app.AI.supervisor_workflow.departments.general_knowledge_dept.general_knowledge_subgraph import general_knowledge_subgraph
+    return general_knowledge_subgraph
+
+
+__all__ = [
+    "get_math_dept_subgraph",
+    "get_web_dept_subgraph",
+    "get_general_knowledge_subgraph",
+]
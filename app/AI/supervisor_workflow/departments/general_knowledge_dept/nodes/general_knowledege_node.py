@@ -7,6 +7,10 @@ from app.AI.supervisor_workflow.shared.models import CompletedTask, TaskStatus,
 from app.AI.core.llm import LLMFactory, LLMConfig, LLMProviders
 from app.AI.supervisor_workflow.shared.utils.logUtils import print_current_node
 from app.AI.supervisor_workflow.departments.utils.errors import node_error_handler
+from app.AI.supervisor_workflow.departments.utils.speculation import speculative_department
+from app.AI.supervisor_workflow.departments.utils.bulkhead import department_bulkhead
+from app.AI.supervisor_workflow.departments.utils.deadline import department_deadline
+from app.AI.supervisor_workflow.departments.utils.dependents import dependent_dispatch
 from app.AI.supervisor_workflow.departments.models.dept_input import DeptInput
 from app.utils.logger import logger
 
@@ -14,25 +18,13 @@ CURRENT_NODE_NAME = NodeNames_Dept.GENERAL_KNOWLEDGE.value
 
 
 async def stream_knowledge_response(response_text: str, department: str, task_id: str, publisher):
-    """Stream the knowledge response character by character using queue-based system"""
+    """Stream the knowledge response as coalesced chunks using queue-based system"""
     try:
         if publisher is not None:
-            # Stream each character with segment_id as character position
-            for char_position, char in enumerate(response_text, 1):
-                await publisher.publish_thought(
-                    content=char,
-                    source=department,
-                    segment_id=char_position,
-                    task_id=task_id
-                )
-                await asyncio.sleep(0.01)  # Small delay between characters
-
-            # Send completion marker
-            await publisher.publish_thought_complete(
+            await publisher.publish_text_stream(
+                text=response_text,
                 source=department,
-                segment_id=len(response_text),
-                task_id=task_id,
-                total_length=len(response_text)
+                task_id=task_id
             )
 
             logger.info(f"Streamed knowledge response: {len(response_text)} characters total (task: {task_id})")
@@ -46,12 +38,18 @@ async def _call_general_knowledge_llm(dept_input: DeptInput) -> str:
     task = dept_input.task
 
     try:
-        llm = LLMFactory.create_llm(
+        llm = LLMFactory.create_hedged_llm(
             LLMConfig(
                 provider=LLMProviders.OPENAI.value,
                 model="gpt-4.1-nano",
                 temperature=1.0,
-            )
+            ),
+            backup_config=LLMConfig(
+                provider=LLMProviders.DEEPSEEK.value,
+                model="deepseek-chat",
+                temperature=1.0,
+            ),
+            node_name=NodeNames_Dept.GENERAL_KNOWLEDGE.value
         )
 
         system_prompt = (
@@ -65,6 +63,11 @@ async def _call_general_knowledge_llm(dept_input: DeptInput) -> str:
 
         user_message = f"Task Description: {task.description}\n\nExpected Output Explanation: {task.expected_output}"
 
+        # Results of the tasks this one depends on
+        upstream_context = dept_input.format_upstream_outputs()
+        if upstream_context:
+            system_prompt += f"\n\n{upstream_context}"
+
         # Build messages list with conversation history
         messages: list[AnyMessage] = [SystemMessage(content=system_prompt)]
 
@@ -86,10 +89,14 @@ async def _call_general_knowledge_llm(dept_input: DeptInput) -> str:
         raise e
 
 
+@dependent_dispatch(NodeNames_Dept.GENERAL_KNOWLEDGE)
+@department_deadline(NodeNames_Dept.GENERAL_KNOWLEDGE)
+@speculative_department(NodeNames_Dept.GENERAL_KNOWLEDGE)
 @node_error_handler(from_department=NodeNames_Dept.GENERAL_KNOWLEDGE)
+@department_bulkhead(NodeNames_Dept.GENERAL_KNOWLEDGE)
 async def general_knowledge_node(dept_input: DeptInput) -> Command:
     """
-    General knowledge department with real-time character-by-character streaming.
+    General knowledge department with real-time chunked streaming.
     """
     print_current_node(CURRENT_NODE_NAME)
     task = dept_input.task
@@ -113,7 +120,7 @@ async def general_knowledge_node(dept_input: DeptInput) -> Command:
     # Get LLM response
     llm_response = await _call_general_knowledge_llm(dept_input)
 
-    # Stream the response character by character
+    # Stream the response in chunks
     await stream_knowledge_response(
         response_text=llm_response,
         department=NodeNames_Dept.GENERAL_KNOWLEDGE.value,
@@ -1,16 +1,22 @@
+import functools
 from langgraph.prebuilt import create_react_agent
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.language_models.chat_models import BaseChatModel
 
 from app.AI.core.llm import LLMFactory, LLMConfig, LLMProviders
+from app.AI.supervisor_workflow.shared.models.Nodes import NodeNames_Dept
 from app.AI.supervisor_workflow.departments.math_dept.tools.calculator import calculator
 
-llm = LLMFactory.create_llm(
-    LLMConfig(
+@functools.cache
+def get_llm() -> BaseChatModel:
+    """Created on first use, so importing this module builds no LLM client"""
+    config = LLMConfig(
         provider=LLMProviders.OPENAI.value,
         model="gpt-4.1-nano",
-        temperature=1.0,
+        # Greedy decoding: math needs no sampling, and only deterministic responses may be cached
+        temperature=0.0,
     )
-)
+    return LLMFactory.with_response_cache(LLMFactory.create_llm(config), config, NodeNames_Dept.MATH_DEPT.value)
 
 def create_math_expert_agent():
     """
@@ -68,7 +74,7 @@ Example:
     ])
 
     return create_react_agent(
-        model=llm,
+        model=get_llm(),
         tools=[calculator],
         prompt=prompt_template,
     )
\ No newline at end of file
@@ -11,6 +11,10 @@ from app.AI.supervisor_workflow.shared.models.Nodes import NodeNames_Dept
 from app.AI.supervisor_workflow.departments.models.dept_input import DeptInput
 from app.AI.supervisor_workflow.departments.math_dept.agents.math_expert import create_math_expert_agent
 from app.AI.supervisor_workflow.departments.utils.errors import node_error_handler
+from app.AI.supervisor_workflow.departments.utils.speculation import speculative_department
+from app.AI.supervisor_workflow.departments.utils.bulkhead import department_bulkhead
+from app.AI.supervisor_workflow.departments.utils.deadline import department_deadline
+from app.AI.supervisor_workflow.departments.utils.dependents import dependent_dispatch
 from app.utils.logger import logger
 
 
@@ -43,25 +47,13 @@ def concatenate_thoughts_with_markers(thoughts: dict) -> str:
     return "\n\n".join(concatenated_parts)
 
 async def stream_concatenated_thoughts(full_text: str, department: str, task_id: str, publisher):
-    """Stream the full concatenated thought text character by character using the new queue-based system"""
+    """Stream the full concatenated thought text as coalesced chunks using the queue-based system"""
     try:
         if publisher is not None:
-            # Stream each character with segment_id as character position
-            for char_position, char in enumerate(full_text, 1):
-                await publisher.publish_thought(
-                    content=char,
-                    source=department,
-                    segment_id=char_position,
-                    task_id=task_id
-                )
-                await asyncio.sleep(0.01)  # Small delay between characters
-
-            # Send completion marker
-            await publisher.publish_thought_complete(
+            await publisher.publish_text_stream(
+                text=full_text,
                 source=department,
-                segment_id=len(full_text),
-                task_id=task_id,
-                total_length=len(full_text)
+                task_id=task_id
             )
 
             logger.info(f"Streamed concatenated thoughts: {len(full_text)} characters total (task: {task_id})")
@@ -107,10 +99,14 @@ async def _call_math_expert_agent_fallback(task: Task, conversation_messages: Li
         raise ValueError("LLM call returned no response.")
     return agent_response
 
+@dependent_dispatch(NodeNames_Dept.MATH_DEPT)
+@department_deadline(NodeNames_Dept.MATH_DEPT)
+@speculative_department(NodeNames_Dept.MATH_DEPT)
 @node_error_handler(from_department=NodeNames_Dept.MATH_DEPT)
+@department_bulkhead(NodeNames_Dept.MATH_DEPT)
 async def math_dept_node(state: DeptInput) -> Command:
     """
-    Math department with JSON structured output, concatenated character-by-character streaming,
+    Math department with JSON structured output, concatenated chunked streaming,
     and initial signal feature for immediate frontend feedback.
     """
     print_current_node(NodeNames_Dept.MATH_DEPT.value)
@@ -136,6 +132,7 @@ async def math_dept_node(state: DeptInput) -> Command:
 Problem: {task.description}
 Context: {state.user_query}
 Expected Output: {task.expected_output}
+{state.format_upstream_outputs()}
 
 Please respond with valid JSON in this format:
 {{
@@ -2,7 +2,7 @@ from pydantic import BaseModel
 from typing import List, Optional
 from langchain_core.messages import AnyMessage
 
-from app.AI.supervisor_workflow.shared.models import Task
+from app.AI.supervisor_workflow.shared.models import Task, CompletedTask
 from app.AI.supervisor_workflow.shared.models.Chat import SupervisorState
 
 class DeptInput(BaseModel):
@@ -18,6 +18,20 @@ class DeptInput(BaseModel):
     thread_id: str = ""
     user_query: str = ""
     stream_queue_id: Optional[str] = None
+    # Results of the tasks listed in task.dependent_tasks
+    upstream_outputs: List[CompletedTask] = []
+    # Epoch seconds after which the task is cancelled and reported as timed out
+    deadline_at: Optional[float] = None
+
+    def format_upstream_outputs(self) -> str:
+        """Upstream task results as prompt context, empty when the task has no dependencies"""
+        if not self.upstream_outputs:
+            return ""
+
+        lines = ["Results of the tasks this task depends on:"]
+        for upstream in self.upstream_outputs:
+            lines.append(f"- [{upstream.task_id}] ({upstream.from_department.value}, {upstream.status.value}): {upstream.department_output}")
+        return "\n".join(lines)
 
     def get_stream_publisher(self):
         """Get a stream publisher for this department"""
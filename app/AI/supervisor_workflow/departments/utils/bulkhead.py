@@ -0,0 +1,182 @@
+import asyncio
+import functools
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Coroutine, Deque, Dict, Optional, Tuple
+
+from app.AI.supervisor_workflow.shared.models.Nodes import NodeNames_Dept
+from app.AI.supervisor_workflow.departments.models.dept_input import DeptInput
+from app.utils.logger import logger
+
+# Defaults for departments without an explicit limit
+DEPT_BULKHEAD_DEFAULT_CONCURRENCY = int(os.environ.get("DEPT_BULKHEAD_DEFAULT_CONCURRENCY", "8"))
+DEPT_BULKHEAD_DEFAULT_QUEUE = int(os.environ.get("DEPT_BULKHEAD_DEFAULT_QUEUE", "32"))
+# Seconds a task may wait for a slot before it is rejected
+DEPT_BULKHEAD_MAX_WAIT = float(os.environ.get("DEPT_BULKHEAD_MAX_WAIT", "30"))
+
+# (max concurrent, max waiting) per department; the web department runs ReAct loops with
+# Tavily calls and gets a tighter cap so it cannot exhaust the provider rate limits
+_DEFAULT_LIMITS: Dict[NodeNames_Dept, Tuple[int, int]] = {
+    NodeNames_Dept.WEB_DEPT: (4, 16),
+    NodeNames_Dept.MATH_DEPT: (6, 24),
+    NodeNames_Dept.GENERAL_KNOWLEDGE: (8, 32),
+}
+
+# Wait times kept per department for the percentiles
+_WAIT_SAMPLES = 512
+
+
+def _parse_limits(value: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Parse DEPT_BULKHEAD_LIMITS, e.g. "WebDepartment=4:16,MathDepartment=6".
+    The queue limit is optional and defaults to four times the concurrency.
+    """
+    limits: Dict[str, Tuple[int, int]] = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        try:
+            name, _, limit = item.partition("=")
+            concurrency, _, queue = limit.partition(":")
+            limits[name.strip()] = (int(concurrency), int(queue) if queue else int(concurrency) * 4)
+        except ValueError:
+            logger.error(f"Invalid DEPT_BULKHEAD_LIMITS entry ignored: {item}")
+    return limits
+
+
+class BulkheadFullError(Exception):
+    """Raised when a department's wait queue is full or a task waited longer than allowed"""
+
+
+class Bulkhead:
+    """
+    Concurrency cap with a bounded FIFO wait queue for one department, shared by all requests.
+    """
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, max_wait: float = DEPT_BULKHEAD_MAX_WAIT):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+        self.in_flight = 0
+        self.waiting = 0
+        self.peak_in_flight = 0
+        self.peak_waiting = 0
+        self.acquired = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.total_wait = 0.0
+        self.max_wait_seen = 0.0
+        self._wait_samples: Deque[float] = deque(maxlen=_WAIT_SAMPLES)
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one of the department's slots for the duration of the block"""
+        started = time.monotonic()
+        if not self._semaphore.locked() and not self.waiting:
+            # Free slot: acquiring does not block
+            await self._semaphore.acquire()
+        else:
+            if self.waiting >= self.max_queue:
+                self.rejected += 1
+                raise BulkheadFullError(f"{self.name} is at capacity ({self.max_concurrent} running, {self.waiting} waiting)")
+
+            self.waiting += 1
+            self.peak_waiting = max(self.peak_waiting, self.waiting)
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.max_wait)
+            except asyncio.TimeoutError:
+                self.timed_out += 1
+                raise BulkheadFullError(f"{self.name} had no free slot within {self.max_wait:.0f}s")
+            finally:
+                self.waiting -= 1
+
+        waited = time.monotonic() - started
+        self._record_wait(waited)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            yield waited
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def _record_wait(self, waited: float):
+        self.acquired += 1
+        self.total_wait += waited
+        self.max_wait_seen = max(self.max_wait_seen, waited)
+        self._wait_samples.append(waited)
+
+    def _percentile(self, fraction: float) -> float:
+        if not self._wait_samples:
+            return 0.0
+        samples = sorted(self._wait_samples)
+        return samples[min(int(len(samples) * fraction), len(samples) - 1)]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "peak_in_flight": self.peak_in_flight,
+            "peak_waiting": self.peak_waiting,
+            "acquired": self.acquired,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "wait_avg_ms": round(self.total_wait / self.acquired * 1000, 1) if self.acquired else 0.0,
+            "wait_p50_ms": round(self._percentile(0.5) * 1000, 1),
+            "wait_p95_ms": round(self._percentile(0.95) * 1000, 1),
+            "wait_max_ms": round(self.max_wait_seen * 1000, 1),
+        }
+
+
+class BulkheadRegistry:
+    """
+    Singleton registry of department bulkheads, keyed by NodeNames_Dept.
+    Limits come from DEPT_BULKHEAD_LIMITS, then the built-in defaults, then the global defaults.
+    """
+    _instance = None
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[int, int]]] = None):
+        self._limits = {department.value: limit for department, limit in _DEFAULT_LIMITS.items()}
+        self._limits.update(limits if limits is not None else _parse_limits(os.environ.get("DEPT_BULKHEAD_LIMITS", "")))
+        self._bulkheads: Dict[NodeNames_Dept, Bulkhead] = {}
+
+    @classmethod
+    def get_instance(cls) -> 'BulkheadRegistry':
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def get(self, department: NodeNames_Dept) -> Bulkhead:
+        bulkhead = self._bulkheads.get(department)
+        if bulkhead is None:
+            max_concurrent, max_queue = self._limits.get(
+                department.value, (DEPT_BULKHEAD_DEFAULT_CONCURRENCY, DEPT_BULKHEAD_DEFAULT_QUEUE))
+            bulkhead = Bulkhead(department.value, max(1, max_concurrent), max(0, max_queue))
+            self._bulkheads[department] = bulkhead
+        return bulkhead
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Concurrency and queue-wait metrics per department (for monitoring)"""
+        return {department.value: bulkhead.get_stats() for department, bulkhead in self._bulkheads.items()}
+
+
+def department_bulkhead(department: NodeNames_Dept):
+    """
+    Run a department node inside its bulkhead.
+    Placed under node_error_handler, so a rejected task completes with an error instead of failing the graph.
+    """
+    def decorator(func: Callable[[DeptInput], Coroutine[Any, Any, Any]]):
+        @functools.wraps(func)
+        async def wrapper(state: DeptInput, *args, **kwargs) -> Any:
+            bulkhead = BulkheadRegistry.get_instance().get(department)
+            async with bulkhead.slot() as waited:
+                if waited > 1.0:
+                    logger.info(f"{department.value} task {state.task.task_id} waited {waited:.1f}s for a slot")
+                return await func(state, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,64 @@
+import asyncio
+import functools
+import time
+from typing import Any, Callable, Coroutine
+
+from langgraph.types import Command
+
+from app.AI.supervisor_workflow.shared.models.Assessment import CompletedTask, TaskStatus
+from app.AI.supervisor_workflow.shared.models.Nodes import NodeNames_Dept
+from app.AI.supervisor_workflow.departments.models.dept_input import DeptInput
+from app.utils.logger import logger
+
+
+def timed_out_task(task_id: str, from_department: NodeNames_Dept) -> CompletedTask:
+    return CompletedTask(
+        task_id=task_id,
+        from_department=from_department,
+        status=TaskStatus.TIMED_OUT,
+        department_output="The task did not finish before its deadline; no result is available.",
+    )
+
+
+def department_deadline(from_department: NodeNames_Dept):
+    """
+    Cancel a department node when its task passes DeptInput.deadline_at.
+
+    Outside every decorator but dependent_dispatch, so waiting for a bulkhead slot or a
+    speculative run counts towards the deadline, while dependents started afterwards get their
+    own. A cancelled task is reported back as TIMED_OUT.
+    """
+    def decorator(func: Callable[[DeptInput], Coroutine[Any, Any, Any]]):
+        @functools.wraps(func)
+        async def wrapper(state: DeptInput, *args, **kwargs) -> Any:
+            if state.deadline_at is None:
+                return await func(state, *args, **kwargs)
+
+            remaining = state.deadline_at - time.time()
+            try:
+                if remaining <= 0:
+                    raise asyncio.TimeoutError()
+                return await asyncio.wait_for(func(state, *args, **kwargs), timeout=remaining)
+            except asyncio.TimeoutError:
+                logger.warning(f"!! {from_department.value} task {state.task.task_id} timed out !!")
+
+            publisher = state.get_stream_publisher()
+            if publisher is not None:
+                await publisher.publish_thought(
+                    content="Timed out.",
+                    source=from_department.value,
+                    segment_id=0,
+                    task_id=state.task.task_id
+                )
+
+            return Command(
+                update={
+                    "supervisor": {
+                        "completed_tasks": [timed_out_task(state.task.task_id, from_department)],
+                        "completed_task_ids": {state.task.task_id}
+                    }
+                },
+                goto=Command.PARENT
+            )
+        return wrapper
+    return decorator
@@ -0,0 +1,209 @@
+import asyncio
+import functools
+import os
+import time
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Set
+
+from langgraph.types import Command
+
+from app.AI.supervisor_workflow.shared.models.Assessment import Task, CompletedTask
+from app.AI.supervisor_workflow.shared.models.Nodes import NodeNames_Dept
+from app.AI.supervisor_workflow.departments.models.dept_input import DeptInput
+from app.utils.logger import logger
+
+DeptNodeFunc = Callable[[DeptInput], Coroutine[Any, Any, Command]]
+
+# Set DEPENDENT_EARLY_DISPATCH_ENABLED=false to leave every dependent task to the supervisor
+DEPENDENT_EARLY_DISPATCH_ENABLED = os.getenv("DEPENDENT_EARLY_DISPATCH_ENABLED", "true").lower() == "true"
+
+# Plans of runs that were never discarded are forgotten after this many seconds
+DEPENDENT_PLAN_TTL = 600.0
+
+
+class _Plan:
+    """The task DAG of one run, as far as this process has seen it"""
+
+    def __init__(self, planned_tasks: List[Task], task_timeouts: Dict[str, float], deadline_at: Optional[float]):
+        self.tasks: Dict[str, Task] = {task.task_id: task for task in planned_tasks}
+        self.task_timeouts = task_timeouts
+        self.deadline_at = deadline_at
+        self.started: Set[str] = set()
+        self.completed: Dict[str, CompletedTask] = {}
+        self.created_at = time.monotonic()
+
+    def task_deadline(self, task: Task) -> Optional[float]:
+        """The department's task timeout from now, capped by the deadline of the whole plan"""
+        timeout = self.task_timeouts.get(task.task_id)
+        deadlines = [deadline for deadline in (
+            time.time() + timeout if timeout is not None else None,
+            self.deadline_at,
+        ) if deadline is not None]
+        return min(deadlines) if deadlines else None
+
+
+class DependentTaskScheduler:
+    """
+    Starts dependent tasks from the department that completes their last dependency.
+
+    The supervisor only runs between supersteps, so a task waiting on a fast department would
+    otherwise also wait for the slowest department dispatched alongside it. The supervisor
+    registers its plan here, keyed by run_key (the run's stream queue ID); each department node
+    reports its completion and runs the tasks that became ready in the same superstep, adding
+    them to dispatched_task_ids. The supervisor still dispatches whatever was not started here.
+    """
+    _instance = None
+
+    def __init__(self):
+        self._department_nodes: Dict[NodeNames_Dept, DeptNodeFunc] = {}
+        self._plans: Dict[str, _Plan] = {}
+
+        self.started_early = 0
+
+    @classmethod
+    def get_instance(cls) -> 'DependentTaskScheduler':
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def register_department(self, department: NodeNames_Dept, node_func: DeptNodeFunc):
+        self._department_nodes[department] = node_func
+
+    def plan(self, run_key: Optional[str], planned_tasks: List[Task], started_ids: Set[str],
+             task_timeouts: Dict[str, float], deadline_at: Optional[float]):
+        """Register the task DAG of a run and the tasks the supervisor dispatched first"""
+        if not run_key or not DEPENDENT_EARLY_DISPATCH_ENABLED:
+            return
+
+        self._expire()
+        plan = self._plans[run_key] = _Plan(planned_tasks, task_timeouts, deadline_at)
+        plan.started.update(started_ids)
+
+    def mark_started(self, run_key: Optional[str], task_ids: Set[str]):
+        """Record tasks the supervisor dispatched itself"""
+        plan = self._plans.get(run_key) if run_key else None
+        if plan is not None:
+            plan.started.update(task_ids)
+
+    def complete(self, run_key: Optional[str], completed_tasks: List[CompletedTask]) -> List[Task]:
+        """
+        Record completed tasks and return the planned tasks that became ready to start here.
+        Returns nothing unless a plan is registered for the run. Ready tasks are marked started
+        before returning, so concurrent completions never start a task twice.
+        """
+        plan = self._plans.get(run_key) if run_key else None
+        if plan is None:
+            return []
+
+        for completed_task in completed_tasks:
+            plan.completed[completed_task.task_id] = completed_task
+
+        ready_tasks = [
+            task for task in plan.tasks.values()
+            if task.task_id not in plan.started
+            and set(task.dependent_tasks) <= plan.completed.keys()
+            and task.suggested_department in self._department_nodes
+        ]
+        plan.started.update(task.task_id for task in ready_tasks)
+        return ready_tasks
+
+    def discard_run(self, run_key: Optional[str]):
+        self._plans.pop(run_key, None)
+
+    def _expire(self):
+        expired_before = time.monotonic() - DEPENDENT_PLAN_TTL
+        for run_key in [run_key for run_key, plan in self._plans.items() if plan.created_at < expired_before]:
+            del self._plans[run_key]
+
+    async def run_ready_dependents(self, dept_input: DeptInput, command: Command) -> Command:
+        """Run the tasks this department's result made ready and fold their Commands into its own"""
+        completed_tasks = _completed_tasks(command)
+        ready_tasks = self.complete(dept_input.stream_queue_id, completed_tasks)
+        if not ready_tasks:
+            return command
+
+        plan = self._plans[dept_input.stream_queue_id]
+        logger.info(f"Starting dependent tasks early: {[task.task_id for task in ready_tasks]}")
+        self.started_early += len(ready_tasks)
+
+        results = await asyncio.gather(*(
+            self._run_dependent(dept_input.model_copy(update={
+                "task": task,
+                "upstream_outputs": [plan.completed[dep] for dep in task.dependent_tasks],
+                "deadline_at": plan.task_deadline(task),
+            }))
+            for task in ready_tasks
+        ), return_exceptions=True)
+
+        dispatched_tasks: List[Task] = []
+        dependent_commands: List[Command] = []
+        for task, result in zip(ready_tasks, results):
+            if isinstance(result, BaseException):
+                # Left out of dispatched_task_ids, so the supervisor dispatches it after this superstep
+                logger.error(f"Early run of dependent task {task.task_id} failed: {result}")
+                continue
+            dispatched_tasks.append(task)
+            dependent_commands.append(result)
+
+        return _merge_commands(command, dependent_commands, dispatched_tasks)
+
+    async def _run_dependent(self, dept_input: DeptInput) -> Command:
+        node_func = self._department_nodes[dept_input.task.suggested_department]
+        command = await node_func(dept_input)
+        return await self.run_ready_dependents(dept_input, command)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Early dispatch counters (for monitoring)"""
+        return {
+            "enabled": DEPENDENT_EARLY_DISPATCH_ENABLED,
+            "started_early": self.started_early,
+            "active_plans": len(self._plans),
+        }
+
+
+def _completed_tasks(command: Command) -> List[CompletedTask]:
+    update = command.update if isinstance(command, Command) and isinstance(command.update, dict) else {}
+    supervisor_update = update.get("supervisor")
+    return list(supervisor_update.get("completed_tasks", [])) if isinstance(supervisor_update, dict) else []
+
+
+def _merge_commands(command: Command, dependent_commands: List[Command], dispatched_tasks: List[Task]) -> Command:
+    """One Command.PARENT update carrying the department's result and those of the dependents it ran"""
+    supervisor_update: Dict[str, Any] = dict(command.update.get("supervisor", {}))
+    errors = list(command.update.get("errors", []))
+
+    supervisor_update["dispatched_tasks"] = list(supervisor_update.get("dispatched_tasks", [])) + dispatched_tasks
+    supervisor_update["dispatched_task_ids"] = set(supervisor_update.get("dispatched_task_ids", set())) | {
+        task.task_id for task in dispatched_tasks
+    }
+
+    for dependent_command in dependent_commands:
+        dependent_update = dependent_command.update if isinstance(dependent_command.update, dict) else {}
+        for key, value in dependent_update.get("supervisor", {}).items():
+            if isinstance(value, set):
+                supervisor_update[key] = set(supervisor_update.get(key, set())) | value
+            else:
+                supervisor_update[key] = list(supervisor_update.get(key, [])) + list(value)
+        errors.extend(dependent_update.get("errors", []))
+
+    update = {**command.update, "supervisor": supervisor_update}
+    if errors:
+        update["errors"] = errors
+    return Command(update=update, goto=Command.PARENT)
+
+
+def dependent_dispatch(department: NodeNames_Dept):
+    """
+    Start the dependents of a department's task as soon as it completes.
+
+    The outermost department decorator: the registered function is the node with its own
+    deadline, so a dependent run here is bounded exactly as when the supervisor dispatches it.
+    """
+    def decorator(func: DeptNodeFunc):
+        DependentTaskScheduler.get_instance().register_department(department, func)
+
+        @functools.wraps(func)
+        async def wrapper(state: DeptInput, *args, **kwargs) -> Any:
+            command = await func(state, *args, **kwargs)
+            return await DependentTaskScheduler.get_instance().run_ready_dependents(state, command)
+        return wrapper
+    return decorator
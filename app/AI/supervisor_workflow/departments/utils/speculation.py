@@ -0,0 +1,158 @@
+import asyncio
+import contextvars
+import functools
+import time
+from typing import Any, Callable, Coroutine, Dict, Optional, Tuple
+
+from langgraph.types import Command
+
+from app.AI.supervisor_workflow.shared.models.Assessment import Task
+from app.AI.supervisor_workflow.shared.models.Nodes import NodeNames_Dept
+from app.AI.supervisor_workflow.departments.models.dept_input import DeptInput
+from app.utils.logger import logger
+
+DeptNodeFunc = Callable[[DeptInput], Coroutine[Any, Any, Command]]
+
+# Speculative runs nobody claimed are cancelled after this many seconds
+SPECULATION_TTL = 300.0
+
+
+def _task_fingerprint(task: Task) -> Tuple[str, str, str, str]:
+    """What a speculative run depends on; dependent_tasks is checked separately"""
+    return task.task_id, task.description, task.expected_output, task.suggested_department.value
+
+
+class _Speculation:
+    __slots__ = ("fingerprint", "future", "started_at")
+
+    def __init__(self, fingerprint: Tuple[str, str, str, str], future: asyncio.Task):
+        self.fingerprint = fingerprint
+        self.future = future
+        self.started_at = time.monotonic()
+
+
+class SpeculationRegistry:
+    """
+    Department runs started before the supervisor dispatches them.
+
+    The assessment node starts a department as soon as the LLM has finished writing its task,
+    keyed by (run_key, task_id) where run_key is the run's stream queue ID. When the supervisor's
+    Send reaches the department node, the node claims the running result instead of starting
+    over. Runs that turn out not to be dispatched as-is are discarded (cancelled).
+    """
+    _instance = None
+
+    def __init__(self):
+        self._department_nodes: Dict[NodeNames_Dept, DeptNodeFunc] = {}
+        self._runs: Dict[Tuple[str, str], _Speculation] = {}
+
+        self.started = 0
+        self.claimed = 0
+        self.discarded = 0
+
+    @classmethod
+    def get_instance(cls) -> 'SpeculationRegistry':
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def register_department(self, department: NodeNames_Dept, node_func: DeptNodeFunc):
+        self._department_nodes[department] = node_func
+
+    def can_speculate(self, department: NodeNames_Dept) -> bool:
+        return department in self._department_nodes
+
+    def start(self, run_key: Optional[str], dept_input: DeptInput) -> bool:
+        """
+        Start the task's department in the background.
+        Returns False when the run has no key, the department does not support it, or it already started.
+        """
+        task = dept_input.task
+        if not run_key or not self.can_speculate(task.suggested_department) or (run_key, task.task_id) in self._runs:
+            return False
+
+        self._expire()
+        node_func = self._department_nodes[task.suggested_department]
+        # Fresh context: the run must not be attributed to the node that happens to start it
+        future = asyncio.create_task(node_func(dept_input), context=contextvars.Context())
+        self._runs[(run_key, task.task_id)] = _Speculation(_task_fingerprint(task), future)
+        self.started += 1
+        logger.info(f"Speculatively started {task.suggested_department.value} for {task.task_id}")
+        return True
+
+    def claim(self, run_key: Optional[str], dept_input: DeptInput) -> Optional[asyncio.Task]:
+        """
+        Take the speculative run matching this department input, if any.
+        A run is only reused when the task is unchanged and has no upstream inputs.
+        """
+        if not run_key:
+            return None
+
+        speculation = self._runs.pop((run_key, dept_input.task.task_id), None)
+        if speculation is None:
+            return None
+
+        if speculation.fingerprint != _task_fingerprint(dept_input.task) or dept_input.upstream_outputs:
+            self._cancel(speculation)
+            return None
+
+        self.claimed += 1
+        return speculation.future
+
+    def discard(self, run_key: Optional[str], task_id: str):
+        speculation = self._runs.pop((run_key, task_id), None)
+        if speculation is not None:
+            self._cancel(speculation)
+
+    def discard_run(self, run_key: Optional[str]):
+        """Cancel every unclaimed speculative run of a graph run"""
+        for key in [key for key in self._runs if key[0] == run_key]:
+            self._cancel(self._runs.pop(key))
+
+    def _cancel(self, speculation: _Speculation):
+        speculation.future.cancel()
+        self.discarded += 1
+
+    def _expire(self):
+        expired_before = time.monotonic() - SPECULATION_TTL
+        for key in [key for key, speculation in self._runs.items() if speculation.started_at < expired_before]:
+            self._cancel(self._runs.pop(key))
+
+    def get_stats(self) -> Dict[str, int]:
+        """Hit-rate counters (for monitoring)"""
+        return {
+            "started": self.started,
+            "claimed": self.claimed,
+            "discarded": self.discarded,
+            "pending": len(self._runs),
+        }
+
+
+def speculative_department(department: NodeNames_Dept):
+    """
+    Register a department node for speculative execution.
+
+    The undecorated function (errors already handled by node_error_handler) is what the
+    assessment node starts early. Inside the graph, the decorated node first claims a matching
+    speculative run and returns its Command, so the Command.PARENT update is applied exactly
+    as if the node had computed it now.
+    """
+    def decorator(func: DeptNodeFunc):
+        SpeculationRegistry.get_instance().register_department(department, func)
+
+        @functools.wraps(func)
+        async def wrapper(state: DeptInput, *args, **kwargs) -> Any:
+            speculation = SpeculationRegistry.get_instance().claim(state.stream_queue_id, state)
+            if speculation is not None:
+                try:
+                    return await speculation
+                except asyncio.CancelledError:
+                    if asyncio.current_task().cancelling():
+                        raise
+                    logger.warning(f"Speculative run of {state.task.task_id} was cancelled, running it again")
+                except Exception as e:
+                    logger.error(f"Speculative run of {state.task.task_id} failed, running it again: {e}")
+
+            return await func(state, *args, **kwargs)
+        return wrapper
+    return decorator
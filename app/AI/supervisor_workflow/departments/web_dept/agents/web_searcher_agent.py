@@ -1,16 +1,21 @@
+import functools
 from langgraph.prebuilt import create_react_agent
 from langchain_core.prompts import ChatPromptTemplate
 
 from app.AI.supervisor_workflow.departments.web_dept.tools.tavily_search import tavily_search_tool
+from langchain_core.language_models.chat_models import BaseChatModel
 from app.AI.core.llm import LLMFactory, LLMConfig, LLMProviders
 
-llm = LLMFactory.create_llm(
-    LLMConfig(
-        provider=LLMProviders.OPENAI.value,
-        model="gpt-4.1",
-        temperature=1.0,
+@functools.cache
+def get_llm() -> BaseChatModel:
+    """Created on first use, so importing this module builds no LLM client"""
+    return LLMFactory.create_llm(
+        LLMConfig(
+            provider=LLMProviders.OPENAI.value,
+            model="gpt-4.1",
+            temperature=1.0,
+        )
     )
-)
 
 
 def create_web_search_prompt(description: str, expected_output: str) -> str:
@@ -58,7 +63,7 @@ def create_web_searcher_agent(description: str, expected_output: str):
     ])
 
     return create_react_agent(
-        model=llm,
+        model=get_llm(),
         tools=[tavily_search_tool],
         prompt=prompt_template,
     )
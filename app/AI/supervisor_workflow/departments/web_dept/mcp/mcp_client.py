@@ -1,6 +1,5 @@
 
 from langchain_deepseek import ChatDeepSeek
-from dotenv import load_dotenv, find_dotenv
 import os
 from pydantic import SecretStr
 from langchain_mcp_adapters.client import MultiServerMCPClient, SSEConnection
@@ -8,8 +7,10 @@ from langgraph.prebuilt import create_react_agent
 from typing import Any
 
 from app.utils.logger import logger
+from app.utils.env import load_env
+from app.AI.core.llm.http_clients import HttpClientRegistry
 
-load_dotenv(find_dotenv())
+load_env()
 
 DEEPSEEK_API_KEY = os.getenv("DEEPSEEK_API_KEY", "")
 GAODE_SSE_URL = os.getenv("GAODE_SSE_URL", "")
@@ -33,6 +34,10 @@ async def get_mcp_client():
     """
     global _client
     if _client is None:
+        # MCP sessions open and close their own httpx client; this one runs on the shared pool
+        httpx_client_factory = HttpClientRegistry.get_instance().client_factory(GAODE_SSE_URL)
+        if httpx_client_factory is not None:
+            config_gaode["httpx_client_factory"] = httpx_client_factory
         _client = MultiServerMCPClient(connections={
             "gaode": config_gaode
         })
@@ -8,6 +8,10 @@ from app.AI.supervisor_workflow.shared.models.Nodes import NodeNames_Dept
 from app.AI.supervisor_workflow.shared.models.Chat import SupervisorState
 from app.AI.supervisor_workflow.departments.web_dept.agents.web_searcher_agent import create_web_searcher_agent
 from app.AI.supervisor_workflow.departments.utils.errors import node_error_handler
+from app.AI.supervisor_workflow.departments.utils.speculation import speculative_department
+from app.AI.supervisor_workflow.departments.utils.bulkhead import department_bulkhead
+from app.AI.supervisor_workflow.departments.utils.deadline import department_deadline
+from app.AI.supervisor_workflow.departments.utils.dependents import dependent_dispatch
 from app.AI.supervisor_workflow.departments.models.dept_input import DeptInput
 from app.AI.supervisor_workflow.shared.utils.logUtils import print_current_node
 from app.utils.logger import logger
@@ -16,25 +20,13 @@ CURRENT_NODE_NAME = NodeNames_Dept.WEB_DEPT.value
 
 
 async def stream_web_search_response(response_text: str, department: str, task_id: str, publisher):
-    """Stream the web search response character by character using queue-based system"""
+    """Stream the web search response as coalesced chunks using queue-based system"""
     try:
         if publisher is not None:
-            # Stream each character with segment_id as character position
-            for char_position, char in enumerate(response_text, 1):
-                await publisher.publish_thought(
-                    content=char,
-                    source=department,
-                    segment_id=char_position,
-                    task_id=task_id
-                )
-                await asyncio.sleep(0.01)  # Small delay between characters
-
-            # Send completion marker
-            await publisher.publish_thought_complete(
+            await publisher.publish_text_stream(
+                text=response_text,
                 source=department,
-                segment_id=len(response_text),
-                task_id=task_id,
-                total_length=len(response_text)
+                task_id=task_id
             )
 
             logger.info(f"Streamed web search response: {len(response_text)} characters total (task: {task_id})")
@@ -42,7 +34,7 @@ async def stream_web_search_response(response_text: str, department: str, task_i
         logger.error(f"Warning: Could not stream web search response: {e}")
 
 
-async def _call_web_research_agent(task: Task, conversation_messages: Optional[List] = None) -> dict[str, Any]:
+async def _call_web_research_agent(task: Task, conversation_messages: Optional[List] = None, upstream_context: str = "") -> dict[str, Any]:
     """Creates a web searcher agent with bound prompt variables and calls it."""
     # Create agent with variables already bound in the prompt (no weird state coupling!)
     web_searcher_agent = create_web_searcher_agent(
@@ -56,8 +48,11 @@ async def _call_web_research_agent(task: Task, conversation_messages: Optional[L
         # Add conversation history for context
         messages.extend(conversation_messages[-5:])  # Keep last 5 messages for context
 
-    # Add current task message
-    messages.append(("human", f"Please help me with: {task.description}"))
+    # Add current task message, with the results of the tasks it depends on
+    task_message = f"Please help me with: {task.description}"
+    if upstream_context:
+        task_message += f"\n\n{upstream_context}"
+    messages.append(("human", task_message))
 
     # Call the agent with conversation context
     agent_response = await web_searcher_agent.ainvoke({
@@ -68,10 +63,14 @@ async def _call_web_research_agent(task: Task, conversation_messages: Optional[L
         raise ValueError("LLM call returned no response.")
     return agent_response
 
+@dependent_dispatch(NodeNames_Dept.WEB_DEPT)
+@department_deadline(NodeNames_Dept.WEB_DEPT)
+@speculative_department(NodeNames_Dept.WEB_DEPT)
 @node_error_handler(from_department=NodeNames_Dept.WEB_DEPT)
+@department_bulkhead(NodeNames_Dept.WEB_DEPT)
 async def web_searcher_node(dept_input: DeptInput):
     """
-    Web searcher node with real-time character-by-character streaming.
+    Web searcher node with real-time chunked streaming.
     Performs web search and streams results in real-time.
     """
     print_current_node(CURRENT_NODE_NAME)
@@ -95,14 +94,14 @@ async def web_searcher_node(dept_input: DeptInput):
         await asyncio.sleep(0.01)
 
     # Perform web search
-    llm_response = await _call_web_research_agent(task, dept_input.messages)
+    llm_response = await _call_web_research_agent(task, dept_input.messages, dept_input.format_upstream_outputs())
 
     # Extract final message content
     final_message = llm_response.get("messages", [])[-1] if isinstance(llm_response,
                                                                        dict) and llm_response.get("messages") else llm_response
     response_content = str(final_message.content) if isinstance(final_message, BaseMessage) else str(final_message)
 
-    # Stream the search results character by character
+    # Stream the search results in chunks
     await stream_web_search_response(
         response_text=response_content,
         department="WebDepartment",
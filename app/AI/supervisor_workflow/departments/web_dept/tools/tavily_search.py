@@ -1,15 +1,50 @@
-from langchain_tavily import TavilySearch
-from langchain_core.tools import tool
 import os
+from typing import Any, Dict
 
-API_KEY = os.getenv("TAVILY_API_KEY")
+import httpx
+from langchain_core.tools import tool, ToolException
+
+from app.AI.core.llm.http_clients import HttpClientRegistry
+
+TAVILY_API_URL = os.getenv("TAVILY_API_URL", "https://api.tavily.com")
+TAVILY_MAX_RESULTS = 5
+
+
+async def search_tavily(query: str) -> Dict[str, Any]:
+    """
+    Query the Tavily Search API through the shared connection pool.
+    Same request and result format as langchain_tavily.TavilySearch, which opens a new
+    aiohttp session (and TLS connection) for every search and cannot be given a client.
+    """
+    url = f"{TAVILY_API_URL}/search"
+    payload = {"query": query, "max_results": TAVILY_MAX_RESULTS}
+    headers = {
+        "Authorization": f"Bearer {os.getenv('TAVILY_API_KEY', '')}",
+        "Content-Type": "application/json",
+    }
+
+    client = HttpClientRegistry.get_instance().get_async_client(url)
+    if client is not None:
+        response = await client.post(url, json=payload, headers=headers)
+    else:
+        async with httpx.AsyncClient() as own_client:
+            response = await own_client.post(url, json=payload, headers=headers)
+
+    # httpx.HTTPStatusError for 4xx/5xx responses
+    response.raise_for_status()
+    return response.json()
 
-tavily_tool = TavilySearch(
-    api_key=API_KEY,
-    max_results=5,
-)
 
 @tool
-async def tavily_search_tool(query: str) -> str:
+async def tavily_search_tool(query: str) -> Dict[str, Any]:
     """Searches the web for the given query using Tavily Search API."""
-    return await tavily_tool.ainvoke({"query": query})
+    try:
+        results = await search_tavily(query)
+    except httpx.HTTPStatusError as e:
+        raise ToolException(f"Tavily search failed with HTTP {e.response.status_code}: {e.response.text[:200]}") from e
+    except httpx.TransportError as e:
+        raise ToolException(f"Tavily search could not be reached: {e!r}") from e
+
+    if not results.get("results", []):
+        raise ToolException(f"No search results found for '{query}'. Try rephrasing or broadening the query.")
+    return results
@@ -1,8 +1,7 @@
-from .main_graph import main_graph, get_main_graph_with_checkpointer, get_main_graph
+from .main_graph import get_main_graph_with_checkpointer, get_main_graph
 from app.AI.supervisor_workflow.head_quarter.dept_registry_center import department_registry
 
 __all__ = [
-    "main_graph",
     "get_main_graph_with_checkpointer",
     "get_main_graph",
     "department_registry"
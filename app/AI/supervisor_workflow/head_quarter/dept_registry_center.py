@@ -1,10 +1,10 @@
 from pydantic import BaseModel, Field
 from dataclasses import dataclass
-from typing import Dict, Optional, List
+from typing import Callable, Dict, Optional, List
 from langchain_core.runnables.base import Runnable
 
 from app.AI.supervisor_workflow.shared.models import NodeNames_Dept
-from app.AI.supervisor_workflow.departments import math_dept_subgraph, web_dept_subgraph, general_knowledge_subgraph
+from app.AI.supervisor_workflow.departments import get_math_dept_subgraph, get_web_dept_subgraph, get_general_knowledge_subgraph
 
 @dataclass
 class Dept_Info:
@@ -12,7 +12,12 @@ class Dept_Info:
     description: str = Field(...,
                              description="A concise summary of the department's primary functions and areas of expertise.")
     is_available: bool = Field(default=True, description="Whether the department is currently available for use.")
-    node_func: Runnable = Field(..., description="The department's node function that will be used to process the task.")
+    node_factory: Callable[[], Runnable] = Field(..., description="Builds the department's subgraph that will be used to process the task, on first use.")
+    routing_examples: List[str] = Field(default_factory=list,
+                                        description="Typical query phrases, used with the description to train the fast-path router.")
+    bypass_aggregator: bool = Field(default=False,
+                                    description="Whether a successful single-task output is final as-is, without aggregator synthesis.")
+    task_timeout: float = Field(default=60.0, description="Seconds a task of this department may take before it times out.")
 
     # model_config = {
     #     "arbitrary_types_allowed": True
@@ -23,17 +28,35 @@ _INITIAL_REGISTERED_DEPARTMENTS: Dict[str, Dept_Info] = {
     NodeNames_Dept.WEB_DEPT.value: Dept_Info(
         department_name=NodeNames_Dept.WEB_DEPT.value,
         description="Manages web interactions, including browsing, online data retrieval, and internet-based research, some up-to-date information is required.",
-        node_func=web_dept_subgraph
+        node_factory=get_web_dept_subgraph,
+        routing_examples=[
+            "latest news today", "current weather forecast", "stock price right now",
+            "search the internet online", "recent updates this week", "live score of the match",
+        ],
+        bypass_aggregator=False,
+        task_timeout=60.0,
     ),
     NodeNames_Dept.MATH_DEPT.value: Dept_Info(
         department_name=NodeNames_Dept.MATH_DEPT.value,
         description="Specializes in mathematical computations, algebraic problem-solving, and quantitative analysis.",
-        node_func=math_dept_subgraph
+        node_factory=get_math_dept_subgraph,
+        routing_examples=[
+            "calculate the result", "solve the equation for x", "what is the square root",
+            "compute the percentage", "derivative integral of the function", "multiply divide add subtract numbers",
+        ],
+        bypass_aggregator=True,
+        task_timeout=45.0,
     ),
     NodeNames_Dept.GENERAL_KNOWLEDGE.value: Dept_Info(
         department_name=NodeNames_Dept.GENERAL_KNOWLEDGE.value,
         description="When the user's query is not related to the specific domain of the other departments, this department will be used to answer the question. It probably will query a Large Language Model directly to answer the question.",
-        node_func=general_knowledge_subgraph
+        node_factory=get_general_knowledge_subgraph,
+        routing_examples=[
+            "hello hi hey thanks thank you", "explain how something works", "tell me about the history of",
+            "what does this word mean", "define the concept", "write a short poem story",
+        ],
+        bypass_aggregator=True,
+        task_timeout=30.0,
     )
 }
 
@@ -43,7 +66,7 @@ class DepartmentRegistry(BaseModel):
         description="A dictionary of all currently registered and operational departments, keyed by department name."
     )
 
-    model_config = { "arbitrary_types_allowed": True } # for PydanticSchemaGenerationError, the node_func field is not allowed to be a Runnable
+    model_config = { "arbitrary_types_allowed": True } # for PydanticSchemaGenerationError, the node_factory field is not allowed to be a Runnable
 
     def register_department(self, department_info: Dept_Info):
         """Registers a new department or updates an existing one if the name matches."""
@@ -74,9 +97,9 @@ class DepartmentRegistry(BaseModel):
         return seperator.join(self.get_available_department_names())
 
     def get_available_departments_func_map(self) -> Dict[str, Runnable]:
-        """Returns a dictionary of names of all available departments and their corresponding functions."""
+        """Returns a dictionary of names of all available departments and their corresponding functions (builds them if needed)."""
         return {
-            department_name: department_info.node_func
+            department_name: department_info.node_factory()
             for department_name, department_info in self.oncall_departments.items()
             if department_info.is_available
         }
@@ -1,5 +1,8 @@
+import asyncio
 from langgraph.graph import StateGraph, START, END
-from typing import Dict
+from langgraph.graph.state import CompiledStateGraph
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from typing import Dict, Optional
 from langchain_core.runnables.base import Runnable
 from app.AI.supervisor_workflow.shared.models import ChatState
 from app.AI.supervisor_workflow.head_quarter.nodes import (
@@ -7,21 +10,28 @@ from app.AI.supervisor_workflow.head_quarter.nodes import (
     supervisor_node,
     aggregator_node,
     final_response_node,
-    initializer_node
+    initializer_node,
+    router_node
 )
 from app.AI.supervisor_workflow.shared.models.Nodes import NodeNames_HQ
 from app.AI.supervisor_workflow.head_quarter.dept_registry_center import department_registry
-from app.AI.supervisor_workflow.shared.utils.checkpointer_manager import get_best_checkpointer
-
-# Get available departments
-AVAILABLE_DEPT_MAP: Dict[str, Runnable] = department_registry.get_available_departments_func_map()
+from app.AI.supervisor_workflow.shared.utils.checkpointer_manager import get_best_checkpointer, cleanup_checkpointers
+from app.utils.startup_timer import StartupTimer
 
 def _build_workflow_graph() -> StateGraph:
     """Build the complete workflow graph with all nodes and edges"""
     builder = StateGraph(ChatState)
 
+    # Get available departments (their subgraphs are built here, on first use)
+    available_dept_map: Dict[str, Runnable] = department_registry.get_available_departments_func_map()
+
     # Add main workflow nodes
     builder.add_node(NodeNames_HQ.INITIALIZER.value, initializer_node)
+    builder.add_node(
+        NodeNames_HQ.ROUTER.value,
+        router_node,
+        destinations=(NodeNames_HQ.ASSESSMENT.value, NodeNames_HQ.SUPERVISOR.value)
+    )
     builder.add_node(NodeNames_HQ.ASSESSMENT.value, assessment_node)
     builder.add_node(
         NodeNames_HQ.SUPERVISOR.value,
@@ -33,12 +43,12 @@ def _build_workflow_graph() -> StateGraph:
 
     # Add department nodes and their edges
     for name in department_registry.get_available_department_names():
-        builder.add_node(name, AVAILABLE_DEPT_MAP[name])
+        builder.add_node(name, available_dept_map[name])
         builder.add_edge(name, NodeNames_HQ.SUPERVISOR.value)
 
     # Define main workflow edges
     builder.add_edge(START, NodeNames_HQ.INITIALIZER.value)
-    builder.add_edge(NodeNames_HQ.INITIALIZER.value, NodeNames_HQ.ASSESSMENT.value)
+    builder.add_edge(NodeNames_HQ.INITIALIZER.value, NodeNames_HQ.ROUTER.value)
     builder.add_edge(NodeNames_HQ.ASSESSMENT.value, NodeNames_HQ.SUPERVISOR.value)
     builder.add_edge(NodeNames_HQ.AGGREGATOR.value, NodeNames_HQ.FINAL_RESPONSE.value)
     builder.add_edge(NodeNames_HQ.FINAL_RESPONSE.value, END)
@@ -46,38 +56,62 @@ def _build_workflow_graph() -> StateGraph:
     return builder
 
 # Global variables for graph management
+_main_graph = None
 _main_graph_with_checkpointer = None
 _graph_initialized = False
+_graph_lock = asyncio.Lock()
 
-# Create the graph builder and basic graph
-builder = _build_workflow_graph()
-main_graph = builder.compile()
-
-async def get_main_graph_with_checkpointer():
-    """Get the main graph with the best available checkpointer"""
-    global _main_graph_with_checkpointer, _graph_initialized
-
-    if not _graph_initialized:
-        # Try to get a persistent checkpointer
-        checkpointer = await get_best_checkpointer()
 
-        if checkpointer:
-            _main_graph_with_checkpointer = builder.compile(checkpointer=checkpointer)
-        else:
-            print("📝 No persistent checkpointer available, using in-memory checkpointing")
-            _main_graph_with_checkpointer = builder.compile()
+def _compile_main_graph(checkpointer: Optional[BaseCheckpointSaver] = None) -> CompiledStateGraph:
+    """The single place where the main graph is built and compiled"""
+    timer = StartupTimer.get_instance()
+    with timer.phase("build_main_graph"):
+        builder = _build_workflow_graph()
+    with timer.phase("compile_main_graph"):
+        return builder.compile(checkpointer=checkpointer)
 
-        _graph_initialized = True
 
-    return _main_graph_with_checkpointer
+async def get_main_graph_with_checkpointer():
+    """Get the main graph with the best available checkpointer, compiled once on first use"""
+    global _main_graph_with_checkpointer, _graph_initialized
 
-def get_main_graph():
-    """Synchronous function to get the main graph (returns basic graph without checkpointer)"""
-    return main_graph
+    if _graph_initialized:
+        return _main_graph_with_checkpointer
 
+    # Concurrent first requests must not compile the graph (and connect the checkpointer) twice
+    async with _graph_lock:
+        if not _graph_initialized:
+            # Try to get a persistent checkpointer
+            with StartupTimer.get_instance().phase("checkpointer"):
+                checkpointer = await get_best_checkpointer()
 
+            if not checkpointer:
+                print("📝 No persistent checkpointer available, using in-memory checkpointing")
+            _main_graph_with_checkpointer = _compile_main_graph(checkpointer)
 
+            _graph_initialized = True
 
+    return _main_graph_with_checkpointer
 
+async def close_main_graph_with_checkpointer():
+    """Close the checkpointer connections; the next call to get_main_graph_with_checkpointer starts over"""
+    global _main_graph_with_checkpointer, _graph_initialized
 
+    async with _graph_lock:
+        await cleanup_checkpointers()
+        _main_graph_with_checkpointer = None
+        _graph_initialized = False
 
+def get_main_graph():
+    """Synchronous function to get the main graph (returns basic graph without checkpointer, compiled on first use)"""
+    global _main_graph
+    if _main_graph is None:
+        _main_graph = _compile_main_graph()
+    return _main_graph
+
+
+def __getattr__(name: str):
+    # `main_graph` (used by langgraph.json) is compiled when first accessed, not at import
+    if name == "main_graph":
+        return get_main_graph()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
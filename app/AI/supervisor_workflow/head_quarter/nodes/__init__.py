@@ -3,6 +3,7 @@ from .supervisor import supervisor_node
 from .aggregator import aggregator_node
 from .final_reponse import final_response_node
 from .initializer import initializer_node
+from .router import router_node
 
 __all__ = [
     "assessment_node",
@@ -10,4 +11,5 @@ __all__ = [
     "aggregator_node",
     "final_response_node",
     "initializer_node",
+    "router_node",
 ]
\ No newline at end of file
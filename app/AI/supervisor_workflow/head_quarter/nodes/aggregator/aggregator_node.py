@@ -1,4 +1,7 @@
-from typing import Dict, Any
+import functools
+from contextlib import aclosing
+import os
+from typing import Dict, Any, Optional, Tuple
 from langgraph.types import Command
 from langchain_core.messages import AIMessage
 import uuid
@@ -9,19 +12,60 @@ from app.AI.core.llm import LLMFactory, LLMConfig, LLMProviders
 from app.AI.supervisor_workflow.shared.models import ChatState
 from app.AI.supervisor_workflow.shared.models.Nodes import NodeNames_HQ
 from app.AI.supervisor_workflow.shared.models.Chat import SupervisorStatus
+from app.AI.supervisor_workflow.shared.models.Assessment import CompletedTask, TaskStatus
+from app.AI.supervisor_workflow.head_quarter.dept_registry_center import department_registry
 from app.utils.logger import logger
 from app.AI.supervisor_workflow.shared.models.stream_models import StreamPublisher
 
 
-llm = LLMFactory.create_llm(
-    LLMConfig(
-        provider=LLMProviders.OPENAI.value,
-        model="gpt-4.1-mini",
-        temperature=0.3,
-    )
-)
 CURRENT_NODE_NAME = NodeNames_HQ.AGGREGATOR.value
 
+@functools.cache
+def get_llm() -> BaseChatModel:
+    """Created on first use, so importing this module builds no LLM client"""
+    return LLMFactory.create_hedged_llm(
+        LLMConfig(
+            provider=LLMProviders.OPENAI.value,
+            model="gpt-4.1-mini",
+            temperature=0.3,
+        ),
+        backup_config=LLMConfig(
+            provider=LLMProviders.DEEPSEEK.value,
+            model="deepseek-chat",
+            temperature=0.3,
+        ),
+        node_name=CURRENT_NODE_NAME
+    )
+
+# Set AGGREGATOR_BYPASS_ENABLED=false to always synthesize with the LLM
+AGGREGATOR_BYPASS_ENABLED = os.environ.get("AGGREGATOR_BYPASS_ENABLED", "true").lower() == "true"
+
+
+def get_bypass_output(state: ChatState) -> Optional[CompletedTask]:
+    """
+    The department output to use as the final answer without synthesis, if the plan allows it:
+    a single task that succeeded and a department configured with bypass_aggregator.
+
+    state.errors accumulates across the turns of a thread, so this turn's outcome is read from
+    the task's own status, which is ERROR or TIMED_OUT whenever its department failed.
+    """
+    if not AGGREGATOR_BYPASS_ENABLED:
+        return None
+
+    completed_tasks = state.supervisor.completed_tasks
+    if len(completed_tasks) != 1 or len(state.supervisor.dispatched_tasks) != 1:
+        return None
+
+    completed_task = completed_tasks[0]
+    if completed_task.status != TaskStatus.SUCCESS or not completed_task.department_output.strip():
+        return None
+
+    dept_info = department_registry.get_department(completed_task.from_department.value)
+    if dept_info is None or not dept_info.bypass_aggregator:
+        return None
+
+    return completed_task
+
 
 def create_aggregation_prompt(state: ChatState) -> str:
     """
@@ -31,11 +75,12 @@ def create_aggregation_prompt(state: ChatState) -> str:
 
     # Gather completed tasks information
     completed_tasks_summary = []
+    missing_parts = []
     if state.supervisor.completed_tasks:
         for completed_task in state.supervisor.completed_tasks:
-            # Try to find original task description from dispatched tasks
+            # Try to find original task description from dispatched tasks (or planned ones that timed out before dispatch)
             original_task = None
-            for dispatched_task in state.supervisor.dispatched_tasks:
+            for dispatched_task in state.supervisor.dispatched_tasks + state.supervisor.planned_tasks:
                 if dispatched_task.task_id == completed_task.task_id:
                     original_task = dispatched_task
                     break
@@ -43,6 +88,10 @@ def create_aggregation_prompt(state: ChatState) -> str:
             task_description = original_task.description if original_task else f"Task ID: {completed_task.task_id}"
             expected_output = original_task.expected_output if original_task else "Not specified"
 
+            if completed_task.status == TaskStatus.TIMED_OUT:
+                missing_parts.append(f"- {task_description}")
+                continue
+
             task_info = f"""
 Task: {task_description}
 Expected Output: {expected_output}
@@ -55,6 +104,14 @@ Department Response: {completed_task.department_output if completed_task.departm
     user_query = state.user_query
     newline = '\n'
 
+    missing_parts_section = ""
+    if missing_parts:
+        missing_parts_section = f"""
+PARTS THAT COULD NOT BE COMPLETED IN TIME:
+{newline.join(missing_parts)}
+Answer with the results above and briefly tell the user which of these parts are missing from the answer.
+"""
+
     prompt = f"""You are a helpful AI assistant. The user asked you a question and your specialized departments have gathered information to help answer it.
 
 USER'S QUESTION:
@@ -62,6 +119,7 @@ USER'S QUESTION:
 
 DEPARTMENT RESEARCH RESULTS:
 {newline.join(completed_tasks_summary) if completed_tasks_summary else "No additional information was gathered."}
+{missing_parts_section}
 
 CRITICAL INSTRUCTIONS:
 1. **MANDATORY**: You MUST use ALL factual information provided by the departments in your response
@@ -79,11 +137,18 @@ Provide a complete answer that incorporates ALL available research results:"""
     return prompt
 
 
-async def call_llm_for_aggregation(llm: BaseChatModel, prompt: str, publisher: StreamPublisher, state: ChatState) -> str:
+async def call_llm_for_aggregation(llm: BaseChatModel, prompt: str, publisher: StreamPublisher, state: ChatState) -> Tuple[str, bool]:
     """
-    Calls the LLM to generate the final aggregated response with simple streaming.
-    Only sends initial signal and completion marker.
+    Calls the LLM to generate the final aggregated response.
+    Token deltas are published as final_output events as they arrive, so the client
+    sees the first token as soon as the provider sends it.
+
+    Returns:
+        The full response and whether it has already been streamed to the client.
+        If the LLM fails mid-stream, the response is the part the client has already received.
     """
+    # Deltas received from the LLM; publish_text_stream has sent all of them once it returns or raises
+    received = []
     try:
         # Send initial signal
         initial_signal = "Finalizing response..."
@@ -96,12 +161,22 @@ async def call_llm_for_aggregation(llm: BaseChatModel, prompt: str, publisher: S
                 segment_id=0
             )
 
-        # Get the full response
-        full_response = ""
-        async for chunk in llm.astream(prompt):
-            if hasattr(chunk, 'content') and chunk.content:
-                chunk_text = str(chunk.content) if chunk.content else ""
-                full_response += chunk_text
+        async def token_stream():
+            async with aclosing(llm.astream(prompt)) as chunks:
+                async for chunk in chunks:
+                    if hasattr(chunk, 'content') and chunk.content:
+                        received.append(str(chunk.content))
+                        yield received[-1]
+
+        # Stream the response to the client while it is being generated
+        if publisher is not None:
+            full_response = await publisher.publish_text_stream(
+                text=token_stream(),
+                source=NodeNames_HQ.AGGREGATOR.value,
+                event_type="final_output"
+            )
+        else:
+            full_response = "".join([token async for token in token_stream()])
 
         # Send completion marker after successful generation
         if publisher is not None:
@@ -113,9 +188,22 @@ async def call_llm_for_aggregation(llm: BaseChatModel, prompt: str, publisher: S
             )
             logger.info(f"Aggregator completed successfully: {len(full_response)} characters generated")
 
-        return full_response
+        return full_response, publisher is not None and bool(publisher.queue_id)
     except Exception as e:
         logger.error(f"LLM call failed in aggregator: {e}")
+
+        if received and publisher is not None and publisher.queue_id:
+            # Part of the answer is already on the client; close it there instead of appending the fallback
+            partial_response = "".join(received)
+            await publisher.publish_final_output_complete(total_length=len(partial_response))
+            await publisher.publish_thought_complete(
+                source=NodeNames_HQ.AGGREGATOR.value,
+                segment_id=1,
+                total_length=len(partial_response)
+            )
+            logger.info(f"Aggregator stream interrupted after {len(partial_response)} characters")
+            return partial_response, True
+
         # Fallback response if LLM fails
         fallback_response = f"I apologize, but I encountered an error while generating the final response. However, I was able to process your request through multiple departments. Please try again or contact support if the issue persists."
 
@@ -127,7 +215,37 @@ async def call_llm_for_aggregation(llm: BaseChatModel, prompt: str, publisher: S
                 total_length=len(fallback_response)
             )
 
-        return fallback_response
+        # The fallback is left to final_response_node to stream
+        return fallback_response, False
+
+
+async def publish_direct_response(output: str, publisher: StreamPublisher) -> bool:
+    """
+    Publish a department output as the final response, with the same events as a synthesized one.
+
+    Returns:
+        Whether the response has been streamed to the client
+    """
+    if publisher is None:
+        return False
+
+    await publisher.publish_thought(
+        content="Finalizing response...",
+        source=NodeNames_HQ.AGGREGATOR.value,
+        segment_id=0
+    )
+    await publisher.publish_text_stream(
+        text=output,
+        source=NodeNames_HQ.AGGREGATOR.value,
+        event_type="final_output"
+    )
+    await publisher.publish_thought_complete(
+        source=NodeNames_HQ.AGGREGATOR.value,
+        segment_id=1,
+        total_length=len(output),
+        content="Done"
+    )
+    return bool(publisher.queue_id)
 
 
 async def aggregator_node(state: ChatState) -> Command:
@@ -138,7 +256,7 @@ async def aggregator_node(state: ChatState) -> Command:
     1. Collects all completed tasks and their results
     2. Gathers any errors that occurred
     3. Creates a comprehensive prompt for the LLM
-    4. Generates a final synthesized response with simple streaming (initial + completion)
+    4. Generates a final synthesized response, streaming tokens to the client as they arrive
     5. Updates the final_output and completes the workflow
     """
 
@@ -152,14 +270,22 @@ async def aggregator_node(state: ChatState) -> Command:
     publisher = state.get_stream_publisher()
 
     try:
-        # Create the aggregation prompt
-        prompt = create_aggregation_prompt(state)
-
-        # Call LLM for final response generation with simple streaming
-        final_response = await call_llm_for_aggregation(llm, prompt, publisher, state)
+        bypass_output = get_bypass_output(state)
+        if bypass_output is not None:
+            # A single department already produced the answer, no need to rephrase it
+            logger.info(f"!! Aggregator bypassed for {bypass_output.from_department.value} ({bypass_output.task_id}) !!")
+            final_response = bypass_output.department_output
+            streamed = await publish_direct_response(final_response, publisher)
+        else:
+            # Create the aggregation prompt
+            prompt = create_aggregation_prompt(state)
+
+            # Call LLM for final response generation with token streaming
+            final_response, streamed = await call_llm_for_aggregation(get_llm(), prompt, publisher, state)
 
         # Update the final output
         new_updates["final_output"] = final_response
+        new_updates["final_output_streamed"] = streamed
 
         # Add the final response to messages
         new_updates["messages"] = [AIMessage(content=final_response, id=str(uuid.uuid4()))]
@@ -188,6 +314,7 @@ async def aggregator_node(state: ChatState) -> Command:
             )
 
         new_updates["final_output"] = fallback_response
+        new_updates["final_output_streamed"] = False
         new_updates["errors"] = [new_error]
         new_updates["messages"] = [AIMessage(content=fallback_response, id=str(uuid.uuid4()))]
 
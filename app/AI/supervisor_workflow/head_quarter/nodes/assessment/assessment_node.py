@@ -1,4 +1,6 @@
-from typing import Optional, List, Dict, Any
+import functools
+import re
+from typing import Optional, List, Dict, Any, AsyncGenerator, Callable, Set
 from langchain_core.prompts import ChatPromptTemplate, SystemMessagePromptTemplate
 from langgraph.types import Command
 from langgraph.graph import END
@@ -14,11 +16,20 @@ from app.utils.logger import logger
 from app.AI.supervisor_workflow.shared.utils.logUtils import print_current_node
 from app.AI.core.llm import LLMFactory, LLMConfig, LLMProviders
 from app.AI.supervisor_workflow.shared.models.Nodes import NodeNames_HQ
-from app.AI.supervisor_workflow.shared.models.Assessment import LLMAssessmentOutput
+from app.AI.supervisor_workflow.shared.models.Assessment import LLMAssessmentOutput, Task
+from app.AI.supervisor_workflow.shared.models.Chat import SupervisorState
+from app.AI.supervisor_workflow.shared.models.stream_models import StreamPublisher
+from app.AI.supervisor_workflow.head_quarter.nodes.assessment.stream_parser import AssessmentStreamParser
+from app.AI.supervisor_workflow.head_quarter.nodes.assessment.semantic_cache import AssessmentSemanticCache
+from app.AI.supervisor_workflow.departments.models.dept_input import DeptInput
+from app.AI.supervisor_workflow.departments.utils.speculation import SpeculationRegistry
 from app.AI.supervisor_workflow.head_quarter.dept_registry_center import department_registry
 
 CURRENT_NODE_NAME = NodeNames_HQ.ASSESSMENT.value
 
+# dependent_tasks entries that look like task IDs, possibly of tasks not streamed yet
+TASK_ID_PATTERN = re.compile(r"^task_\d+$")
+
 def conver_registered_dept_str() -> str:
     _available_depts = department_registry.get_all_departments()
     formatted_lines = []
@@ -29,18 +40,32 @@ def conver_registered_dept_str() -> str:
 AVAILABLE_DEPARTMENTS_STRING: str = conver_registered_dept_str()
 
 
-llm = LLMFactory.create_llm(
-    LLMConfig(
-        provider=LLMProviders.OPENAI.value,
-        model="gpt-4.1",
-        temperature=1.0,
-        model_kwargs={
-            "response_format": {
-                "type": "json_object"
+@functools.cache
+def get_llm() -> BaseChatModel:
+    """Created on first use, so importing this module builds no LLM client"""
+    return LLMFactory.create_hedged_llm(
+        LLMConfig(
+            provider=LLMProviders.OPENAI.value,
+            model="gpt-4.1",
+            temperature=1.0,
+            model_kwargs={
+                "response_format": {
+                    "type": "json_object"
+                }
+            }
+        ),
+        backup_config=LLMConfig(
+            provider=LLMProviders.DEEPSEEK.value,
+            model="deepseek-chat",
+            temperature=1.0,
+            model_kwargs={
+                "response_format": {
+                    "type": "json_object"
+                }
             }
-        }
+        ),
+        node_name=CURRENT_NODE_NAME
     )
-)
 
 def format_conversation_history(messages: List[AnyMessage]) -> str:
     """Format conversation history for the assessment prompt"""
@@ -62,39 +87,128 @@ def format_conversation_history(messages: List[AnyMessage]) -> str:
 
     return "\n".join(formatted_history)
 
+def _is_speculative_candidate(task: Task, seen_task_ids: Set[str]) -> bool:
+    """Only tasks that cannot depend on another task's output are started early"""
+    return not any(dep in seen_task_ids or TASK_ID_PATTERN.match(dep) for dep in task.dependent_tasks)
+
+
+async def _stream_assessment(
+    llm: BaseChatModel,
+    formatted_messages: List[AnyMessage],
+    parser: AssessmentStreamParser,
+    speculate: Callable[[Task], None],
+) -> AsyncGenerator[str, None]:
+    """
+    Stream the assessment LLM through the incremental parser.
+    Yields the assessment_summary deltas and hands every completed task to `speculate`.
+    """
+    seen_task_ids: Set[str] = set()
+    async for chunk in llm.astream(formatted_messages):
+        content = chunk.content
+        if not isinstance(content, str):
+            error_msg = f"LLM content for assessment is not a string. Received type: {type(content)}. Content: {content}"
+            logger.error(error_msg)
+            raise TypeError(error_msg)
+
+        for kind, value in parser.feed(content):
+            if kind == "summary":
+                yield value
+            else:
+                if _is_speculative_candidate(value, seen_task_ids):
+                    speculate(value)
+                seen_task_ids.add(value.task_id)
+
+
 async def _call_llm_for_assessment(
     llm: BaseChatModel,
     system_prompt_template: SystemMessagePromptTemplate,
     user_query: Optional[str],
     available_departments_str: str,
     conversation_history: str = "",
+    publisher: Optional[StreamPublisher] = None,
+    speculate: Callable[[Task], None] = lambda task: None,
 ) -> LLMAssessmentOutput:
-    try:
-        chat_prompt = ChatPromptTemplate.from_messages([
-            system_prompt_template
-        ])
-        formatted_messages = chat_prompt.format_messages(
-            user_query=user_query,
-            available_departments=available_departments_str,
-            conversation_history=conversation_history
+    """
+    Stream the assessment, forwarding the summary as it is generated and handing each task to
+    `speculate` as soon as its JSON object is complete. The full output is validated at the end.
+    """
+    chat_prompt = ChatPromptTemplate.from_messages([
+        system_prompt_template
+    ])
+    formatted_messages = chat_prompt.format_messages(
+        user_query=user_query,
+        available_departments=available_departments_str,
+        conversation_history=conversation_history
+    )
+
+    parser = AssessmentStreamParser()
+    summary_deltas = _stream_assessment(llm, formatted_messages, parser, speculate)
+
+    streamed_summary = ""
+    if publisher is not None:
+        streamed_summary = await publisher.publish_text_stream(
+            text=summary_deltas,
+            source=NodeNames_HQ.ASSESSMENT.value,
+            start_segment_id=0
         )
+    else:
+        async for _ in summary_deltas:
+            pass
 
+    result = LLMAssessmentOutput.model_validate_json(parser.raw_text.strip())
 
-        response_data = await llm.ainvoke(formatted_messages)
-        raw_content = response_data.content
+    if publisher is not None and not streamed_summary and result.assessment_summary:
+        # The summary could not be decoded while streaming; publish it in one go
+        await publisher.publish_text_stream(
+            text=result.assessment_summary,
+            source=NodeNames_HQ.ASSESSMENT.value,
+            start_segment_id=0
+        )
+
+    return result
 
-        if not isinstance(raw_content, str):
-            error_msg = f"LLM content for assessment is not a string. Received type: {type(raw_content)}. Content: {raw_content}"
-            logger.error(error_msg)
-            raise TypeError(error_msg)
 
-        content_str = raw_content.strip()
-        result = LLMAssessmentOutput.model_validate_json(content_str)
+async def _assess(state: ChatState, publisher: Optional[StreamPublisher], speculate: Callable[[Task], None]) -> LLMAssessmentOutput:
+    """Reuse the plan of a similar earlier query from the semantic cache, or call the assessment LLM"""
+    semantic_cache = AssessmentSemanticCache.get_instance()
+    if semantic_cache.enabled:
+        cached_output = semantic_cache.lookup(state.user_query, state.messages)
+        if cached_output is not None:
+            # Same events as a streamed assessment, so clients see no difference
+            if publisher is not None:
+                await publisher.publish_text_stream(
+                    text=cached_output.assessment_summary,
+                    source=NodeNames_HQ.ASSESSMENT.value,
+                    start_segment_id=0
+                )
+            return cached_output
+
+    llm_assessment_output = await _call_llm_for_assessment(
+        llm=get_llm(),
+        system_prompt_template=sys_prompt_for_assessment,
+        user_query=state.user_query,
+        available_departments_str=AVAILABLE_DEPARTMENTS_STRING,
+        conversation_history=format_conversation_history(state.messages),
+        publisher=publisher,
+        speculate=speculate,
+    )
 
-        return result
+    if semantic_cache.enabled:
+        semantic_cache.store(state.user_query, state.messages, llm_assessment_output)
+    return llm_assessment_output
+
+
+def _discard_unusable_speculations(run_key: Optional[str], report: Optional[LLMAssessmentOutput], started: Dict[str, Task]):
+    """Cancel the early department runs the supervisor will not dispatch unchanged"""
+    registry = SpeculationRegistry.get_instance()
+    final_tasks = {task.task_id: task for task in report.tasks} if report is not None else {}
+
+    for task_id, task in started.items():
+        final_task = final_tasks.get(task_id)
+        if final_task is None or final_task != task or any(
+                dep in final_tasks and dep != task_id for dep in final_task.dependent_tasks):
+            registry.discard(run_key, task_id)
 
-    except Exception as e:
-        raise e
 
 async def assessment_node(state: ChatState, config: RunnableConfig) -> Command:
     """
@@ -124,35 +238,26 @@ async def assessment_node(state: ChatState, config: RunnableConfig) -> Command:
         # "stream_writer": stream_writer
     }
 
-    try:
-        # Format conversation history for assessment context
-        conversation_history = format_conversation_history(state.messages)
+    # Departments started while the assessment is still being written
+    speculated_tasks: Dict[str, Task] = {}
 
-        llm_assessment_output = await _call_llm_for_assessment(
-            llm=llm,
-            system_prompt_template=sys_prompt_for_assessment,
+    def speculate(task: Task):
+        dept_input = DeptInput(
+            task=task,
+            supervisor=SupervisorState(),
+            messages=state.messages,
+            thread_id=getattr(state, 'thread_id', ''),
             user_query=state.user_query,
-            available_departments_str=AVAILABLE_DEPARTMENTS_STRING,
-            conversation_history=conversation_history,
+            stream_queue_id=state.stream_queue_id,
         )
+        if SpeculationRegistry.get_instance().start(state.stream_queue_id, dept_input):
+            speculated_tasks[task.task_id] = task
 
-        logger.info(f"!! Assessment output: {llm_assessment_output.model_dump_json(indent=2)} !!")
-
-
-        if publisher is not None:
-            for i, char in enumerate(llm_assessment_output.assessment_summary):
-                await publisher.publish_thought(
-                    content=char,
-                    source=NodeNames_HQ.ASSESSMENT.value,
-                    segment_id=i
-                )
-                await asyncio.sleep(0.01)
+    try:
+        llm_assessment_output = await _assess(state, publisher, speculate)
 
-            await asyncio.sleep(0.05)
-            await publisher.publish_thought_complete(
-                source=NodeNames_HQ.ASSESSMENT.value,
-                segment_id=len(llm_assessment_output.assessment_summary)
-            )
+        logger.info(f"!! Assessment output: {llm_assessment_output.model_dump_json(indent=2)} !!")
+        _discard_unusable_speculations(state.stream_queue_id, llm_assessment_output, speculated_tasks)
 
         new_updates["assessment"] = state.assessment.model_copy(update={
             "assessment_report": llm_assessment_output,
@@ -168,6 +273,7 @@ async def assessment_node(state: ChatState, config: RunnableConfig) -> Command:
 
     except Exception as e:
         logger.error(f"!! Assessment node error: {e} !!")
+        _discard_unusable_speculations(state.stream_queue_id, None, speculated_tasks)
         new_error = state.build_error(e, CURRENT_NODE_NAME)
 
         # Update core state with error
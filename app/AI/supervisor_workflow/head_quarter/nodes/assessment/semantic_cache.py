@@ -0,0 +1,248 @@
+import hashlib
+import os
+import re
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from langchain_core.messages import AnyMessage
+
+from app.AI.supervisor_workflow.shared.models.Assessment import LLMAssessmentOutput
+from app.utils.logger import logger
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+# The cache is opt-in: ASSESSMENT_CACHE_ENABLED=true reuses plans of similar earlier queries
+ASSESSMENT_CACHE_ENABLED = os.environ.get("ASSESSMENT_CACHE_ENABLED", "false").lower() == "true"
+# Cosine similarity of the query embeddings a cached plan needs to be reused
+ASSESSMENT_CACHE_THRESHOLD = float(os.environ.get("ASSESSMENT_CACHE_THRESHOLD", "0.9"))
+ASSESSMENT_CACHE_MAX_ENTRIES = int(os.environ.get("ASSESSMENT_CACHE_MAX_ENTRIES", "512"))
+ASSESSMENT_CACHE_TTL = float(os.environ.get("ASSESSMENT_CACHE_TTL", "3600"))
+# Earlier messages that make up the history fingerprint
+ASSESSMENT_CACHE_HISTORY_MESSAGES = int(os.environ.get("ASSESSMENT_CACHE_HISTORY_MESSAGES", "4"))
+
+_EMBEDDING_DIM = 1024
+_NGRAM_SIZES = (3, 4)
+_NUMBER_PATTERN = re.compile(r"\d+(?:[.,]\d+)?")
+_NON_WORD_PATTERN = re.compile(r"[^\w\s]")
+# Words that may differ between queries sharing a plan
+_STOP_WORDS = frozenset({
+    "a", "an", "the", "of", "in", "on", "at", "to", "for", "from", "by", "with", "about", "and", "or",
+    "is", "are", "was", "were", "be", "do", "does", "did", "what", "whats", "which", "who", "how",
+    "me", "my", "i", "you", "your", "it", "its", "this", "that", "please", "can", "could", "would",
+    "tell", "give", "show", "find", "s",
+})
+
+
+def normalize_query(query: str) -> str:
+    """Lowercased, punctuation-free query with collapsed whitespace"""
+    return " ".join(_NON_WORD_PATTERN.sub(" ", query.lower()).split())
+
+
+def embed_query(normalized_query: str) -> "np.ndarray":
+    """
+    L2-normalized hashed character n-gram embedding.
+    Word boundaries are padded with spaces, so word starts and ends get n-grams of their own.
+    """
+    vector = np.zeros(_EMBEDDING_DIM, dtype=np.float32)
+    text = f" {normalized_query} "
+    for size in _NGRAM_SIZES:
+        for start in range(len(text) - size + 1):
+            vector[zlib.crc32(text[start:start + size].encode("utf-8")) % _EMBEDDING_DIM] += 1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def query_terms(normalized_query: str) -> FrozenSet[str]:
+    """The words of the query that name what it is about: no numbers, no stop words"""
+    return frozenset(
+        word for word in normalized_query.split()
+        if word not in _STOP_WORDS and not _NUMBER_PATTERN.fullmatch(word)
+    )
+
+
+def history_fingerprint(messages: List[AnyMessage]) -> str:
+    """
+    Hash of the recent conversation before the current query (the last message).
+    Plans are only reused between queries asked after the same recent history.
+    """
+    recent = messages[:-1][-ASSESSMENT_CACHE_HISTORY_MESSAGES:] if ASSESSMENT_CACHE_HISTORY_MESSAGES > 0 else []
+    digest = hashlib.sha1()
+    for message in recent:
+        digest.update(f"{message.type}:{' '.join(str(message.content).split())}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def clone_with_fresh_task_ids(report: LLMAssessmentOutput) -> LLMAssessmentOutput:
+    """Deep copy of the plan whose task IDs (and the dependencies on them) are new"""
+    prefix = uuid.uuid4().int % 10**6
+    id_map = {task.task_id: f"task_{prefix:06d}{index + 1:03d}" for index, task in enumerate(report.tasks)}
+    return LLMAssessmentOutput(
+        tasks=[
+            task.model_copy(update={
+                "task_id": id_map[task.task_id],
+                "dependent_tasks": [id_map.get(dep, dep) for dep in task.dependent_tasks],
+            })
+            for task in report.tasks
+        ],
+        assessment_summary=report.assessment_summary,
+    )
+
+
+@dataclass
+class _CacheEntry:
+    normalized_query: str
+    numbers: Tuple[str, ...]
+    terms: FrozenSet[str]
+    embedding: Any
+    report: LLMAssessmentOutput
+    expires_at: float
+    hits: int = 0
+
+
+@dataclass
+class _Partition:
+    """Entries asked after the same history, with their embeddings stacked for one matrix product"""
+    keys: List[int] = field(default_factory=list)
+    matrix: Any = None
+
+
+class AssessmentSemanticCache:
+    """
+    Singleton cache of assessment plans, looked up by query similarity.
+
+    A plan is reused for a query asked after the same recent history (exact fingerprint) whose
+    hashed n-gram embedding is at least ASSESSMENT_CACHE_THRESHOLD similar to a cached query
+    and that mentions the same numbers and the same terms (words other than stop words), so
+    "2 + 3" never reuses the plan of "2 + 4", nor "population of Australia" that of "Austria".
+    The embedding only bridges wording: stop words, word order, punctuation and case.
+    Least recently used entries are evicted beyond ASSESSMENT_CACHE_MAX_ENTRIES.
+    """
+    _instance = None
+
+    def __init__(self, threshold: float = ASSESSMENT_CACHE_THRESHOLD, max_entries: int = ASSESSMENT_CACHE_MAX_ENTRIES,
+                 ttl: float = ASSESSMENT_CACHE_TTL):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[int, _CacheEntry]" = OrderedDict()
+        self._entry_partition: Dict[int, str] = {}
+        self._partitions: Dict[str, _Partition] = {}
+        self._next_key = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._hit_similarity_total = 0.0
+
+    @classmethod
+    def get_instance(cls) -> 'AssessmentSemanticCache':
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @property
+    def enabled(self) -> bool:
+        return ASSESSMENT_CACHE_ENABLED and HAS_NUMPY
+
+    def lookup(self, user_query: str, messages: List[AnyMessage]) -> Optional[LLMAssessmentOutput]:
+        """A clone of the plan of the most similar cached query, or None"""
+        normalized = normalize_query(user_query or "")
+        partition = self._partitions.get(history_fingerprint(messages))
+        if not normalized or partition is None or not partition.keys:
+            self.misses += 1
+            return None
+
+        if partition.matrix is None:
+            partition.matrix = np.stack([self._entries[key].embedding for key in partition.keys])
+        similarities = partition.matrix @ embed_query(normalized)
+        numbers = tuple(_NUMBER_PATTERN.findall(normalized))
+        terms = query_terms(normalized)
+        now = time.time()
+
+        for index in np.argsort(similarities)[::-1]:
+            similarity = float(similarities[index])
+            if similarity < self.threshold:
+                break
+            key = partition.keys[index]
+            entry = self._entries[key]
+            if entry.expires_at <= now:
+                self._remove(key)
+                return self.lookup(user_query, messages)
+            if entry.numbers != numbers or entry.terms != terms:
+                continue
+
+            self._entries.move_to_end(key)
+            entry.hits += 1
+            self.hits += 1
+            self._hit_similarity_total += similarity
+            logger.info(f"Assessment cache hit ({similarity:.3f}): '{user_query}' ~ '{entry.normalized_query}'")
+            return clone_with_fresh_task_ids(entry.report)
+
+        self.misses += 1
+        return None
+
+    def store(self, user_query: str, messages: List[AnyMessage], report: LLMAssessmentOutput):
+        normalized = normalize_query(user_query or "")
+        if not normalized or not report.tasks:
+            return
+
+        fingerprint = history_fingerprint(messages)
+        key = self._next_key
+        self._next_key += 1
+        self._entries[key] = _CacheEntry(
+            normalized_query=normalized,
+            numbers=tuple(_NUMBER_PATTERN.findall(normalized)),
+            terms=query_terms(normalized),
+            embedding=embed_query(normalized),
+            report=report.model_copy(deep=True),
+            expires_at=time.time() + self.ttl,
+        )
+        self._entry_partition[key] = fingerprint
+        partition = self._partitions.setdefault(fingerprint, _Partition())
+        partition.keys.append(key)
+        partition.matrix = None
+        self.stores += 1
+
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, key: int):
+        self._entries.pop(key, None)
+        fingerprint = self._entry_partition.pop(key, None)
+        partition = self._partitions.get(fingerprint)
+        if partition is None:
+            return
+        partition.keys.remove(key)
+        partition.matrix = None
+        if not partition.keys:
+            del self._partitions[fingerprint]
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "threshold": self.threshold,
+            "entries": len(self._entries),
+            "history_partitions": len(self._partitions),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "avg_hit_similarity": self._hit_similarity_total / self.hits if self.hits else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
+
+
+if ASSESSMENT_CACHE_ENABLED and not HAS_NUMPY:
+    logger.warning("numpy is not installed, the assessment semantic cache is disabled")
@@ -0,0 +1,148 @@
+import json
+from typing import List, Optional, Tuple, Union
+
+from pydantic import ValidationError
+
+from app.AI.supervisor_workflow.shared.models.Assessment import Task
+from app.utils.logger import logger
+
+# Parser events: a task whose JSON object just closed, or a new piece of assessment_summary text
+AssessmentStreamEvent = Tuple[str, Union[Task, str]]
+
+
+class AssessmentStreamParser:
+    """
+    Incremental parser for the assessment LLM's JSON output.
+
+    Fed with raw chunks as they stream in, it emits ("task", Task) as soon as an object of the
+    top-level "tasks" array closes and ("summary", text) for every new piece of the top-level
+    "assessment_summary" string. It only scans the text once and never re-parses the whole
+    document (summary text is decoded as it arrives, each piece once); the complete output is still validated with LLMAssessmentOutput at the end.
+    """
+
+    def __init__(self):
+        self._text = ""
+        self._pos = 0
+
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+        self._string_start = -1
+        self._last_key: Optional[str] = None
+        self._expect_key = False
+        self._array_key: Optional[str] = None
+        self._task_start = -1
+
+        # Start of the assessment_summary text not decoded yet (-1 outside of it)
+        self._summary_start = -1
+
+    @property
+    def raw_text(self) -> str:
+        return self._text
+
+    def feed(self, chunk: str) -> List[AssessmentStreamEvent]:
+        self._text += chunk
+        events: List[AssessmentStreamEvent] = []
+        text = self._text
+
+        for pos in range(self._pos, len(text)):
+            char = text[pos]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._close_string(pos, events)
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = pos + 1
+                if self._depth == 1 and not self._expect_key and self._last_key == "assessment_summary":
+                    self._summary_start = pos + 1
+            elif char == "{":
+                self._depth += 1
+                if self._depth == 1:
+                    self._expect_key = True
+                elif self._depth == 3 and self._array_key == "tasks":
+                    self._task_start = pos
+            elif char == "}":
+                if self._depth == 3 and self._array_key == "tasks" and self._task_start >= 0:
+                    self._emit_task(text[self._task_start:pos + 1], events)
+                    self._task_start = -1
+                self._depth -= 1
+            elif char == "[":
+                self._depth += 1
+                if self._depth == 2:
+                    self._array_key = self._last_key
+            elif char == "]":
+                if self._depth == 2:
+                    self._array_key = None
+                self._depth -= 1
+            elif char == ":" and self._depth == 1:
+                self._expect_key = False
+            elif char == "," and self._depth == 1:
+                self._expect_key = True
+                self._last_key = None
+
+        self._pos = len(text)
+
+        # Forward the summary text that is complete so far, before its closing quote arrives
+        if self._in_string and self._summary_start >= 0:
+            self._emit_summary(len(text), events, final=False)
+
+        return events
+
+    def _close_string(self, end: int, events: List[AssessmentStreamEvent]):
+        if self._depth != 1:
+            return
+
+        if self._expect_key:
+            self._last_key = self._decode(self._text[self._string_start:end])
+        elif self._summary_start >= 0:
+            self._emit_summary(end, events, final=True)
+            self._summary_start = -1
+
+    def _emit_summary(self, end: int, events: List[AssessmentStreamEvent], final: bool):
+        """Decode the summary text that arrived since the last call, up to end (exclusive)"""
+        raw = self._text[self._summary_start:end]
+        if not final:
+            # Do not cut an escape sequence in half
+            cut = raw.rfind("\\")
+            if cut >= 0 and cut >= len(raw) - 6:
+                backslashes = len(raw[:cut + 1]) - len(raw[:cut + 1].rstrip("\\"))
+                escape_length = 6 if raw[cut + 1:cut + 2] == "u" else 2
+                if backslashes % 2 == 1 and len(raw) - cut < escape_length:
+                    raw = raw[:cut]
+
+        decoded = self._decode(raw)
+        if decoded and not final and "\ud800" <= decoded[-1] <= "\udbff":
+            # High surrogate whose pair has not arrived yet: keep its \uXXXX escape for the next call
+            decoded = decoded[:-1]
+            raw = raw[:-6] if raw[-6:-4] == "\\u" else raw[:-1]
+        if decoded is None:
+            return
+
+        # raw always ends on an escape boundary, so the next call starts on one
+        self._summary_start += len(raw)
+        if decoded:
+            events.append(("summary", decoded))
+
+    @staticmethod
+    def _decode(raw: str) -> Optional[str]:
+        try:
+            return json.loads(f'"{raw}"')
+        except json.JSONDecodeError:
+            return None
+
+    @staticmethod
+    def _emit_task(raw_task: str, events: List[AssessmentStreamEvent]):
+        try:
+            events.append(("task", Task.model_validate_json(raw_task)))
+        except (ValidationError, ValueError) as e:
+            # Left to the final validation of the whole report
+            logger.warning(f"Could not parse streamed assessment task: {e}")
@@ -1,6 +1,5 @@
 from langgraph.graph import END
 from langgraph.types import Command
-import asyncio
 
 from app.AI.supervisor_workflow.shared.models import ChatState
 from app.utils.logger import logger
@@ -10,17 +9,11 @@ async def stream_final_output_directly(response_text: str, publisher):
     """Stream the final output directly as response content, not as thought chunks"""
     try:
         if publisher is not None and response_text:
-            # Stream each character of the final response directly
-            for char_position, char in enumerate(response_text, 1):
-                await publisher.publish_final_output(
-                    content=char,
-                    segment_id=char_position
-                )
-                await asyncio.sleep(0.01)  # Small delay between characters
-
-            # Send final completion signal
-            await publisher.publish_final_output_complete(
-                total_length=len(response_text)
+            # Stream the final response in chunks, then the completion signal
+            await publisher.publish_text_stream(
+                text=response_text,
+                source="FinalResponse",
+                event_type="final_output"
             )
 
             logger.info(f"Streamed final output directly: {len(response_text)} characters total")
@@ -34,13 +27,20 @@ async def final_response_node(state: ChatState) -> Command:
 
     This node:
     1. Takes the final_output generated by the aggregator
-    2. Streams it directly as the actual response content (not as thought chunks)
+    2. Streams it directly as the actual response content (not as thought chunks),
+       unless the aggregator already streamed it token by token
     3. Ends the workflow
     """
 
     logger.info(f"!! Final Response node starting !!")
     logger.info(f"!! Final output length: {len(state.final_output)} characters !!")
 
+    if state.final_output_streamed:
+        logger.info(f"!! Final output already streamed by aggregator, nothing to replay !!")
+        return Command(
+            goto=END
+        )
+
     # Get publisher for streaming
     publisher = state.get_stream_publisher()
 
@@ -29,6 +29,7 @@ def create_new_turn_state(user_query: str, messages: List[AnyMessage] = []) -> O
         user_query=user_query,
         messages=[HumanMessage(content=user_query)],
         final_output="",
+        final_output_streamed=False,
         errors=[],
         assessment=AssessmentState(
             assessment_report=None,
@@ -37,6 +38,7 @@ def create_new_turn_state(user_query: str, messages: List[AnyMessage] = []) -> O
 
         supervisor=SupervisorState(
             supervisor_status=SupervisorStatus.IDLE,
+            planned_tasks=[],
             dispatched_tasks=[],
             dispatched_task_ids=set(),
             completed_tasks=[],
@@ -54,6 +56,6 @@ async def initializer_node(state: ChatState) -> Command:
 
     return Command(
         update=init_state,
-        goto=NodeNames_HQ.ASSESSMENT.value
+        goto=NodeNames_HQ.ROUTER.value
     )
 
@@ -0,0 +1,6 @@
+from .router_node import router_node, RouterMetrics
+
+__all__ = [
+    "router_node",
+    "RouterMetrics",
+]
\ No newline at end of file
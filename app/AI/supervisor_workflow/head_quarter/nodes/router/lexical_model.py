@@ -0,0 +1,98 @@
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from app.AI.supervisor_workflow.head_quarter.dept_registry_center import Dept_Info
+
+_TOKEN_PATTERN = re.compile(r"[a-z]+")
+
+_STOP_WORDS = frozenset({
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "for", "with", "by", "at", "from", "as",
+    "is", "are", "was", "were", "be", "been", "it", "its", "this", "that", "these", "those", "do",
+    "does", "did", "can", "could", "would", "should", "will", "me", "my", "i", "you", "your", "we",
+    "our", "please", "some", "any", "such", "other", "not", "if", "when", "which", "who", "whom",
+    "what", "how", "about", "into", "than", "then", "there", "their", "they", "so", "also", "s",
+})
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens without stop words, with a crude suffix stripping"""
+    tokens = []
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        if token in _STOP_WORDS:
+            continue
+        for suffix in ("ing", "ed", "es", "s"):
+            if len(token) > len(suffix) + 3 and token.endswith(suffix):
+                token = token[:-len(suffix)]
+                break
+        tokens.append(token)
+    return tokens
+
+
+@dataclass
+class LexicalPrediction:
+    department: str
+    # Posterior probability of the best department
+    confidence: float
+    # Share of the query's tokens the model has seen during training
+    coverage: float
+
+
+class LexicalDepartmentModel:
+    """
+    Multinomial naive Bayes over the words of the department descriptions and routing examples.
+
+    It is tiny and deterministic; the posterior of the best department together with the share
+    of known query tokens tells the router whether it may skip the assessment LLM.
+    """
+
+    def __init__(self, smoothing: float = 0.5):
+        self.smoothing = smoothing
+        self._log_likelihoods: Dict[str, Dict[str, float]] = {}
+        self._unknown_log_likelihood: Dict[str, float] = {}
+        self._vocabulary: set = set()
+
+    @classmethod
+    def from_departments(cls, departments: Dict[str, Dept_Info]) -> 'LexicalDepartmentModel':
+        model = cls()
+        model.fit({
+            name: " ".join([info.description, *info.routing_examples])
+            for name, info in departments.items()
+        })
+        return model
+
+    def fit(self, documents: Dict[str, str]):
+        counts = {name: Counter(tokenize(text)) for name, text in documents.items()}
+        self._vocabulary = set().union(*counts.values()) if counts else set()
+        vocabulary_size = len(self._vocabulary)
+
+        self._log_likelihoods = {}
+        self._unknown_log_likelihood = {}
+        for name, counter in counts.items():
+            total = sum(counter.values()) + self.smoothing * vocabulary_size
+            self._log_likelihoods[name] = {
+                token: math.log((count + self.smoothing) / total) for token, count in counter.items()
+            }
+            self._unknown_log_likelihood[name] = math.log(self.smoothing / total)
+
+    def predict(self, text: str) -> Optional[LexicalPrediction]:
+        """Best department for the text, or None when no token of it is known"""
+        tokens = tokenize(text)
+        known = [token for token in tokens if token in self._vocabulary]
+        if not known:
+            return None
+
+        scores = {
+            name: sum(likelihoods.get(token, self._unknown_log_likelihood[name]) for token in known)
+            for name, likelihoods in self._log_likelihoods.items()
+        }
+        best = max(scores, key=scores.get)
+        # Softmax with uniform priors
+        normalizer = sum(math.exp(score - scores[best]) for score in scores.values())
+        return LexicalPrediction(
+            department=best,
+            confidence=1.0 / normalizer,
+            coverage=len(known) / len(tokens),
+        )
@@ -0,0 +1,215 @@
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from langgraph.types import Command
+from langchain_core.messages import AnyMessage
+
+from app.AI.supervisor_workflow.shared.models import ChatState
+from app.AI.supervisor_workflow.shared.models.Nodes import NodeNames_HQ, NodeNames_Dept
+from app.AI.supervisor_workflow.shared.models.Assessment import LLMAssessmentOutput, Task
+from app.AI.supervisor_workflow.shared.utils.logUtils import print_current_node
+from app.AI.supervisor_workflow.head_quarter.dept_registry_center import department_registry
+from app.utils.logger import logger
+from .lexical_model import LexicalDepartmentModel
+
+CURRENT_NODE_NAME = NodeNames_HQ.ROUTER.value
+
+# Set ROUTER_ENABLED=false to always use the assessment LLM
+ROUTER_ENABLED = os.environ.get("ROUTER_ENABLED", "true").lower() == "true"
+# The lexical model must be at least this sure, and know this share of the query's words
+ROUTER_CONFIDENCE_THRESHOLD = float(os.environ.get("ROUTER_CONFIDENCE_THRESHOLD", "0.9"))
+ROUTER_MIN_COVERAGE = float(os.environ.get("ROUTER_MIN_COVERAGE", "0.6"))
+# Longer queries usually hold several intents and are left to the assessment
+ROUTER_MAX_QUERY_CHARS = int(os.environ.get("ROUTER_MAX_QUERY_CHARS", "160"))
+
+_GREETING_PATTERN = re.compile(
+    r"^(hi|hello|hey|yo|thanks|thank you|thx|good (morning|afternoon|evening)|bye|goodbye|how are you)"
+    r"( there| again| so much| a lot)?[\s!.?,]*$"
+)
+_ARITHMETIC_PREFIX = re.compile(r"^(what is|what's|whats|calculate|compute|evaluate|how much is)\s+")
+_ARITHMETIC_PATTERN = re.compile(r"^[\d\s.,+\-*/^()%×÷x]+$")
+_ARITHMETIC_OPERATOR = re.compile(r"\d\s*[+\-*/^%×÷x]\s*[\d(]")
+# Words that point at earlier turns; such queries need the assessment's view of the history
+_REFERENCE_WORDS = frozenset({"it", "that", "this", "them", "those", "previous", "above", "again", "same", "he", "she", "they"})
+_MULTI_INTENT_PATTERN = re.compile(r"\?.*\?|;|\n|\b(and then|after that|also)\b")
+
+
+@dataclass
+class RouteDecision:
+    department: Optional[NodeNames_Dept]
+    confidence: float
+    method: str
+    reason: str = ""
+
+    @property
+    def is_fast_path(self) -> bool:
+        return self.department is not None
+
+
+class RouterMetrics:
+    """Fast-path hit rate and the confidence distribution of the lexical model, for threshold tuning"""
+    _instance = None
+
+    def __init__(self):
+        self.total = 0
+        self.fast_path = 0
+        self.by_method: Counter = Counter()
+        self.by_department: Counter = Counter()
+        self.fallback_reasons: Counter = Counter()
+        # Lexical model confidences in tenths, accepted or not
+        self.confidence_histogram: List[int] = [0] * 10
+
+    @classmethod
+    def get_instance(cls) -> 'RouterMetrics':
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def record(self, decision: RouteDecision):
+        self.total += 1
+        self.by_method[decision.method] += 1
+        if decision.is_fast_path:
+            self.fast_path += 1
+            self.by_department[decision.department.value] += 1
+        else:
+            self.fallback_reasons[decision.reason] += 1
+        if decision.method == "lexical":
+            self.confidence_histogram[min(int(decision.confidence * 10), 9)] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "fast_path": self.fast_path,
+            "hit_rate": self.fast_path / self.total if self.total else 0.0,
+            "confidence_threshold": ROUTER_CONFIDENCE_THRESHOLD,
+            "by_method": dict(self.by_method),
+            "by_department": dict(self.by_department),
+            "fallback_reasons": dict(self.fallback_reasons),
+            "lexical_confidence_histogram": {
+                f"{bucket / 10:.1f}-{(bucket + 1) / 10:.1f}": count
+                for bucket, count in enumerate(self.confidence_histogram)
+            },
+        }
+
+
+_lexical_model: Optional[LexicalDepartmentModel] = None
+
+
+def get_lexical_model() -> LexicalDepartmentModel:
+    """Train the lexical model on the available departments on first use"""
+    global _lexical_model
+    if _lexical_model is None:
+        _lexical_model = LexicalDepartmentModel.from_departments(department_registry.get_all_available_departments())
+    return _lexical_model
+
+
+def _fallback(reason: str, method: str = "rules", confidence: float = 0.0) -> RouteDecision:
+    return RouteDecision(department=None, confidence=confidence, method=method, reason=reason)
+
+
+def _is_arithmetic(query: str) -> bool:
+    expression = _ARITHMETIC_PREFIX.sub("", query).rstrip("?= ")
+    return bool(_ARITHMETIC_PATTERN.match(expression)) and bool(_ARITHMETIC_OPERATOR.search(expression))
+
+
+def classify_query(user_query: str, messages: List[AnyMessage]) -> RouteDecision:
+    """
+    Decide whether a query can skip the assessment LLM.
+    Returns the department for a single task, or a decision without department to fall back.
+    """
+    query = " ".join(user_query.lower().split())
+    available = set(department_registry.get_available_department_names())
+
+    if not query:
+        return _fallback("empty")
+
+    if _GREETING_PATTERN.match(query) and NodeNames_Dept.GENERAL_KNOWLEDGE.value in available:
+        return RouteDecision(NodeNames_Dept.GENERAL_KNOWLEDGE, 1.0, "greeting")
+
+    if _is_arithmetic(query) and NodeNames_Dept.MATH_DEPT.value in available:
+        return RouteDecision(NodeNames_Dept.MATH_DEPT, 1.0, "arithmetic")
+
+    if len(query) > ROUTER_MAX_QUERY_CHARS:
+        return _fallback("too_long")
+    if _MULTI_INTENT_PATTERN.search(query):
+        return _fallback("multi_intent")
+    # The current query is the last message; anything before it is history
+    if len(messages) > 1 and _REFERENCE_WORDS.intersection(query.replace("?", " ").split()):
+        return _fallback("follow_up")
+
+    prediction = get_lexical_model().predict(query)
+    if prediction is None:
+        return _fallback("unknown_words", method="lexical")
+    if prediction.coverage < ROUTER_MIN_COVERAGE:
+        return _fallback("low_coverage", method="lexical", confidence=prediction.confidence)
+    if prediction.confidence < ROUTER_CONFIDENCE_THRESHOLD:
+        return _fallback("low_confidence", method="lexical", confidence=prediction.confidence)
+
+    return RouteDecision(NodeNames_Dept(prediction.department), prediction.confidence, "lexical")
+
+
+def build_fast_path_assessment(user_query: str, decision: RouteDecision) -> LLMAssessmentOutput:
+    """Single-task assessment report equivalent to what the assessment LLM produces"""
+    task = Task(
+        task_id="task_001",
+        priority=1,
+        description=user_query,
+        dependent_tasks=[],
+        expected_output="A direct, complete answer to the user's query.",
+        suggested_department=decision.department,
+    )
+    return LLMAssessmentOutput(
+        tasks=[task],
+        assessment_summary=f"The query is handled directly by {decision.department.value}.",
+    )
+
+
+async def router_node(state: ChatState) -> Command:
+    """
+    Fast-path router between the initializer and the assessment.
+
+    Trivially classifiable queries (greetings, plain arithmetic, queries the lexical model is
+    confident about) get a single-task assessment report without calling the assessment LLM;
+    everything else goes on to the assessment node.
+    """
+    print_current_node(CURRENT_NODE_NAME)
+
+    if not ROUTER_ENABLED:
+        return Command(goto=NodeNames_HQ.ASSESSMENT.value)
+
+    try:
+        decision = classify_query(state.user_query or "", state.messages)
+    except Exception as e:
+        logger.error(f"!! Router node error, falling back to assessment: {e} !!")
+        decision = _fallback("error")
+
+    RouterMetrics.get_instance().record(decision)
+
+    if not decision.is_fast_path:
+        logger.info(f"Router falls back to assessment ({decision.method}: {decision.reason}, confidence {decision.confidence:.2f})")
+        return Command(goto=NodeNames_HQ.ASSESSMENT.value)
+
+    logger.info(f"Router fast path to {decision.department.value} ({decision.method}, confidence {decision.confidence:.2f})")
+    assessment_report = build_fast_path_assessment(state.user_query, decision)
+
+    # Same events as the assessment node, so clients see no difference
+    publisher = state.get_stream_publisher()
+    if publisher is not None:
+        await publisher.publish_text_stream(
+            text=assessment_report.assessment_summary,
+            source=NodeNames_HQ.ASSESSMENT.value,
+            start_segment_id=0
+        )
+
+    return Command(
+        update={
+            "assessment": state.assessment.model_copy(update={
+                "assessment_report": assessment_report,
+                "assessment_summary": assessment_report.assessment_summary,
+            })
+        },
+        goto=NodeNames_HQ.SUPERVISOR.value
+    )
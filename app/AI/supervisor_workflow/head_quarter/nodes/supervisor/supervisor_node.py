@@ -1,3 +1,5 @@
+import os
+import time
 from typing import Dict, Optional, List, Tuple, Iterator, Any
 from langgraph.types import Command, Send
 from langgraph.graph import END
@@ -6,15 +8,22 @@ import asyncio
 # Removed StreamWriter imports - now using queue-based streaming
 
 from app.AI.supervisor_workflow.shared.models import ChatState
-from app.AI.supervisor_workflow.shared.models.Assessment import LLMAssessmentOutput, Task
+from app.AI.supervisor_workflow.shared.models.Assessment import LLMAssessmentOutput, Task, CompletedTask
 from app.AI.supervisor_workflow.shared.models.Nodes import NodeNames_HQ, NodeNames_Dept
 from app.utils.logger import logger
 from app.AI.supervisor_workflow.shared.models.Chat import SupervisorStatus, SupervisorState
 from app.AI.supervisor_workflow.departments.models.dept_input import DeptInput
+from app.AI.supervisor_workflow.departments.utils.deadline import timed_out_task
+from app.AI.supervisor_workflow.departments.utils.dependents import DependentTaskScheduler
+from app.AI.supervisor_workflow.head_quarter.dept_registry_center import department_registry
+from .task_dag import build_task_dag, get_ready_tasks
 
 
 CURRENT_NODE_NAME = NodeNames_HQ.SUPERVISOR.value
 
+# Seconds the whole plan may take; tasks still running afterwards are cancelled and reported missing
+SUPERVISOR_REQUEST_DEADLINE = float(os.environ.get("SUPERVISOR_REQUEST_DEADLINE", "120"))
+
 def _assessment_report_is_valid(assessment_report: Optional[LLMAssessmentOutput]) -> bool:
     return assessment_report is not None and \
         assessment_report.tasks is not None and \
@@ -66,20 +75,10 @@ async def stream_task_dispatch(tasks: List[Task], publisher):
             # Combine all tasks into a single formatted output
             full_output = "\n".join(task_lines)
 
-            # Stream the complete task list character by character
-            for char_position, char in enumerate(full_output, 1):
-                await publisher.publish_thought(
-                    content=char,
-                    source="Supervisor",
-                    segment_id=char_position
-                )
-                await asyncio.sleep(0.01)
-
-            # Send completion marker
-            await publisher.publish_thought_complete(
-                source="Supervisor",
-                segment_id=len(full_output),
-                total_length=len(full_output)
+            # Stream the complete task list in chunks, then the completion marker
+            await publisher.publish_text_stream(
+                text=full_output,
+                source="Supervisor"
             )
 
             # logger.info(f"Streamed task dispatch: {len(tasks)} tasks, {len(full_output)} characters total")
@@ -87,6 +86,44 @@ async def stream_task_dispatch(tasks: List[Task], publisher):
         logger.error(f"Warning: Could not stream task dispatch: {e}")
 
 
+def _task_deadline(task: Task, supervisor: SupervisorState) -> Optional[float]:
+    """The department's task timeout from now, capped by the deadline of the whole plan"""
+    dept_info = department_registry.get_department(task.suggested_department.value)
+    deadlines = [deadline for deadline in (
+        time.time() + dept_info.task_timeout if dept_info is not None else None,
+        supervisor.deadline_at,
+    ) if deadline is not None]
+    return min(deadlines) if deadlines else None
+
+
+def _task_timeouts(tasks: List[Task]) -> Dict[str, float]:
+    """Each task's department timeout, for dependents started by the departments themselves"""
+    timeouts: Dict[str, float] = {}
+    for task in tasks:
+        dept_info = department_registry.get_department(task.suggested_department.value)
+        if dept_info is not None:
+            timeouts[task.task_id] = dept_info.task_timeout
+    return timeouts
+
+
+def _send_tasks(state: ChatState, tasks: List[Task], supervisor: SupervisorState) -> List[Send]:
+    """Build one Send per task, injecting the outputs of the tasks it depends on"""
+    completed_by_id: Dict[str, CompletedTask] = {
+        completed_task.task_id: completed_task for completed_task in supervisor.completed_tasks
+    }
+
+    return [Send(task.suggested_department.value, DeptInput(
+        task=task,
+        supervisor=supervisor,
+        messages=state.messages,  # Pass conversation history
+        thread_id=getattr(state, 'thread_id', ''),  # Pass thread context
+        user_query=state.user_query,  # Pass current user query
+        stream_queue_id=state.stream_queue_id,  # Pass queue ID for streaming
+        upstream_outputs=[completed_by_id[dep] for dep in task.dependent_tasks if dep in completed_by_id],
+        deadline_at=_task_deadline(task, supervisor),
+    )) for task in tasks]
+
+
 async def handle_task_dispatch(state: ChatState) -> Command:
     new_updates: Dict[str, Any] = {}
 
@@ -120,45 +157,97 @@ async def handle_task_dispatch(state: ChatState) -> Command:
     publisher = state.get_stream_publisher()
     await stream_task_dispatch(tasks, publisher)
 
+    # Plan the whole DAG, dispatch only the tasks without dependencies now
+    planned_tasks = build_task_dag(tasks)
+    ready_tasks = get_ready_tasks(planned_tasks, set(), set())
+
+    # A full SupervisorState replaces the previous turn's supervisor state
     new_updates["supervisor"] = SupervisorState(
-        dispatched_tasks=tasks,
-        dispatched_task_ids={task.task_id for task in tasks},
-        supervisor_status=SupervisorStatus.PENDING
+        planned_tasks=planned_tasks,
+        dispatched_tasks=ready_tasks,
+        dispatched_task_ids={task.task_id for task in ready_tasks},
+        supervisor_status=SupervisorStatus.PENDING,
+        deadline_at=time.time() + SUPERVISOR_REQUEST_DEADLINE if SUPERVISOR_REQUEST_DEADLINE > 0 else None
+    )
+
+    # Departments start the dependents of their task as soon as it completes
+    DependentTaskScheduler.get_instance().plan(
+        state.stream_queue_id,
+        planned_tasks,
+        new_updates["supervisor"].dispatched_task_ids,
+        _task_timeouts(planned_tasks),
+        new_updates["supervisor"].deadline_at,
     )
 
     return Command(
         update=new_updates,
         graph=CURRENT_NODE_NAME,
-        goto=[Send(task.suggested_department.value, DeptInput(
-            task=task,
-            supervisor=new_updates["supervisor"],
-            messages=state.messages,  # Pass conversation history
-            thread_id=getattr(state, 'thread_id', ''),  # Pass thread context
-            user_query=state.user_query,  # Pass current user query
-            stream_queue_id=state.stream_queue_id  # Pass queue ID for streaming
-        )) for task in tasks],
+        goto=_send_tasks(state, ready_tasks, new_updates["supervisor"]),
     )
 
 
-def handle_task_completion(state: ChatState) -> Command | None:
-    new_updates: Dict[str, Any] = {}
+def handle_dependent_dispatch(state: ChatState) -> Command | None:
+    """
+    Dispatch the planned tasks whose dependencies have completed but that no department started.
+    Departments start ready dependents themselves (DependentTaskScheduler); this covers runs
+    without a registered plan and early runs that failed. Returns None when nothing new is ready.
+    """
+    supervisor = state.supervisor
+    ready_tasks = get_ready_tasks(supervisor.planned_tasks, supervisor.dispatched_task_ids, supervisor.completed_task_ids)
 
+    if not ready_tasks:
+        in_flight = supervisor.dispatched_task_ids - supervisor.completed_task_ids
+        if in_flight:
+            return None
 
+        # Nothing running and nothing ready: never leave planned tasks behind
+        ready_tasks = [task for task in supervisor.planned_tasks if task.task_id not in supervisor.dispatched_task_ids]
+        if not ready_tasks:
+            return None
+        logger.warning(f"Dispatching tasks with unmet dependencies: {[task.task_id for task in ready_tasks]}")
 
+    logger.info(f"Dispatching dependent tasks: {[task.task_id for task in ready_tasks]}")
+    DependentTaskScheduler.get_instance().mark_started(state.stream_queue_id, {task.task_id for task in ready_tasks})
 
+    return Command(
+        update={
+            "supervisor": {
+                "dispatched_tasks": ready_tasks,
+                "dispatched_task_ids": {task.task_id for task in ready_tasks}
+            }
+        },
+        graph=CURRENT_NODE_NAME,
+        goto=_send_tasks(state, ready_tasks, supervisor),
+    )
+
+
+def handle_task_completion(state: ChatState) -> Command | None:
+    new_updates: Dict[str, Any] = {}
 
     # check if supervisor is pending, if pending, just return None, keep waiting
     if state.supervisor.supervisor_status != SupervisorStatus.PENDING:
         return None
 
-    # check if all tasks are completed, else return None, keep waiting
-    pending_tasks = state.supervisor.dispatched_task_ids - state.supervisor.completed_task_ids
-    if pending_tasks != set():
-        return None
+    # check if all planned tasks are completed, else dispatch the newly ready ones and keep waiting
+    planned_task_ids = {task.task_id for task in state.supervisor.planned_tasks} or state.supervisor.dispatched_task_ids
+    pending_tasks = planned_task_ids - state.supervisor.completed_task_ids
+    deadline_passed = state.supervisor.deadline_at is not None and time.time() >= state.supervisor.deadline_at
+    if pending_tasks != set() and not deadline_passed:
+        return handle_dependent_dispatch(state)
+
+    # Out of time: report whatever is still missing as timed out and aggregate the rest
+    timed_out_tasks = [
+        timed_out_task(task.task_id, task.suggested_department)
+        for task in state.supervisor.planned_tasks if task.task_id in pending_tasks
+    ]
+    if timed_out_tasks:
+        logger.warning(f"!! Plan deadline passed, aggregating without {sorted(pending_tasks)} !!")
 
     # Update supervisor state to mark completion phase
     new_updates["supervisor"] = state.supervisor.model_copy(update={
-        "supervisor_status": SupervisorStatus.COMPLETED
+        "supervisor_status": SupervisorStatus.COMPLETED,
+        "completed_tasks": state.supervisor.completed_tasks + timed_out_tasks,
+        "completed_task_ids": state.supervisor.completed_task_ids | {task.task_id for task in timed_out_tasks},
     })
     # Route to aggregator node instead of END
     return Command(
@@ -173,6 +262,9 @@ async def supervisor_node(state: ChatState) -> Iterator[Send | Command] | Comman
 
     Manages dispatching tasks to department nodes based on assessment_report,
     streams task information to frontend, and waits for completion before routing to aggregator.
+    Tasks are scheduled as a DAG over Task.dependent_tasks: each task starts as soon as the
+    tasks it depends on have completed, from the department that finished last, with their
+    outputs injected into its DeptInput.
     """
     # Handle different supervisor states
     match state.supervisor.supervisor_status:
@@ -186,6 +278,7 @@ async def supervisor_node(state: ChatState) -> Iterator[Send | Command] | Comman
             new_updates = state.model_copy(update={
                 "supervisor": SupervisorState(
                     supervisor_status=SupervisorStatus.IDLE,
+                    planned_tasks=[],
                     dispatched_tasks=[],
                     dispatched_task_ids=set(),
                     completed_tasks=[],
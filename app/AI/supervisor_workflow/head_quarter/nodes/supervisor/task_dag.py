@@ -0,0 +1,56 @@
+from typing import Dict, List, Set
+
+from app.AI.supervisor_workflow.shared.models.Assessment import Task
+from app.utils.logger import logger
+
+
+def _sort_by_priority(tasks: List[Task]) -> List[Task]:
+    return sorted(tasks, key=lambda task: task.priority)
+
+
+def build_task_dag(tasks: List[Task]) -> List[Task]:
+    """
+    Normalize the assessed tasks into a dependency DAG.
+
+    dependent_tasks may also mention free-form context (e.g. "the user query"), so only IDs of
+    other assessed tasks are kept. Dependencies that would form a cycle are dropped so every
+    task eventually becomes ready.
+
+    Returns:
+        The tasks in priority order, each with dependent_tasks restricted to valid task IDs
+    """
+    task_ids = {task.task_id for task in tasks}
+    dependencies: Dict[str, Set[str]] = {
+        task.task_id: {dep for dep in task.dependent_tasks if dep in task_ids and dep != task.task_id}
+        for task in tasks
+    }
+
+    # Kahn's algorithm: whatever cannot be ordered sits on a cycle
+    ordered: Set[str] = set()
+    remaining = _sort_by_priority(tasks)
+    while remaining:
+        ready = [task for task in remaining if dependencies[task.task_id] <= ordered]
+        if not ready:
+            # Break the cycle at the highest-priority task left
+            cyclic_task = remaining[0]
+            logger.warning(
+                f"Dependency cycle detected, dispatching {cyclic_task.task_id} without "
+                f"{sorted(dependencies[cyclic_task.task_id] - ordered)}")
+            dependencies[cyclic_task.task_id] &= ordered
+            ready = [cyclic_task]
+
+        ordered.update(task.task_id for task in ready)
+        remaining = [task for task in remaining if task.task_id not in ordered]
+
+    return [
+        task.model_copy(update={"dependent_tasks": sorted(dependencies[task.task_id])})
+        for task in _sort_by_priority(tasks)
+    ]
+
+
+def get_ready_tasks(planned_tasks: List[Task], dispatched_task_ids: Set[str], completed_task_ids: Set[str]) -> List[Task]:
+    """Planned tasks not dispatched yet whose dependencies have all completed, in priority order"""
+    return [
+        task for task in planned_tasks
+        if task.task_id not in dispatched_task_ids and set(task.dependent_tasks) <= completed_task_ids
+    ]
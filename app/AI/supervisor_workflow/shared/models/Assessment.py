@@ -7,6 +7,7 @@ class TaskStatus(str, Enum):
     PENDING = "pending"
     SUCCESS = "success"
     ERROR = "error"
+    TIMED_OUT = "timed_out"
     UNKNOWN = "unknown"
 
 class Task(BaseModel):
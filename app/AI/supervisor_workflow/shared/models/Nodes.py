@@ -14,6 +14,7 @@ class NodeNames_Dept(Enum):
 @unique
 class NodeNames_HQ(Enum):
     INITIALIZER = "Initializer"
+    ROUTER = "Router"
     SUPERVISOR = "Supervisor"
     ASSESSMENT = "Assessment"
     AGGREGATOR = "Aggregator"
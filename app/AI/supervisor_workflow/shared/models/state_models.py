@@ -41,6 +41,11 @@ class SupervisorState(BaseModel):
         description="Current status of the supervisor workflow"
     )
 
+    planned_tasks: List[Task] = Field(
+        default_factory=list,
+        description="Every task of the current plan, with dependent_tasks restricted to other planned task IDs"
+    )
+
     dispatched_tasks: Annotated[List[Task], upsert_by_task_id] = Field(
         default_factory=list,
         description="Tasks that have been dispatched to departments"
@@ -61,6 +66,11 @@ class SupervisorState(BaseModel):
         description="Set of completed task IDs for quick lookup"
     )
 
+    deadline_at: Optional[float] = Field(
+        default=None,
+        description="Epoch seconds by which the plan must be finished; tasks not done by then time out"
+    )
+
 
 class WorkflowState(BaseModel):
     """State for workflow debugging and internal processing metadata"""
@@ -90,6 +100,11 @@ class ChatState(BaseModel):
 
     final_output: Annotated[str, latest_value_reducer] = Field(default="", description="Final response to the user")
 
+    final_output_streamed: bool = Field(
+        default=False,
+        description="Whether final_output has already been streamed to the client as it was generated"
+    )
+
     errors: Annotated[List[ChatError], operator.add] = Field(
         default_factory=list,
         description="Errors that occurred during processing"
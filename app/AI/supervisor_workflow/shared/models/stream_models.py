@@ -1,13 +1,17 @@
 from pydantic import BaseModel, Field
-from typing import Dict, Any, Optional, Literal
+from typing import Dict, Any, Optional, Literal, Union, AsyncIterable, AsyncIterator, List
 from datetime import datetime
+import asyncio
+import time
 from app.utils.stream_queue_manager import StreamQueueManager
+from app.utils.stream_record import StreamRecord, EMPTY_METADATA
 from app.utils.logger import logger
 
 
 class StreamEvent(BaseModel):
     """
-    Event model for streaming thoughts and updates between subgraphs and main graph.
+    Validated event model for streaming thoughts and updates between subgraphs and main graph.
+    Queues carry StreamRecord instead; StreamPublisher.publish converts a validated event with to_record.
     """
     event_type: Literal["thought", "thought_complete", "progress", "error", "result", "final_output", "final_output_complete"] = Field(
         ..., description="Type of the stream event"
@@ -38,6 +42,27 @@ class StreamEvent(BaseModel):
             data["timestamp"] = datetime.fromisoformat(data["timestamp"])
         return cls(**data)
 
+    def to_record(self) -> StreamRecord:
+        """Convert to the compact record carried by in-process queues"""
+        return StreamRecord.from_dict(self.to_dict())
+
+
+class TextStreamPolicy(BaseModel):
+    """
+    Chunking and pacing policy for StreamPublisher.publish_text_stream.
+    """
+    max_chunk_chars: int = Field(default=64, gt=0, description="Maximum number of characters per published chunk")
+    flush_interval: float = Field(default=0.05, ge=0.0, description="Maximum seconds buffered text from an async source may wait before it is flushed")
+    pacing_delay: float = Field(default=0.0, ge=0.0, description="Seconds to sleep after each published chunk, 0 disables pacing")
+
+
+DEFAULT_TEXT_STREAM_POLICY = TextStreamPolicy()
+
+
+def split_text_chunks(text: str, max_chunk_chars: int) -> List[str]:
+    """Split text into consecutive chunks of at most max_chunk_chars characters"""
+    return [text[i:i + max_chunk_chars] for i in range(0, len(text), max_chunk_chars)]
+
 
 class StreamPublisher:
     """
@@ -50,18 +75,27 @@ class StreamPublisher:
 
     async def publish(self, event: StreamEvent):
         """
-        Publish a stream event to the queue.
+        Publish a validated stream event to the queue.
 
         Args:
             event: The stream event to publish
         """
+        await self.publish_record(event.to_record())
+
+    async def publish_record(self, record: StreamRecord):
+        """
+        Publish a stream record to the queue by reference (no validation, no copy).
+
+        Args:
+            record: The stream record to publish
+        """
         if not self.queue_id:
             logger.warning("No queue_id provided, cannot publish stream event")
             return
 
         try:
-            await self.queue_manager.put_event(self.queue_id, event.to_dict())
-            logger.debug(f"Published event: {event.event_type} from {event.source} (task: {event.task_id})")
+            await self.queue_manager.put_event(self.queue_id, record)
+            logger.debug("Published event: %s from %s (task: %s)", record.event_type, record.source, record.task_id)
         except Exception as e:
             logger.error(f"Failed to publish stream event: {e}")
 
@@ -76,15 +110,14 @@ class StreamPublisher:
             task_id: Task ID to distinguish multiple tasks from same department (optional)
             metadata: Optional metadata
         """
-        event = StreamEvent(
+        await self.publish_record(StreamRecord(
             event_type="thought",
             source=source,
             content=content,
             segment_id=segment_id,
             task_id=task_id,
-            metadata=metadata or {}
-        )
-        await self.publish(event)
+            metadata=metadata or EMPTY_METADATA
+        ))
 
     async def publish_thought_complete(self, source: str, segment_id: int, task_id: Optional[str] = None, total_length: Optional[int] = None, content: str = ""):
         """
@@ -100,15 +133,14 @@ class StreamPublisher:
         if total_length is not None:
             metadata["total_length"] = total_length
 
-        event = StreamEvent(
+        await self.publish_record(StreamRecord(
             event_type="thought_complete",
             source=source,
             content="",
             segment_id=segment_id,
             task_id=task_id,
             metadata=metadata
-        )
-        await self.publish(event)
+        ))
 
     async def publish_final_output(self, content: str, segment_id: int, metadata: Optional[Dict[str, Any]] = None):
         """
@@ -119,15 +151,14 @@ class StreamPublisher:
             segment_id: Sequential segment ID
             metadata: Optional metadata
         """
-        event = StreamEvent(
+        await self.publish_record(StreamRecord(
             event_type="final_output",
             source="FinalResponse",
             content=content,
             segment_id=segment_id,
             task_id=None,  # Final output doesn't have task_id
-            metadata=metadata or {}
-        )
-        await self.publish(event)
+            metadata=metadata or EMPTY_METADATA
+        ))
 
     async def publish_final_output_complete(self, total_length: Optional[int] = None):
         """
@@ -140,15 +171,142 @@ class StreamPublisher:
         if total_length is not None:
             metadata["total_length"] = total_length
 
-        event = StreamEvent(
+        await self.publish_record(StreamRecord(
             event_type="final_output_complete",
             source="FinalResponse",
             content="",
             segment_id=0,
             task_id=None,  # Final output doesn't have task_id
             metadata=metadata
-        )
-        await self.publish(event)
+        ))
+
+    async def _publish_text_chunk(self, content: str, event_type: str, source: str, segment_id: int, task_id: Optional[str]):
+        if event_type == "final_output":
+            await self.publish_final_output(content=content, segment_id=segment_id)
+        else:
+            await self.publish_thought(content=content, source=source, segment_id=segment_id, task_id=task_id)
+
+    async def publish_text_stream(
+        self,
+        text: Union[str, AsyncIterable[str]],
+        source: str,
+        task_id: Optional[str] = None,
+        event_type: Literal["thought", "final_output"] = "thought",
+        policy: Optional[TextStreamPolicy] = None,
+        start_segment_id: int = 1,
+        complete: bool = True,
+    ) -> str:
+        """
+        Publish text as a small number of coalesced chunk events instead of one event per character.
+
+        A plain string is split by size. An async source (e.g. LLM token deltas) is buffered and
+        flushed whenever the buffer reaches max_chunk_chars or has waited flush_interval seconds.
+        The source is always drained, even when there is no queue to publish to. If the source
+        fails, the text received so far is published before the error is re-raised (without a
+        completion event), and the source is closed.
+
+        Args:
+            text: The full text, or an async iterable of text deltas
+            source: Source department or node name (ignored for final_output events)
+            task_id: Task ID to distinguish multiple tasks from same department (optional)
+            event_type: "thought" or "final_output"
+            policy: Chunking and pacing policy, defaults to DEFAULT_TEXT_STREAM_POLICY
+            start_segment_id: Segment ID of the first published chunk
+            complete: Whether to publish the matching completion event at the end
+                (a thought_complete carries the text length as its segment_id, as before chunking)
+
+        Returns:
+            The full text that was streamed
+        """
+        policy = policy or DEFAULT_TEXT_STREAM_POLICY
+        can_publish = bool(self.queue_id)
+        segment_id = start_segment_id - 1
+
+        async def flush(chunk: str):
+            nonlocal segment_id
+            if not chunk or not can_publish:
+                return
+            segment_id += 1
+            await self._publish_text_chunk(chunk, event_type, source, segment_id, task_id)
+            if policy.pacing_delay > 0:
+                await asyncio.sleep(policy.pacing_delay)
+
+        if isinstance(text, str):
+            full_text = text
+            for chunk in split_text_chunks(text, policy.max_chunk_chars):
+                await flush(chunk)
+        else:
+            parts: List[str] = []
+            buffer = ""
+            last_flush = time.monotonic()
+            iterator: AsyncIterator[str] = text.__aiter__()
+            next_piece = asyncio.ensure_future(iterator.__anext__())
+            try:
+                while True:
+                    # Only wait with a timeout while there is buffered text to flush
+                    timeout = None
+                    if buffer:
+                        timeout = max(0.0, policy.flush_interval - (time.monotonic() - last_flush))
+                    done, _ = await asyncio.wait({next_piece}, timeout=timeout)
+
+                    if not done:
+                        await flush(buffer)
+                        buffer = ""
+                        last_flush = time.monotonic()
+                        continue
+
+                    try:
+                        piece = next_piece.result()
+                    except StopAsyncIteration:
+                        break
+                    next_piece = asyncio.ensure_future(iterator.__anext__())
+
+                    if not piece:
+                        continue
+                    parts.append(piece)
+                    buffer += piece
+
+                    while len(buffer) >= policy.max_chunk_chars:
+                        await flush(buffer[:policy.max_chunk_chars])
+                        buffer = buffer[policy.max_chunk_chars:]
+                        last_flush = time.monotonic()
+
+                    if buffer and time.monotonic() - last_flush >= policy.flush_interval:
+                        await flush(buffer)
+                        buffer = ""
+                        last_flush = time.monotonic()
+            except Exception:
+                # Publish what the source delivered before it failed, so everything received has been sent
+                await flush(buffer)
+                raise
+            finally:
+                if not next_piece.done():
+                    next_piece.cancel()
+                    await asyncio.wait({next_piece})
+                # Close an unfinished source (e.g. an LLM stream) now instead of when it is garbage collected
+                aclose = getattr(iterator, "aclose", None)
+                if aclose is not None:
+                    try:
+                        await aclose()
+                    except Exception as e:
+                        logger.error(f"Failed to close text stream source: {e}")
+
+            await flush(buffer)
+            full_text = "".join(parts)
+
+        if complete and can_publish:
+            if event_type == "final_output":
+                await self.publish_final_output_complete(total_length=len(full_text))
+            else:
+                # The completion frame keeps its established meaning: segment_id is the text length
+                await self.publish_thought_complete(
+                    source=source,
+                    segment_id=len(full_text),
+                    task_id=task_id,
+                    total_length=len(full_text)
+                )
+
+        return full_text
 
 class StreamConsumer:
     """
@@ -159,42 +317,40 @@ class StreamConsumer:
         self.queue_id = queue_id
         self.queue_manager = StreamQueueManager.get_instance()
 
-    async def consume_event(self, timeout: float = 1.0) -> Optional[StreamEvent]:
+    async def consume_event(self, timeout: Optional[float] = None) -> Optional[StreamRecord]:
         """
         Consume a single stream event from the queue.
+        Records are returned as published, without validation.
 
         Args:
-            timeout: Timeout in seconds
+            timeout: Timeout in seconds, None waits until an event or end-of-stream arrives
 
         Returns:
-            StreamEvent or None if timeout/error
+            StreamRecord or None at end-of-stream/timeout/error
         """
         try:
-            event_dict = await self.queue_manager.get_event(self.queue_id, timeout)
-            if event_dict:
-                return StreamEvent.from_dict(event_dict)
-            return None
+            return await self.queue_manager.get_event(self.queue_id, timeout)
         except Exception as e:
             logger.error(f"Failed to consume stream event: {e}")
             return None
 
-    async def consume_events(self, timeout_per_event: float = 1.0):
+    async def consume_events(self, timeout_per_event: Optional[float] = None):
         """
-        Async generator to continuously consume events from the queue.
+        Async generator to consume events from the queue until end-of-stream.
 
         Args:
-            timeout_per_event: Timeout per event in seconds
+            timeout_per_event: Optional timeout per event in seconds, None waits without polling
 
         Yields:
-            StreamEvent instances
+            StreamRecord instances
         """
         while True:
             event = await self.consume_event(timeout_per_event)
             if event:
                 yield event
-            else:
-                # No event received within timeout, continue listening
-                continue
+            elif await self.queue_manager.is_stream_finished(self.queue_id):
+                # End-of-stream published and fully drained
+                return
 
 
 def create_stream_publisher(queue_id: Optional[str]) -> StreamPublisher:
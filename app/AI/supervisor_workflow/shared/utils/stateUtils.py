@@ -1,4 +1,7 @@
 from operator import add, or_
+from typing import Annotated
+
+from pydantic import BaseModel, TypeAdapter
 
 
 def upsert_by_task_id(left_list, right_list):
@@ -38,12 +41,137 @@ def upsert_by_task_id(left_list, right_list):
 
     return result
 
+def _concat_lists(left_val, right_val):
+    """List concatenation: left + right"""
+    return (left_val if left_val is not None else []) + (right_val if right_val is not None else [])
+
+
+def _union_sets(left_val, right_val):
+    """Set union: left | right"""
+    return (left_val if left_val is not None else set()) | (right_val if right_val is not None else set())
+
+
+def _upsert_tasks(left_val, right_val):
+    """Custom upsert behavior for task lists"""
+    return upsert_by_task_id(left_val if left_val is not None else [], right_val if right_val is not None else [])
+
+
+def _latest_value(left_val, right_val):
+    """No operator annotation - right wins (latest update)"""
+    return right_val if right_val is not None else left_val
+
+
+# Operator annotations understood by create_state_merger, in the order they are matched
+_OPERATOR_MERGERS = (
+    (add, _concat_lists),
+    (or_, _union_sets),
+    (upsert_by_task_id, _upsert_tasks),
+)
+
+
+class MergePlan:
+    """
+    Per-model merge plan, built once by create_state_merger.
+
+    Holds the merge function of every field and a validator for the values a partial update
+    brings. Merging an update into a valid state then only validates the update's values;
+    the fields carried over from the state are valid already and are not validated again.
+    """
+
+    def __init__(self, model_class):
+        self.model_class = model_class
+        self.fields = tuple(
+            (field_name, self._resolve_merger(field_info))
+            for field_name, field_info in model_class.model_fields.items()
+        )
+        self.mergers = dict(self.fields)
+        self.validators = self._build_validators(model_class)
+
+    @staticmethod
+    def _resolve_merger(field_info):
+        for annotation in field_info.metadata or ():
+            for operator, merger in _OPERATOR_MERGERS:
+                if annotation == operator:
+                    return merger
+        return _latest_value
+
+    @staticmethod
+    def _build_validators(model_class):
+        """Field validators, or None when the model must be validated as a whole"""
+        decorators = model_class.__pydantic_decorators__
+        if (decorators.validators or decorators.field_validators or decorators.root_validators
+                or decorators.model_validators or model_class.model_config.get("validate_assignment")):
+            return None
+        try:
+            return {
+                field_name: TypeAdapter(
+                    Annotated[(field_info.annotation, *field_info.metadata)] if field_info.metadata else field_info.annotation,
+                    config=model_class.model_config or None,
+                )
+                for field_name, field_info in model_class.model_fields.items()
+            }
+        except Exception:
+            return None
+
+    def merge(self, left, right):
+        model_class = self.model_class
+        if isinstance(right, model_class):
+            return right
+
+        if isinstance(right, dict) and self.validators is not None and isinstance(left, model_class):
+            return self._merge_update(left, right)
+
+        left_values = _field_values(left, self.fields)
+        right_values = _field_values(right, self.fields)
+        merged_data = {}
+        for field_name, merger in self.fields:
+            value = left_values.get(field_name)
+            # Fields not provided in a partial (dict) update keep their value
+            if right_values is not right or field_name in right:
+                value = merger(value, right_values.get(field_name))
+            if value is not None:
+                merged_data[field_name] = value
+
+        # Create new instance with merged data
+        return model_class(**merged_data)
+
+    def _merge_update(self, left, right):
+        """Partial update into a valid state: only the update's values are validated"""
+        left_values = left.__dict__
+        update = {}
+        for field_name, right_val in right.items():
+            merger = self.mergers.get(field_name)
+            if merger is None:
+                continue
+            if right_val is not None:
+                right_val = self.validators[field_name].validate_python(right_val)
+            value = merger(left_values[field_name], right_val)
+            if value is not None:
+                update[field_name] = value
+        return left.model_copy(update=update)
+
+
+def _field_values(obj, fields):
+    """Field values of a model instance, dict or other object, as a dict"""
+    if obj is None:
+        return {}
+    if isinstance(obj, dict):
+        return obj
+    # Pydantic models keep their field values in __dict__
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    return {field_name: getattr(obj, field_name, None) for field_name, _ in fields}
+
+
 # Generic reducer factory for any Pydantic model with operator-annotated fields
 def create_state_merger(model_class):
     """
     Creates a generic merger function for any Pydantic model.
     Automatically handles operator-annotated fields for LangGraph concurrent updates.
 
+    The merge plan is built here, once per model; the supervisor state is merged on every
+    department completion, several times per superstep with parallel tasks.
+
     Usage:
         merge_supervisor_states = create_state_merger(SupervisorState)
         merge_assessment_states = create_state_merger(AssessmentState)
@@ -51,57 +179,17 @@ def create_state_merger(model_class):
     Then use in Annotated types:
         supervisor: Annotated[SupervisorState, merge_supervisor_states]
     """
+    plan = MergePlan(model_class)
 
     def merge_states(left, right):
-        """Generic state merger for concurrent updates"""
-
-        def get_field_value(obj, field_name):
-            """Get field value from either object or dict"""
-            if isinstance(obj, dict):
-                return obj.get(field_name)
-            return getattr(obj, field_name, None)
-
-        def merge_field(field_name, field_info, left_val, right_val):
-            """Merge field values based on operator annotations"""
-            # Check for operator annotations
-            if hasattr(field_info, 'metadata') and field_info.metadata:
-                for annotation in field_info.metadata:
-                    if annotation == add:
-                        # List concatenation: left + right
-                        left_list = left_val if left_val is not None else []
-                        right_list = right_val if right_val is not None else []
-                        return left_list + right_list
-                    elif annotation == or_:
-                        # Set union: left | right
-                        left_set = left_val if left_val is not None else set()
-                        right_set = right_val if right_val is not None else set()
-                        return left_set | right_set
-                    elif annotation == upsert_by_task_id:
-                        # Custom upsert behavior for task lists
-                        left_list = left_val if left_val is not None else []
-                        right_list = right_val if right_val is not None else []
-                        return upsert_by_task_id(left_list, right_list)
-
-            # No operator annotation - right wins (latest update)
-            return right_val if right_val is not None else left_val
-
-        # Build merged data for the model
-        merged_data = {}
-
-        # Process each field in the model
-        for field_name, field_info in model_class.model_fields.items():
-            left_val = get_field_value(left, field_name)
-            right_val = get_field_value(right, field_name)
-
-            # Skip fields not provided in partial updates (dicts)
-            if isinstance(right, dict) and field_name not in right:
-                merged_data[field_name] = left_val
-            else:
-                merged_data[field_name] = merge_field(field_name, field_info, left_val, right_val)
-
-        # Create new instance with merged data
-        return model_class(**{k: v for k, v in merged_data.items() if v is not None})
-
+        """
+        Generic state merger for concurrent updates.
+        Partial (dict) updates are merged field by field; a full model instance replaces the
+        state, which is how nodes reset it (e.g. a new turn or a new plan).
+        """
+        return plan.merge(left, right)
+
+    merge_states.merge_plan = plan
     return merge_states
 
 def latest_value_reducer(left: str, right: str) -> str:
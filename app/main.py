@@ -1,19 +1,47 @@
-from fastapi import FastAPI, APIRouter, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
+from app.utils.startup_timer import StartupTimer
 
-from app.web_base.routes.chatbot.chat import router as chat_router
-from app.web_base.routes.chatbot.health import router as health_router
+from contextlib import asynccontextmanager
 
-from app.web_base.config.settings import Settings
+startup_timer = StartupTimer.get_instance()
+
+with startup_timer.phase("import_framework"):
+    from fastapi import FastAPI, APIRouter, HTTPException
+    from fastapi.middleware.cors import CORSMiddleware
+
+with startup_timer.phase("import_routes"):
+    from app.web_base.routes.chatbot.chat import router as chat_router
+    from app.web_base.routes.chatbot.health import router as health_router
+
+    from app.web_base.config.settings import Settings
+    from app.utils.stream_queue_manager import StreamQueueManager
+    from app.web_base.services.warm_up import WarmUpManager, WARMUP_ON_STARTUP
+    from app.AI.core.llm.response_cache import ResponseCache
+    from app.AI.core.llm.http_clients import HttpClientRegistry
 
 router = APIRouter()
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Compile the graph, connect the checkpointer and the LLM providers before serving
+    if WARMUP_ON_STARTUP:
+        await WarmUpManager.get_instance().warm_up()
+    else:
+        startup_timer.mark_ready()
+    yield
+    # Release stream bus connections (e.g. the SQLite backend) on shutdown
+    await StreamQueueManager.get_instance().shutdown()
+    await WarmUpManager.get_instance().shutdown()
+    await ResponseCache.get_instance().aclose()
+    await HttpClientRegistry.get_instance().aclose()
+
+
 def create_app():
     # app = FastAPI()
     app = FastAPI(
         title="AI Chatbot API",
         version=Settings().VERSION,
+        lifespan=lifespan,
     )
 
     app.include_router(chat_router)
@@ -31,4 +59,5 @@ def create_app():
     return app
 
 
-app = create_app()
\ No newline at end of file
+with startup_timer.phase("create_app"):
+    app = create_app()
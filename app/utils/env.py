@@ -0,0 +1,11 @@
+from dotenv import load_dotenv, find_dotenv
+
+_env_loaded = False
+
+
+def load_env():
+    """Load the .env file once per process; find_dotenv walks up the directory tree on every call"""
+    global _env_loaded
+    if not _env_loaded:
+        load_dotenv(find_dotenv())
+        _env_loaded = True
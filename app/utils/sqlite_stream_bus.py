@@ -0,0 +1,726 @@
+"""
+SQLite stream bus - cross-process backend for StreamQueueManager.
+
+Every worker opens the same SQLite file (WAL mode), so an event published by a node in one
+process is consumed by the SSE response held by another. Stands in for Redis Streams on
+single-host deployments (uvicorn --workers N, out-of-process LangGraph nodes).
+
+Consumers in the same process as the publisher are woken up immediately; consumers in other
+processes poll with a short exponential backoff. Run replay logs are kept in the same file, so
+a resumed SSE stream can be served by any worker.
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from app.utils.logger import logger
+from app.utils.stream_broadcast import STREAM_BROADCAST_CAPACITY, StreamSubscription
+from app.utils.stream_bus import StreamBus
+from app.utils.stream_queue import OverflowPolicy
+from app.utils.stream_record import StreamRecord
+
+try:
+    import aiosqlite
+    HAS_AIOSQLITE = True
+except ImportError:
+    aiosqlite = None
+    HAS_AIOSQLITE = False
+
+STREAM_BUS_SQLITE_PATH = os.environ.get("STREAM_BUS_SQLITE_PATH", "./db/stream_bus/stream_bus.sqlite")
+
+# Polling backoff for consumers and blocked producers waiting on another process
+_POLL_MIN_INTERVAL = 0.005
+_POLL_MAX_INTERVAL = 0.1
+
+# Queues are short-lived, so a schema change simply recreates the tables
+_SCHEMA_VERSION = 3
+
+_DROP_SCHEMA = """
+DROP TABLE IF EXISTS stream_queues;
+DROP TABLE IF EXISTS stream_events;
+DROP TABLE IF EXISTS stream_broadcast;
+DROP TABLE IF EXISTS stream_replay_runs;
+DROP TABLE IF EXISTS stream_replay_frames;
+"""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stream_queues (
+    queue_id TEXT PRIMARY KEY,
+    capacity INTEGER NOT NULL,
+    policy TEXT NOT NULL,
+    closed INTEGER NOT NULL DEFAULT 0,
+    high_water_mark INTEGER NOT NULL DEFAULT 0,
+    total_put INTEGER NOT NULL DEFAULT 0,
+    dropped INTEGER NOT NULL DEFAULT 0,
+    coalesced INTEGER NOT NULL DEFAULT 0,
+    blocked_puts INTEGER NOT NULL DEFAULT 0,
+    broadcast_seq INTEGER NOT NULL DEFAULT 0,
+    subscribers INTEGER NOT NULL DEFAULT 0,
+    subscriber_missed INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    last_activity REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stream_events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    queue_id TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    source TEXT NOT NULL,
+    content TEXT NOT NULL,
+    segment_id INTEGER NOT NULL,
+    task_id TEXT,
+    metadata TEXT,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_stream_events_queue ON stream_events (queue_id, seq);
+CREATE TABLE IF NOT EXISTS stream_broadcast (
+    queue_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    event_type TEXT NOT NULL,
+    source TEXT NOT NULL,
+    content TEXT NOT NULL,
+    segment_id INTEGER NOT NULL,
+    task_id TEXT,
+    metadata TEXT,
+    timestamp TEXT NOT NULL,
+    PRIMARY KEY (queue_id, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS stream_replay_runs (
+    run_id TEXT PRIMARY KEY,
+    thread_id TEXT NOT NULL,
+    capacity INTEGER NOT NULL,
+    last_seq INTEGER NOT NULL DEFAULT 0,
+    done INTEGER NOT NULL DEFAULT 0,
+    readers INTEGER NOT NULL DEFAULT 0,
+    reader_idle_since REAL NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_stream_replay_runs_thread ON stream_replay_runs (thread_id, created_at);
+CREATE TABLE IF NOT EXISTS stream_replay_frames (
+    run_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    frame TEXT NOT NULL,
+    PRIMARY KEY (run_id, seq)
+) WITHOUT ROWID;
+"""
+
+_EVENT_COLUMNS = "event_type, source, content, segment_id, task_id, metadata, timestamp"
+_STATS_COLUMNS = (
+    "capacity, policy, closed, high_water_mark, total_put, dropped, coalesced, blocked_puts,"
+    " subscribers, subscriber_missed, created_at, last_activity"
+)
+
+# Rows read per round-trip by a subscription
+_SUBSCRIPTION_BATCH = 64
+
+
+class SqliteStreamBus(StreamBus):
+    """
+    Stream bus backed by a shared SQLite file.
+
+    Overflow policies are applied inside a write transaction, so they hold across processes.
+    A single connection is used per process and transactions are serialized with a lock.
+    """
+
+    def __init__(self, db_path: str = STREAM_BUS_SQLITE_PATH, broadcast_capacity: int = STREAM_BROADCAST_CAPACITY):
+        self.db_path = db_path
+        self.broadcast_capacity = broadcast_capacity
+        self._conn = None
+        self._conn_lock = asyncio.Lock()
+        self._tx_lock = asyncio.Lock()
+        # Same-process wake-ups, keyed by queue_id: resolved and replaced on every change
+        self._waiters: Dict[str, asyncio.Future] = {}
+
+    async def _get_conn(self):
+        if self._conn is not None:
+            return self._conn
+
+        async with self._conn_lock:
+            if self._conn is None:
+                directory = os.path.dirname(self.db_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+
+                conn = await aiosqlite.connect(self.db_path, isolation_level=None)
+                await conn.execute("PRAGMA journal_mode=WAL")
+                await conn.execute("PRAGMA synchronous=NORMAL")
+                await conn.execute("PRAGMA busy_timeout=5000")
+                try:
+                    await self._ensure_schema(conn)
+                except BaseException:
+                    await conn.close()
+                    raise
+                self._conn = conn
+                logger.info(f"Opened SQLite stream bus: {self.db_path}")
+        return self._conn
+
+    @staticmethod
+    async def _ensure_schema(conn):
+        """
+        Check the schema version and (re)create the tables in one write transaction, so a worker
+        starting at the same time waits for it instead of dropping tables that are already in use.
+        Statements run one by one: executescript would commit the open transaction first.
+        """
+        await conn.execute("BEGIN IMMEDIATE")
+        try:
+            async with conn.execute("PRAGMA user_version") as cursor:
+                schema_version = (await cursor.fetchone())[0]
+            statements = _SCHEMA
+            if schema_version != _SCHEMA_VERSION:
+                statements = _DROP_SCHEMA + _SCHEMA
+            for statement in filter(None, (part.strip() for part in statements.split(";"))):
+                await conn.execute(statement)
+            if schema_version != _SCHEMA_VERSION:
+                await conn.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
+        except BaseException:
+            await conn.execute("ROLLBACK")
+            raise
+        await conn.execute("COMMIT")
+
+    def _waiter(self, queue_id: str) -> asyncio.Future:
+        """
+        Future resolved by the next change to the queue in this process.
+        Taken before reading the database, so a change made in between is not missed.
+        """
+        waiter = self._waiters.get(queue_id)
+        if waiter is None:
+            waiter = self._waiters[queue_id] = asyncio.get_running_loop().create_future()
+        return waiter
+
+    def _notify(self, queue_id: str):
+        waiter = self._waiters.pop(queue_id, None)
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    @staticmethod
+    async def _wait(waiter: asyncio.Future, interval: float):
+        """Wait for a same-process notification, or until it is time to poll again"""
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _transaction(self, work):
+        """Run work(conn) inside BEGIN IMMEDIATE ... COMMIT"""
+        conn = await self._get_conn()
+        async with self._tx_lock:
+            await conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = await work(conn)
+            except BaseException:
+                await conn.execute("ROLLBACK")
+                raise
+            await conn.execute("COMMIT")
+            return result
+
+    async def create_queue(self, queue_id: str, capacity: int, policy: OverflowPolicy):
+        if capacity <= 0:
+            raise ValueError(f"Stream queue capacity must be positive, got {capacity}")
+
+        async def work(conn):
+            now = time.time()
+            await conn.execute(
+                "INSERT OR REPLACE INTO stream_queues (queue_id, capacity, policy, created_at, last_activity)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (queue_id, capacity, OverflowPolicy(policy).value, now, now)
+            )
+            await conn.execute("DELETE FROM stream_events WHERE queue_id = ?", (queue_id,))
+            await conn.execute("DELETE FROM stream_broadcast WHERE queue_id = ?", (queue_id,))
+
+        await self._transaction(work)
+
+    @staticmethod
+    async def _size(conn, queue_id: str) -> int:
+        async with conn.execute("SELECT COUNT(*) FROM stream_events WHERE queue_id = ?", (queue_id,)) as cursor:
+            return (await cursor.fetchone())[0]
+
+    @staticmethod
+    def _event_values(event: StreamRecord) -> tuple:
+        return (
+            event.event_type, event.source, event.content, event.segment_id, event.task_id,
+            json.dumps(dict(event.metadata)) if event.metadata else None,
+            event.timestamp.isoformat()
+        )
+
+    @classmethod
+    async def _insert(cls, conn, queue_id: str, event: StreamRecord):
+        await conn.execute(
+            f"INSERT INTO stream_events (queue_id, {_EVENT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (queue_id, *cls._event_values(event))
+        )
+
+    async def _broadcast(self, conn, queue_id: str, event: StreamRecord):
+        """Append the event to the queue's subscriber buffer, trimmed to broadcast_capacity"""
+        async with conn.execute(
+            "UPDATE stream_queues SET broadcast_seq = broadcast_seq + 1 WHERE queue_id = ? RETURNING broadcast_seq",
+            (queue_id,)
+        ) as cursor:
+            seq = (await cursor.fetchone())[0]
+
+        await conn.execute(
+            f"INSERT INTO stream_broadcast (queue_id, seq, {_EVENT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (queue_id, seq, *self._event_values(event))
+        )
+        await conn.execute(
+            "DELETE FROM stream_broadcast WHERE queue_id = ? AND seq <= ?",
+            (queue_id, seq - self.broadcast_capacity)
+        )
+
+    @staticmethod
+    async def _drop_oldest_thought(conn, queue_id: str) -> bool:
+        cursor = await conn.execute(
+            "DELETE FROM stream_events WHERE seq = ("
+            " SELECT MIN(seq) FROM stream_events WHERE queue_id = ? AND event_type = 'thought')",
+            (queue_id,)
+        )
+        if cursor.rowcount <= 0:
+            return False
+        await conn.execute("UPDATE stream_queues SET dropped = dropped + 1 WHERE queue_id = ?", (queue_id,))
+        return True
+
+    @staticmethod
+    async def _coalesce_into_tail(conn, queue_id: str, event: StreamRecord) -> bool:
+        if event.event_type != "thought":
+            return False
+
+        cursor = await conn.execute(
+            "UPDATE stream_events SET content = content || ?, segment_id = ?"
+            " WHERE seq = (SELECT MAX(seq) FROM stream_events WHERE queue_id = ?)"
+            " AND event_type = 'thought' AND source = ? AND task_id IS ?",
+            (event.content, event.segment_id, queue_id, event.source, event.task_id)
+        )
+        if cursor.rowcount <= 0:
+            return False
+        await conn.execute("UPDATE stream_queues SET coalesced = coalesced + 1 WHERE queue_id = ?", (queue_id,))
+        return True
+
+    @staticmethod
+    async def _coalesce_adjacent(conn, queue_id: str) -> bool:
+        async with conn.execute(
+            "SELECT seq, event_type, source, task_id, content, segment_id FROM stream_events"
+            " WHERE queue_id = ? ORDER BY seq",
+            (queue_id,)
+        ) as cursor:
+            rows = await cursor.fetchall()
+
+        for older, newer in zip(rows, rows[1:]):
+            if older[1] == "thought" and newer[1] == "thought" and older[2:4] == newer[2:4]:
+                await conn.execute(
+                    "UPDATE stream_events SET content = ?, segment_id = ? WHERE seq = ?",
+                    (older[4] + newer[4], newer[5], older[0])
+                )
+                await conn.execute("DELETE FROM stream_events WHERE seq = ?", (newer[0],))
+                await conn.execute("UPDATE stream_queues SET coalesced = coalesced + 1 WHERE queue_id = ?", (queue_id,))
+                return True
+        return False
+
+    async def _try_put(self, conn, queue_id: str, event: StreamRecord) -> Optional[bool]:
+        """
+        Apply the overflow policy inside the current transaction.
+
+        Returns:
+            True once the event is accounted for, False if the producer has to wait,
+            None if the queue does not exist
+        """
+        async with conn.execute("SELECT capacity, policy, closed FROM stream_queues WHERE queue_id = ?", (queue_id,)) as cursor:
+            row = await cursor.fetchone()
+        if row is None:
+            return None
+
+        capacity, policy, closed = row
+        if closed:
+            # Nobody will read events published after end-of-stream
+            return True
+
+        size = await self._size(conn, queue_id)
+        accepted = False
+        if size < capacity:
+            await self._insert(conn, queue_id, event)
+            accepted = True
+        elif policy == OverflowPolicy.DROP_OLDEST_THOUGHT.value:
+            if await self._drop_oldest_thought(conn, queue_id):
+                await self._insert(conn, queue_id, event)
+                accepted = True
+        elif policy == OverflowPolicy.COALESCE_THOUGHTS.value:
+            if await self._coalesce_into_tail(conn, queue_id, event):
+                accepted = True
+            elif await self._coalesce_adjacent(conn, queue_id):
+                await self._insert(conn, queue_id, event)
+                accepted = True
+
+        if not accepted:
+            return False
+
+        await conn.execute(
+            "UPDATE stream_queues SET total_put = total_put + 1, high_water_mark = MAX(high_water_mark, ?),"
+            " last_activity = ? WHERE queue_id = ?",
+            (await self._size(conn, queue_id), time.time(), queue_id)
+        )
+        await self._broadcast(conn, queue_id, event)
+        return True
+
+    async def put(self, queue_id: str, event: StreamRecord) -> bool:
+        interval = _POLL_MIN_INTERVAL
+        blocked = False
+
+        while True:
+            result = await self._transaction(lambda conn: self._try_put(conn, queue_id, event))
+            if result is None:
+                return False
+            if result:
+                self._notify(queue_id)
+                return True
+
+            # BLOCK, or nothing could be shed: wait for a consumer in any process
+            waiter = self._waiter(queue_id)
+            if not blocked:
+                blocked = True
+                await self._transaction(lambda conn: conn.execute(
+                    "UPDATE stream_queues SET blocked_puts = blocked_puts + 1 WHERE queue_id = ?", (queue_id,)
+                ))
+            await self._wait(waiter, interval)
+            interval = min(interval * 2, _POLL_MAX_INTERVAL)
+
+    async def _pop(self, conn, queue_id: str):
+        """Remove and return the oldest event row, or the queue's closed flag when it is empty"""
+        async with conn.execute(
+            f"SELECT seq, {_EVENT_COLUMNS} FROM stream_events WHERE queue_id = ? ORDER BY seq LIMIT 1",
+            (queue_id,)
+        ) as cursor:
+            row = await cursor.fetchone()
+
+        if row is not None:
+            await conn.execute("DELETE FROM stream_events WHERE seq = ?", (row[0],))
+            await conn.execute("UPDATE stream_queues SET last_activity = ? WHERE queue_id = ?", (time.time(), queue_id))
+            return row
+
+        async with conn.execute("SELECT closed FROM stream_queues WHERE queue_id = ?", (queue_id,)) as cursor:
+            queue_row = await cursor.fetchone()
+        # Missing queue behaves like end-of-stream
+        return queue_row is None or bool(queue_row[0])
+
+    @staticmethod
+    def _row_to_record(row) -> StreamRecord:
+        _, event_type, source, content, segment_id, task_id, metadata, timestamp = row
+        return StreamRecord.from_dict({
+            "event_type": event_type,
+            "source": source,
+            "content": content,
+            "segment_id": segment_id,
+            "task_id": task_id,
+            "metadata": json.loads(metadata) if metadata else None,
+            "timestamp": timestamp,
+        })
+
+    async def get(self, queue_id: str, timeout: Optional[float] = None) -> Optional[StreamRecord]:
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        interval = _POLL_MIN_INTERVAL
+
+        while True:
+            waiter = self._waiter(queue_id)
+            result = await self._transaction(lambda conn: self._pop(conn, queue_id))
+            if isinstance(result, tuple):
+                # Wake up producers blocked on a full queue
+                self._notify(queue_id)
+                return self._row_to_record(result)
+            if result:
+                return None
+
+            wait_for = interval
+            if deadline is not None:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return None
+                wait_for = min(wait_for, remaining)
+
+            await self._wait(waiter, wait_for)
+            interval = min(interval * 2, _POLL_MAX_INTERVAL)
+
+    async def close(self, queue_id: str):
+        await self._transaction(lambda conn: conn.execute(
+            "UPDATE stream_queues SET closed = 1, last_activity = ? WHERE queue_id = ?", (time.time(), queue_id)
+        ))
+        self._notify(queue_id)
+
+    async def _stats(self, conn, queue_id: str) -> Optional[Dict[str, Any]]:
+        async with conn.execute(f"SELECT {_STATS_COLUMNS} FROM stream_queues WHERE queue_id = ?", (queue_id,)) as cursor:
+            row = await cursor.fetchone()
+        if row is None:
+            return None
+
+        capacity, policy, closed, high_water_mark, total_put, dropped, coalesced, blocked_puts, \
+            subscribers, subscriber_missed, created_at, last_activity = row
+        async with conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(content)), 0) FROM stream_events WHERE queue_id = ?", (queue_id,)
+        ) as cursor:
+            size, bytes_buffered = await cursor.fetchone()
+
+        return {
+            "capacity": capacity,
+            "policy": policy,
+            "size": size,
+            "high_water_mark": high_water_mark,
+            "total_put": total_put,
+            "dropped": dropped,
+            "coalesced": coalesced,
+            "blocked_puts": blocked_puts,
+            "closed": bool(closed),
+            "subscribers": subscribers,
+            "subscriber_missed": subscriber_missed,
+            "bytes_buffered": bytes_buffered,
+            "created_at": created_at,
+            "last_activity": last_activity,
+        }
+
+    async def _delete(self, conn, queue_id: str) -> Optional[Dict[str, Any]]:
+        stats = await self._stats(conn, queue_id)
+        await conn.execute("DELETE FROM stream_events WHERE queue_id = ?", (queue_id,))
+        await conn.execute("DELETE FROM stream_broadcast WHERE queue_id = ?", (queue_id,))
+        await conn.execute("DELETE FROM stream_queues WHERE queue_id = ?", (queue_id,))
+        return stats
+
+    async def cleanup(self, queue_id: str) -> Optional[Dict[str, Any]]:
+        stats = await self._transaction(lambda conn: self._delete(conn, queue_id))
+        self._notify(queue_id)
+        return stats
+
+    async def reap_idle(self, idle_ttl: float) -> Dict[str, Dict[str, Any]]:
+        async def work(conn):
+            async with conn.execute(
+                "SELECT queue_id FROM stream_queues WHERE last_activity < ?", (time.time() - idle_ttl,)
+            ) as cursor:
+                idle_queue_ids = [row[0] for row in await cursor.fetchall()]
+            return {queue_id: await self._delete(conn, queue_id) for queue_id in idle_queue_ids}
+
+        reaped = await self._transaction(work)
+        for queue_id in reaped:
+            self._notify(queue_id)
+        return reaped
+
+    async def is_finished(self, queue_id: str) -> bool:
+        stats = await self.stats(queue_id)
+        return stats is None or (stats["closed"] and stats["size"] == 0)
+
+    async def subscribe(self, queue_id: str, from_start: bool = True) -> Optional[StreamSubscription]:
+        async def work(conn):
+            async with conn.execute(
+                "UPDATE stream_queues SET subscribers = subscribers + 1 WHERE queue_id = ? RETURNING broadcast_seq",
+                (queue_id,)
+            ) as cursor:
+                return await cursor.fetchone()
+
+        row = await self._transaction(work)
+        if row is None:
+            return None
+        return SqliteStreamSubscription(self, queue_id, cursor=0 if from_start else row[0])
+
+    async def _read_broadcast(self, queue_id: str, cursor: int):
+        """Rows after cursor, plus whether the queue has ended (closed, or gone)"""
+        conn = await self._get_conn()
+        async with self._tx_lock:
+            async with conn.execute(
+                f"SELECT seq, {_EVENT_COLUMNS} FROM stream_broadcast WHERE queue_id = ? AND seq > ? ORDER BY seq LIMIT ?",
+                (queue_id, cursor, _SUBSCRIPTION_BATCH)
+            ) as db_cursor:
+                rows = await db_cursor.fetchall()
+            async with conn.execute("SELECT closed FROM stream_queues WHERE queue_id = ?", (queue_id,)) as db_cursor:
+                queue_row = await db_cursor.fetchone()
+        return rows, queue_row is None or bool(queue_row[0])
+
+    async def _end_subscription(self, queue_id: str, missed: int):
+        await self._transaction(lambda conn: conn.execute(
+            "UPDATE stream_queues SET subscribers = MAX(subscribers - 1, 0), subscriber_missed = subscriber_missed + ?"
+            " WHERE queue_id = ?",
+            (missed, queue_id)
+        ))
+
+    async def stats(self, queue_id: str) -> Optional[Dict[str, Any]]:
+        conn = await self._get_conn()
+        async with self._tx_lock:
+            return await self._stats(conn, queue_id)
+
+    async def all_stats(self) -> Dict[str, Dict[str, Any]]:
+        conn = await self._get_conn()
+        async with self._tx_lock:
+            async with conn.execute("SELECT queue_id FROM stream_queues") as cursor:
+                queue_ids = [row[0] for row in await cursor.fetchall()]
+
+            all_stats = {}
+            for queue_id in queue_ids:
+                stats = await self._stats(conn, queue_id)
+                if stats is not None:
+                    all_stats[queue_id] = stats
+            return all_stats
+
+    async def create_replay(self, run_id: str, thread_id: str, capacity: int, max_runs: int):
+        async def work(conn):
+            now = time.time()
+            await conn.execute(
+                "INSERT OR REPLACE INTO stream_replay_runs (run_id, thread_id, capacity, reader_idle_since, created_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (run_id, thread_id, capacity, now, now)
+            )
+            async with conn.execute("SELECT COUNT(*) FROM stream_replay_runs") as cursor:
+                excess = (await cursor.fetchone())[0] - max_runs
+            if excess <= 0:
+                return
+
+            async with conn.execute(
+                "SELECT run_id FROM stream_replay_runs WHERE done = 1 ORDER BY created_at LIMIT ?", (excess,)
+            ) as cursor:
+                evicted = [row[0] for row in await cursor.fetchall()]
+            for evicted_run_id in evicted:
+                await conn.execute("DELETE FROM stream_replay_frames WHERE run_id = ?", (evicted_run_id,))
+                await conn.execute("DELETE FROM stream_replay_runs WHERE run_id = ?", (evicted_run_id,))
+            if len(evicted) < excess:
+                logger.warning(f"Runs still streaming exceed the replay log limit of {max_runs}")
+
+        await self._transaction(work)
+
+    @staticmethod
+    def _replay_key(run_id: str) -> str:
+        return f"replay:{run_id}"
+
+    async def append_replay(self, run_id: str, frame: str) -> int:
+        async def work(conn):
+            async with conn.execute(
+                "UPDATE stream_replay_runs SET last_seq = last_seq + 1 WHERE run_id = ? RETURNING last_seq, capacity",
+                (run_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+            if row is None:
+                return 0
+
+            seq, capacity = row
+            await conn.execute("INSERT INTO stream_replay_frames (run_id, seq, frame) VALUES (?, ?, ?)", (run_id, seq, frame))
+            await conn.execute("DELETE FROM stream_replay_frames WHERE run_id = ? AND seq <= ?", (run_id, seq - capacity))
+            return seq
+
+        seq = await self._transaction(work)
+        self._notify(self._replay_key(run_id))
+        return seq
+
+    async def finish_replay(self, run_id: str):
+        await self._transaction(lambda conn: conn.execute(
+            "UPDATE stream_replay_runs SET done = 1 WHERE run_id = ?", (run_id,)
+        ))
+        self._notify(self._replay_key(run_id))
+
+    async def replay_info(self, run_id: str) -> Optional[Dict[str, Any]]:
+        conn = await self._get_conn()
+        async with self._tx_lock:
+            async with conn.execute(
+                "SELECT thread_id, last_seq, done, readers, reader_idle_since FROM stream_replay_runs WHERE run_id = ?",
+                (run_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+        if row is None:
+            return None
+        thread_id, last_seq, done, readers, reader_idle_since = row
+        return {
+            "thread_id": thread_id,
+            "last_seq": last_seq,
+            "done": bool(done),
+            "readers": readers,
+            "reader_idle_since": reader_idle_since,
+        }
+
+    async def latest_replay(self, thread_id: str) -> Optional[str]:
+        conn = await self._get_conn()
+        async with self._tx_lock:
+            async with conn.execute(
+                "SELECT run_id FROM stream_replay_runs WHERE thread_id = ? ORDER BY created_at DESC LIMIT 1", (thread_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+        return row[0] if row else None
+
+    async def _read_replay_frames(self, run_id: str, cursor: int):
+        """Frames after cursor, plus whether the run has finished (or is gone)"""
+        conn = await self._get_conn()
+        async with self._tx_lock:
+            async with conn.execute(
+                "SELECT seq, frame FROM stream_replay_frames WHERE run_id = ? AND seq > ? ORDER BY seq LIMIT ?",
+                (run_id, cursor, _SUBSCRIPTION_BATCH)
+            ) as db_cursor:
+                rows = await db_cursor.fetchall()
+            async with conn.execute("SELECT done FROM stream_replay_runs WHERE run_id = ?", (run_id,)) as db_cursor:
+                run_row = await db_cursor.fetchone()
+        return rows, run_row is None or bool(run_row[0])
+
+    async def read_replay(self, run_id: str, last_seq: int = 0) -> AsyncIterator[Tuple[int, str]]:
+        await self._transaction(lambda conn: conn.execute(
+            "UPDATE stream_replay_runs SET readers = readers + 1 WHERE run_id = ?", (run_id,)
+        ))
+        try:
+            cursor = last_seq
+            interval = _POLL_MIN_INTERVAL
+            while True:
+                waiter = self._waiter(self._replay_key(run_id))
+                rows, done = await self._read_replay_frames(run_id, cursor)
+                if rows:
+                    for seq, frame in rows:
+                        cursor = seq
+                        yield seq, frame
+                    interval = _POLL_MIN_INTERVAL
+                    continue
+                if done:
+                    return
+
+                await self._wait(waiter, interval)
+                interval = min(interval * 2, _POLL_MAX_INTERVAL)
+        finally:
+            await self._transaction(lambda conn: conn.execute(
+                "UPDATE stream_replay_runs SET readers = MAX(readers - 1, 0),"
+                " reader_idle_since = CASE WHEN readers <= 1 THEN ? ELSE reader_idle_since END WHERE run_id = ?",
+                (time.time(), run_id)
+            ))
+
+    async def aclose(self):
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+
+
+class SqliteStreamSubscription(StreamSubscription):
+    """Subscription reading a queue's stream_broadcast rows, from any process"""
+
+    def __init__(self, bus: SqliteStreamBus, queue_id: str, cursor: int):
+        super().__init__(queue_id, cursor)
+        self._bus = bus
+        self._rows = deque()
+
+    async def get(self) -> Optional[StreamRecord]:
+        interval = _POLL_MIN_INTERVAL
+
+        while not self._closed:
+            if self._rows:
+                row = self._rows.popleft()
+                if row[0] > self.cursor + 1:
+                    # Fell behind the shared buffer: skip to the oldest buffered event
+                    self.missed += row[0] - self.cursor - 1
+                self.cursor = row[0]
+                self.received += 1
+                return SqliteStreamBus._row_to_record(row)
+
+            waiter = self._bus._waiter(self.queue_id)
+            rows, ended = await self._bus._read_broadcast(self.queue_id, self.cursor)
+            if rows:
+                self._rows.extend(rows)
+                interval = _POLL_MIN_INTERVAL
+                continue
+            if ended:
+                return None
+
+            await self._bus._wait(waiter, interval)
+            interval = min(interval * 2, _POLL_MAX_INTERVAL)
+
+        return None
+
+    async def close(self):
+        if not self._closed:
+            self._closed = True
+            await self._bus._end_subscription(self.queue_id, self.missed)
@@ -0,0 +1,47 @@
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from app.utils.logger import logger
+
+# Taken when the module is first imported, i.e. at the very start of app.main
+PROCESS_IMPORT_STARTED = time.perf_counter()
+
+
+class StartupTimer:
+    """
+    Singleton recording how long each startup phase takes, from the first import of the
+    app to the moment it is ready to serve (graph compiled, checkpointer connected).
+    """
+    _instance = None
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.ready_at: Optional[float] = None
+
+    @classmethod
+    def get_instance(cls) -> 'StartupTimer':
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - started
+
+    def mark_ready(self):
+        if self.ready_at is None:
+            self.ready_at = time.perf_counter()
+            report = self.get_report()
+            logger.info(f"Startup ready in {report['import_to_ready_ms']} ms: {report['phases_ms']}")
+
+    def get_report(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready_at is not None,
+            "import_to_ready_ms": round((self.ready_at - PROCESS_IMPORT_STARTED) * 1000, 1) if self.ready_at else None,
+            "phases_ms": {name: round(duration * 1000, 1) for name, duration in self.phases.items()},
+        }
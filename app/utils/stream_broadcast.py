@@ -0,0 +1,142 @@
+import asyncio
+import os
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+from app.utils.stream_record import StreamRecord
+
+# Events kept for subscribers of a stream queue; slower subscribers skip ahead
+STREAM_BROADCAST_CAPACITY = int(os.environ.get("STREAM_BROADCAST_CAPACITY", "256"))
+
+
+class StreamSubscription(ABC):
+    """
+    Read-only cursor over the events of one stream queue.
+
+    Subscribers never take events away from the queue's consumer or from each other. When a
+    subscriber falls further behind than the shared buffer holds it skips to the oldest
+    buffered event and the skipped events are counted in `missed`.
+    """
+
+    def __init__(self, queue_id: str, cursor: int):
+        self.queue_id = queue_id
+        self.cursor = cursor
+        self.received = 0
+        self.missed = 0
+        self._closed = False
+
+    @abstractmethod
+    async def get(self) -> Optional[StreamRecord]:
+        """Wait for the next event; returns None at end-of-stream"""
+
+    async def close(self):
+        self._closed = True
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> StreamRecord:
+        event = await self.get()
+        if event is None:
+            await self.close()
+            raise StopAsyncIteration
+        return event
+
+
+class StreamBroadcast:
+    """
+    Bounded shared buffer of the events put on a queue, read through independent cursors.
+
+    Publishing is a deque append plus a wake-up of the waiting subscribers, so a queue with
+    no subscribers pays almost nothing for it.
+    """
+
+    def __init__(self, queue_id: str, capacity: int = STREAM_BROADCAST_CAPACITY):
+        self.queue_id = queue_id
+        self._events: Deque[Tuple[int, StreamRecord]] = deque(maxlen=capacity)
+        self._last_seq = 0
+        self._closed = False
+        self._wakeup: Optional[asyncio.Future] = None
+
+        self.subscribers = 0
+        self.subscriber_missed = 0
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def _notify(self):
+        if self._wakeup is not None:
+            if not self._wakeup.done():
+                self._wakeup.set_result(None)
+            self._wakeup = None
+
+    def publish(self, event: StreamRecord):
+        if self._closed:
+            return
+        self._last_seq += 1
+        self._events.append((self._last_seq, event))
+        self._notify()
+
+    def close(self):
+        self._closed = True
+        self._notify()
+
+    def subscribe(self, from_start: bool = True) -> 'BroadcastSubscription':
+        """
+        Open a subscription.
+
+        Args:
+            from_start: Start from the oldest buffered event, otherwise only receive new events
+        """
+        self.subscribers += 1
+        cursor = 0 if from_start else self._last_seq
+        return BroadcastSubscription(self, cursor)
+
+    async def _wait_after(self, cursor: int):
+        while self._last_seq <= cursor and not self._closed:
+            if self._wakeup is None:
+                self._wakeup = asyncio.get_running_loop().create_future()
+            await asyncio.shield(self._wakeup)
+
+    def _next_after(self, cursor: int) -> Tuple[int, Optional[StreamRecord], int]:
+        """(seq, event, missed) of the first buffered event after cursor, or (cursor, None, 0)"""
+        if not self._events or self._last_seq <= cursor:
+            return cursor, None, 0
+
+        first_seq = self._events[0][0]
+        if cursor < first_seq:
+            return first_seq, self._events[0][1], first_seq - cursor - 1
+
+        seq, event = self._events[cursor - first_seq + 1]
+        return seq, event, 0
+
+
+class BroadcastSubscription(StreamSubscription):
+    """Subscription to an in-process StreamBroadcast"""
+
+    def __init__(self, broadcast: StreamBroadcast, cursor: int):
+        super().__init__(broadcast.queue_id, cursor)
+        self._broadcast = broadcast
+
+    async def get(self) -> Optional[StreamRecord]:
+        if self._closed:
+            return None
+
+        await self._broadcast._wait_after(self.cursor)
+        seq, event, missed = self._broadcast._next_after(self.cursor)
+        if event is None:
+            return None
+
+        self.cursor = seq
+        self.received += 1
+        if missed:
+            self.missed += missed
+            self._broadcast.subscriber_missed += missed
+        return event
+
+    async def close(self):
+        if not self._closed:
+            self._closed = True
+            self._broadcast.subscribers -= 1
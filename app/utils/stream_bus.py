@@ -0,0 +1,258 @@
+"""
+Stream bus - pluggable transport behind StreamQueueManager.
+
+The in-memory backend keeps process-local bounded queues. Cross-process backends let a
+publisher (e.g. a LangGraph node running out of process) reach a consumer that lives in
+another worker.
+
+The bus also keeps the replay logs of SSE runs, so a client that reconnects to another
+worker can resume a run that is produced elsewhere.
+"""
+
+import asyncio
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from app.utils.logger import logger
+from app.utils.stream_broadcast import StreamBroadcast, StreamSubscription
+from app.utils.stream_queue import BoundedStreamQueue, OverflowPolicy
+from app.utils.stream_record import StreamRecord
+from app.utils.stream_replay_log import ReplayLog
+
+STREAM_BUS_BACKEND = os.environ.get("STREAM_BUS_BACKEND", "memory")
+
+
+class StreamBus(ABC):
+    """Transport for per-run stream queues"""
+
+    @abstractmethod
+    async def create_queue(self, queue_id: str, capacity: int, policy: OverflowPolicy):
+        """Create an empty queue under queue_id"""
+
+    @abstractmethod
+    async def put(self, queue_id: str, event: StreamRecord) -> bool:
+        """Put an event, applying the queue's overflow policy. Returns False if the queue does not exist"""
+
+    @abstractmethod
+    async def get(self, queue_id: str, timeout: Optional[float] = None) -> Optional[StreamRecord]:
+        """Next event, or None at end-of-stream, on timeout, or if the queue does not exist"""
+
+    @abstractmethod
+    async def close(self, queue_id: str):
+        """Publish end-of-stream"""
+
+    @abstractmethod
+    async def cleanup(self, queue_id: str) -> Optional[Dict[str, Any]]:
+        """Delete the queue and its buffered events, returning its final stats"""
+
+    @abstractmethod
+    async def reap_idle(self, idle_ttl: float) -> Dict[str, Dict[str, Any]]:
+        """Delete queues without any put/get/close for idle_ttl seconds, returning their final stats"""
+
+    @abstractmethod
+    async def is_finished(self, queue_id: str) -> bool:
+        """Whether the queue is gone, or closed with nothing left to consume"""
+
+    @abstractmethod
+    async def subscribe(self, queue_id: str, from_start: bool = True) -> Optional[StreamSubscription]:
+        """Open a read-only subscription with its own cursor, or None if the queue does not exist"""
+
+    @abstractmethod
+    async def stats(self, queue_id: str) -> Optional[Dict[str, Any]]:
+        """Counters of one queue"""
+
+    @abstractmethod
+    async def all_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Counters of every queue known to the bus"""
+
+    @abstractmethod
+    async def create_replay(self, run_id: str, thread_id: str, capacity: int, max_runs: int):
+        """Register the replay log of a run, evicting the oldest finished runs beyond max_runs"""
+
+    @abstractmethod
+    async def append_replay(self, run_id: str, frame: str) -> int:
+        """Append an SSE frame to a run's log, keeping the last `capacity` frames. Returns its seq (from 1)"""
+
+    @abstractmethod
+    async def finish_replay(self, run_id: str):
+        """Mark a run's log as complete, which ends its readers once they caught up"""
+
+    @abstractmethod
+    async def replay_info(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """thread_id, last_seq, done, readers and reader_idle_since of a run, or None if unknown"""
+
+    @abstractmethod
+    async def latest_replay(self, thread_id: str) -> Optional[str]:
+        """run_id of the thread's most recent run still kept"""
+
+    @abstractmethod
+    def read_replay(self, run_id: str, last_seq: int = 0) -> AsyncIterator[Tuple[int, str]]:
+        """
+        (seq, frame) for every frame after last_seq, following the run until it finishes.
+        Counts as a reader of the run while it is iterated.
+        """
+
+    async def aclose(self):
+        """Release connections held by the backend"""
+
+
+class InMemoryStreamBus(StreamBus):
+    """
+    Process-local bus: a dict of BoundedStreamQueue, each with a StreamBroadcast for subscribers.
+    Publishers must run in the same process as the consumer.
+    """
+
+    def __init__(self):
+        self._queues: Dict[str, BoundedStreamQueue] = {}
+        self._broadcasts: Dict[str, StreamBroadcast] = {}
+        self._replays: "OrderedDict[str, ReplayLog]" = OrderedDict()
+        self._latest_replay: Dict[str, str] = {}
+
+    def get_queue(self, queue_id: str) -> Optional[BoundedStreamQueue]:
+        return self._queues.get(queue_id)
+
+    async def create_queue(self, queue_id: str, capacity: int, policy: OverflowPolicy):
+        queue = BoundedStreamQueue(capacity=capacity, policy=policy)
+        self._queues[queue_id] = queue
+        self._broadcasts[queue_id] = StreamBroadcast(queue_id)
+
+    async def put(self, queue_id: str, event: StreamRecord) -> bool:
+        queue = self.get_queue(queue_id)
+        if not queue:
+            return False
+        await queue.put(event)
+        broadcast = self._broadcasts.get(queue_id)
+        if broadcast:
+            broadcast.publish(event)
+        return True
+
+    async def get(self, queue_id: str, timeout: Optional[float] = None) -> Optional[StreamRecord]:
+        queue = self.get_queue(queue_id)
+        if not queue:
+            return None
+
+        if timeout is None:
+            return await queue.get()
+
+        try:
+            return await asyncio.wait_for(queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def close(self, queue_id: str):
+        queue = self.get_queue(queue_id)
+        if queue:
+            await queue.close()
+        broadcast = self._broadcasts.get(queue_id)
+        if broadcast:
+            broadcast.close()
+
+    async def _remove(self, queue_id: str) -> Optional[BoundedStreamQueue]:
+        broadcast = self._broadcasts.pop(queue_id, None)
+        if broadcast:
+            # Subscribers drain what is buffered and then see end-of-stream
+            broadcast.close()
+        queue = self._queues.pop(queue_id, None)
+        if queue:
+            # Wake up a consumer or producer still waiting on the removed queue
+            await queue.close()
+        return queue
+
+    @staticmethod
+    def _stats(queue: BoundedStreamQueue, broadcast: Optional[StreamBroadcast]) -> Dict[str, Any]:
+        stats = queue.stats()
+        stats["subscribers"] = broadcast.subscribers if broadcast else 0
+        stats["subscriber_missed"] = broadcast.subscriber_missed if broadcast else 0
+        return stats
+
+    async def cleanup(self, queue_id: str) -> Optional[Dict[str, Any]]:
+        broadcast = self._broadcasts.get(queue_id)
+        queue = await self._remove(queue_id)
+        return self._stats(queue, broadcast) if queue else None
+
+    async def reap_idle(self, idle_ttl: float) -> Dict[str, Dict[str, Any]]:
+        idle_before = time.time() - idle_ttl
+        idle_queue_ids = [queue_id for queue_id, queue in self._queues.items() if queue.last_activity < idle_before]
+        return {queue_id: await self.cleanup(queue_id) for queue_id in idle_queue_ids}
+
+    async def is_finished(self, queue_id: str) -> bool:
+        queue = self.get_queue(queue_id)
+        return queue is None or queue.finished()
+
+    async def subscribe(self, queue_id: str, from_start: bool = True) -> Optional[StreamSubscription]:
+        broadcast = self._broadcasts.get(queue_id)
+        return broadcast.subscribe(from_start) if broadcast else None
+
+    async def stats(self, queue_id: str) -> Optional[Dict[str, Any]]:
+        queue = self.get_queue(queue_id)
+        return self._stats(queue, self._broadcasts.get(queue_id)) if queue else None
+
+    async def all_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            queue_id: self._stats(queue, self._broadcasts.get(queue_id))
+            for queue_id, queue in self._queues.items()
+        }
+
+    async def create_replay(self, run_id: str, thread_id: str, capacity: int, max_runs: int):
+        self._replays[run_id] = ReplayLog(thread_id, capacity)
+        self._latest_replay[thread_id] = run_id
+
+        for finished_run_id in [key for key, replay in self._replays.items() if replay.done]:
+            if len(self._replays) <= max_runs:
+                break
+            self._remove_replay(finished_run_id)
+        if len(self._replays) > max_runs:
+            logger.warning(f"{len(self._replays)} runs still streaming, replay log limit is {max_runs}")
+
+    def _remove_replay(self, run_id: str):
+        replay = self._replays.pop(run_id, None)
+        if replay and self._latest_replay.get(replay.thread_id) == run_id:
+            del self._latest_replay[replay.thread_id]
+
+    async def append_replay(self, run_id: str, frame: str) -> int:
+        replay = self._replays.get(run_id)
+        return await replay.append(frame) if replay else 0
+
+    async def finish_replay(self, run_id: str):
+        replay = self._replays.get(run_id)
+        if replay:
+            await replay.finish()
+
+    async def replay_info(self, run_id: str) -> Optional[Dict[str, Any]]:
+        replay = self._replays.get(run_id)
+        return replay.info() if replay else None
+
+    async def latest_replay(self, thread_id: str) -> Optional[str]:
+        return self._latest_replay.get(thread_id)
+
+    async def read_replay(self, run_id: str, last_seq: int = 0) -> AsyncIterator[Tuple[int, str]]:
+        replay = self._replays.get(run_id)
+        if replay is None:
+            return
+        async with aclosing(replay.frames_after(last_seq)) as frames:
+            async for seq, frame in frames:
+                yield seq, frame
+
+
+def create_stream_bus(backend: str = STREAM_BUS_BACKEND) -> StreamBus:
+    """
+    Create the stream bus selected by STREAM_BUS_BACKEND.
+
+    Args:
+        backend: "memory" (default) or "sqlite" (shared SQLite file, works across processes)
+    """
+    if backend == "memory":
+        return InMemoryStreamBus()
+
+    if backend == "sqlite":
+        from app.utils.sqlite_stream_bus import SqliteStreamBus, HAS_AIOSQLITE
+        if HAS_AIOSQLITE:
+            return SqliteStreamBus()
+        logger.warning("aiosqlite is not installed, falling back to the in-memory stream bus")
+        return InMemoryStreamBus()
+
+    raise ValueError(f"Unsupported stream bus backend: {backend}")
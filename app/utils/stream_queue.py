@@ -0,0 +1,189 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import replace
+from enum import Enum
+from typing import Any, Deque, Dict, Optional
+
+from app.utils.stream_record import StreamRecord
+
+
+class OverflowPolicy(str, Enum):
+    """What a full stream queue does with a new event"""
+    BLOCK = "block"                              # Wait until the consumer makes room
+    DROP_OLDEST_THOUGHT = "drop_oldest_thought"  # Evict the oldest thought event, never final_output
+    COALESCE_THOUGHTS = "coalesce_thoughts"      # Merge adjacent thought text from the same source/task
+
+
+# Only plain thought text may be dropped or merged; markers and final output are always kept
+_SHEDDABLE_EVENT_TYPES = frozenset({"thought"})
+
+
+def _is_sheddable(event: StreamRecord) -> bool:
+    return event.event_type in _SHEDDABLE_EVENT_TYPES
+
+
+def _can_coalesce(older: StreamRecord, newer: StreamRecord) -> bool:
+    return _is_sheddable(older) and _is_sheddable(newer) and \
+        older.source == newer.source and \
+        older.task_id == newer.task_id
+
+
+def _coalesce(older: StreamRecord, newer: StreamRecord) -> StreamRecord:
+    return replace(older, content=older.content + newer.content, segment_id=newer.segment_id)
+
+
+class BoundedStreamQueue:
+    """
+    Bounded FIFO of stream events with an explicit overflow policy.
+
+    Exposes the subset of the asyncio.Queue API used by StreamQueueManager and keeps
+    counters (high-water mark, dropped, coalesced, blocked puts) for capacity sizing, plus
+    creation/last-activity times and buffered content size for the idle reaper.
+    Closing the queue marks the end of the stream: consumers drain what is left and
+    then get None, and producers stop being accepted.
+    """
+
+    def __init__(self, capacity: int, policy: OverflowPolicy = OverflowPolicy.BLOCK):
+        if capacity <= 0:
+            raise ValueError(f"Stream queue capacity must be positive, got {capacity}")
+
+        self.capacity = capacity
+        self.policy = policy
+        self._items: Deque[StreamRecord] = deque()
+        self._changed = asyncio.Condition()
+        self._closed = False
+
+        self.high_water_mark = 0
+        self.total_put = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.blocked_puts = 0
+
+        # Wall-clock seconds, comparable with other processes' queues
+        self.created_at = time.time()
+        self.last_activity = self.created_at
+        # Content length of the buffered events (characters, equals bytes for ASCII text)
+        self.bytes_buffered = 0
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def empty(self) -> bool:
+        return not self._items
+
+    def full(self) -> bool:
+        return len(self._items) >= self.capacity
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def finished(self) -> bool:
+        """True once the queue is closed and every buffered event has been consumed"""
+        return self._closed and not self._items
+
+    async def close(self):
+        """Publish end-of-stream: wake up every waiting consumer and producer"""
+        async with self._changed:
+            self._closed = True
+            self.last_activity = time.time()
+            self._changed.notify_all()
+
+    def _drop_oldest_thought(self) -> bool:
+        for idx, queued in enumerate(self._items):
+            if _is_sheddable(queued):
+                del self._items[idx]
+                self.dropped += 1
+                self.bytes_buffered -= len(queued.content)
+                return True
+        return False
+
+    def _coalesce_into_tail(self, event: StreamRecord) -> bool:
+        if self._items and _can_coalesce(self._items[-1], event):
+            self._items[-1] = _coalesce(self._items[-1], event)
+            self.coalesced += 1
+            return True
+        return False
+
+    def _coalesce_adjacent(self) -> bool:
+        for idx in range(len(self._items) - 1):
+            older, newer = self._items[idx], self._items[idx + 1]
+            if _can_coalesce(older, newer):
+                self._items[idx] = _coalesce(older, newer)
+                del self._items[idx + 1]
+                self.coalesced += 1
+                return True
+        return False
+
+    def _try_put(self, event: StreamRecord) -> bool:
+        """Apply the overflow policy; returns True once the event is accounted for"""
+        if not self.full():
+            self._items.append(event)
+            return True
+
+        if self.policy == OverflowPolicy.DROP_OLDEST_THOUGHT:
+            if self._drop_oldest_thought():
+                self._items.append(event)
+                return True
+
+        elif self.policy == OverflowPolicy.COALESCE_THOUGHTS:
+            if self._coalesce_into_tail(event):
+                return True
+            if self._coalesce_adjacent():
+                self._items.append(event)
+                return True
+
+        # BLOCK, or nothing could be shed: wait for the consumer
+        return False
+
+    async def put(self, event: StreamRecord):
+        async with self._changed:
+            blocked = False
+            while not self._closed and not self._try_put(event):
+                if not blocked:
+                    self.blocked_puts += 1
+                    blocked = True
+                await self._changed.wait()
+
+            if self._closed:
+                # Nobody will read events published after end-of-stream
+                return
+
+            self.total_put += 1
+            self.bytes_buffered += len(event.content)
+            self.last_activity = time.time()
+            self.high_water_mark = max(self.high_water_mark, len(self._items))
+            self._changed.notify_all()
+
+    async def get(self) -> Optional[StreamRecord]:
+        """Wait for the next event; returns None at end-of-stream"""
+        async with self._changed:
+            while not self._items and not self._closed:
+                await self._changed.wait()
+
+            if not self._items:
+                return None
+
+            event = self._items.popleft()
+            self.bytes_buffered -= len(event.content)
+            self.last_activity = time.time()
+            self._changed.notify_all()
+            return event
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for sizing queue capacity from real traffic"""
+        return {
+            "capacity": self.capacity,
+            "policy": self.policy.value,
+            "size": len(self._items),
+            "high_water_mark": self.high_water_mark,
+            "total_put": self.total_put,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "blocked_puts": self.blocked_puts,
+            "closed": self._closed,
+            "bytes_buffered": self.bytes_buffered,
+            "created_at": self.created_at,
+            "last_activity": self.last_activity,
+        }
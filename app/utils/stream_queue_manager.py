@@ -1,20 +1,38 @@
 import asyncio
-from typing import Dict, Optional
+import os
+from typing import Any, Dict, List, Optional
 from uuid import uuid4
-import weakref
 from app.utils.logger import logger
+from app.utils.stream_broadcast import StreamSubscription
+from app.utils.stream_bus import StreamBus, create_stream_bus
+from app.utils.stream_queue import OverflowPolicy
+from app.utils.stream_record import StreamRecord
+
+# Default per-queue limits, overridable per queue in create_queue
+STREAM_QUEUE_CAPACITY = int(os.environ.get("STREAM_QUEUE_CAPACITY", "1000"))
+STREAM_QUEUE_OVERFLOW_POLICY = OverflowPolicy(os.environ.get("STREAM_QUEUE_OVERFLOW_POLICY", OverflowPolicy.COALESCE_THOUGHTS.value))
+
+# Queues without any put/get/close for this long are reaped, checked every STREAM_QUEUE_REAP_INTERVAL seconds
+STREAM_QUEUE_IDLE_TTL = float(os.environ.get("STREAM_QUEUE_IDLE_TTL", "900"))
+STREAM_QUEUE_REAP_INTERVAL = float(os.environ.get("STREAM_QUEUE_REAP_INTERVAL", "60"))
 
 
 class StreamQueueManager:
     """
     Singleton manager for handling stream queues across the application.
-    Uses weak references to allow automatic cleanup of unused queues.
+    Queues live on a pluggable StreamBus (STREAM_BUS_BACKEND): in-memory for a single
+    process, or a shared backend when publishers and consumers run in different workers.
+    A background reaper deletes queues that were never cleaned up once they go idle.
     """
     _instance = None
 
-    def __init__(self):
-        self._queues: Dict[str, asyncio.Queue] = {}
-        self._queue_refs: Dict[str, weakref.ReferenceType] = {}
+    def __init__(self, bus: Optional[StreamBus] = None):
+        self._bus = bus or create_stream_bus()
+        # Events published to queues that do not exist (cleaned up, or never created on this bus)
+        self.missing_queue_puts = 0
+        self.reaped_queues = 0
+        self.reaped_bytes = 0
+        self._reaper_task: Optional[asyncio.Task] = None
 
     @classmethod
     def get_instance(cls) -> 'StreamQueueManager':
@@ -22,94 +40,165 @@ class StreamQueueManager:
             cls._instance = cls()
         return cls._instance
 
-    def create_queue(self, thread_id: str) -> str:
+    @property
+    def bus(self) -> StreamBus:
+        return self._bus
+
+    async def create_queue(self, thread_id: str, capacity: Optional[int] = None, policy: Optional[OverflowPolicy] = None) -> str:
         """
-        Create a new queue for a thread and return its ID.
+        Create a new bounded queue for a thread and return its ID.
 
         Args:
             thread_id: The thread identifier
+            capacity: Maximum number of buffered events (defaults to STREAM_QUEUE_CAPACITY)
+            policy: What to do when the queue is full (defaults to STREAM_QUEUE_OVERFLOW_POLICY)
 
         Returns:
             queue_id: Unique identifier for the created queue
         """
         queue_id = f"queue_{thread_id}_{uuid4().hex[:8]}"
-        queue = asyncio.Queue()
-
-        self._queues[queue_id] = queue
-
-        # Create weak reference for automatic cleanup
-        def cleanup(ref):
-            self._cleanup_queue(queue_id)
-
-        self._queue_refs[queue_id] = weakref.ref(queue, cleanup)
+        await self._bus.create_queue(
+            queue_id,
+            capacity=capacity or STREAM_QUEUE_CAPACITY,
+            policy=policy or STREAM_QUEUE_OVERFLOW_POLICY
+        )
 
         logger.info(f"Created stream queue: {queue_id}")
+        self._ensure_reaper()
         return queue_id
 
-    def get_queue(self, queue_id: str) -> Optional[asyncio.Queue]:
+    async def cleanup_queue(self, queue_id: str):
         """
-        Get queue by ID.
+        Manually clean up a queue when thread ends.
 
         Args:
-            queue_id: The queue identifier
+            queue_id: The queue identifier to cleanup
+        """
+        stats = await self._bus.cleanup(queue_id)
+        if stats is not None:
+            logger.info(f"Cleaned up stream queue: {queue_id} (stats: {stats})")
+
+    def _ensure_reaper(self):
+        """Start the idle reaper on the running loop the first time a queue is created"""
+        if self._reaper_task is None or self._reaper_task.done():
+            self._reaper_task = asyncio.create_task(self._reap_forever())
+
+    async def _reap_forever(self):
+        while True:
+            await asyncio.sleep(STREAM_QUEUE_REAP_INTERVAL)
+            try:
+                await self.reap_idle_queues()
+            except Exception as e:
+                logger.error(f"Failed to reap idle stream queues: {e}")
+
+    async def reap_idle_queues(self, idle_ttl: float = STREAM_QUEUE_IDLE_TTL) -> List[str]:
+        """
+        Delete queues that saw no put/get/close for idle_ttl seconds.
+        These are leaks: runs whose owner never called cleanup_queue.
 
         Returns:
-            The queue instance or None if not found
+            IDs of the reaped queues
         """
-        return self._queues.get(queue_id)
+        reaped = await self._bus.reap_idle(idle_ttl)
+        for queue_id, stats in reaped.items():
+            self.reaped_queues += 1
+            self.reaped_bytes += stats["bytes_buffered"] if stats else 0
+            logger.warning(f"Reaped idle stream queue: {queue_id} (stats: {stats})")
+        return list(reaped)
+
+    async def get_lifecycle_stats(self) -> Dict[str, Any]:
+        """Leak accounting: active queues, reaped queues and buffered bytes (for monitoring)"""
+        all_stats = await self._bus.all_stats()
+        return {
+            "active": len(all_stats),
+            "reaped": self.reaped_queues,
+            "reaped_bytes": self.reaped_bytes,
+            "bytes_buffered": sum(stats["bytes_buffered"] for stats in all_stats.values()),
+            "missing_queue_puts": self.missing_queue_puts,
+        }
+
+    async def find_thread_queues(self, thread_id: str) -> List[str]:
+        """IDs of the open queues of a thread, e.g. to attach an observer to a running chat"""
+        prefix = f"queue_{thread_id}_"
+        return [
+            queue_id for queue_id, stats in (await self._bus.all_stats()).items()
+            if queue_id.startswith(prefix) and not stats["closed"]
+        ]
+
+    async def get_active_queues_count(self) -> int:
+        """Get the number of active queues (for monitoring)"""
+        return len(await self._bus.all_stats())
+
+    async def get_queue_stats(self, queue_id: str) -> Optional[Dict[str, Any]]:
+        """Get capacity and high-water-mark counters of a queue (for monitoring)"""
+        return await self._bus.stats(queue_id)
+
+    async def get_all_queue_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get counters of every active queue (for monitoring)"""
+        return await self._bus.all_stats()
 
-    def cleanup_queue(self, queue_id: str):
+    async def put_event(self, queue_id: str, event: StreamRecord):
         """
-        Manually clean up a queue when thread ends.
+        Put an event into the specified queue.
+        Waits, drops or coalesces according to the queue's overflow policy when it is full.
+        The record is passed by reference, it must not be mutated after publishing.
 
         Args:
-            queue_id: The queue identifier to cleanup
+            queue_id: The queue identifier
+            event: The stream record to put
         """
-        self._cleanup_queue(queue_id)
+        if not await self._bus.put(queue_id, event):
+            self.missing_queue_puts += 1
+            logger.debug("Queue %s not found when trying to put event", queue_id)
 
-    def _cleanup_queue(self, queue_id: str):
-        """Internal cleanup method"""
-        if queue_id in self._queues:
-            del self._queues[queue_id]
-            logger.info(f"Cleaned up stream queue: {queue_id}")
+    async def close_queue(self, queue_id: str):
+        """
+        Publish end-of-stream on the specified queue.
+        Consumers receive the remaining events and then stop; later puts are ignored.
 
-        if queue_id in self._queue_refs:
-            del self._queue_refs[queue_id]
+        Args:
+            queue_id: The queue identifier
+        """
+        await self._bus.close(queue_id)
 
-    def get_active_queues_count(self) -> int:
-        """Get the number of active queues (for monitoring)"""
-        return len(self._queues)
+    async def is_stream_finished(self, queue_id: str) -> bool:
+        """Whether the queue is gone, or closed with nothing left to consume"""
+        return await self._bus.is_finished(queue_id)
 
-    async def put_event(self, queue_id: str, event: dict):
+    async def get_event(self, queue_id: str, timeout: Optional[float] = None) -> Optional[StreamRecord]:
         """
-        Put an event into the specified queue.
+        Get an event from the specified queue, optionally with a timeout.
 
         Args:
             queue_id: The queue identifier
-            event: The event data to put
+            timeout: Timeout in seconds, None waits until an event or end-of-stream arrives
+
+        Returns:
+            Stream record, or None at end-of-stream, on timeout, or if the queue is not found
         """
-        queue = self.get_queue(queue_id)
-        if queue:
-            await queue.put(event)
-        # else:
-        #     logger.warning(f"Queue {queue_id} not found when trying to put event")
+        return await self._bus.get(queue_id, timeout=timeout)
 
-    async def get_event(self, queue_id: str, timeout: float = 1.0) -> Optional[dict]:
+    async def subscribe(self, queue_id: str, from_start: bool = True) -> Optional[StreamSubscription]:
         """
-        Get an event from the specified queue with timeout.
+        Observe a queue without consuming it.
+
+        Every subscriber gets its own cursor over a bounded buffer shared by all subscribers,
+        so dashboards or audit loggers can follow a run next to the SSE consumer. A subscriber
+        that falls too far behind skips ahead, the skipped events are counted in `missed`.
 
         Args:
             queue_id: The queue identifier
-            timeout: Timeout in seconds
+            from_start: Start from the oldest buffered event, otherwise only new events
 
         Returns:
-            Event data or None if timeout or queue not found
+            An async iterator of stream records ending at end-of-stream, or None if the queue is not found
         """
-        queue = self.get_queue(queue_id)
-        if not queue:
-            return None
-
-        try:
-            return await asyncio.wait_for(queue.get(), timeout=timeout)
-        except asyncio.TimeoutError:
-            return None
\ No newline at end of file
+        return await self._bus.subscribe(queue_id, from_start=from_start)
+
+    async def shutdown(self):
+        """Stop the reaper and release connections held by the stream bus"""
+        if self._reaper_task is not None:
+            self._reaper_task.cancel()
+            await asyncio.gather(self._reaper_task, return_exceptions=True)
+            self._reaper_task = None
+        await self._bus.aclose()
@@ -0,0 +1,70 @@
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+# Offset that turns a time.monotonic_ns() reading into wall-clock epoch nanoseconds
+_MONOTONIC_TO_WALL_NS = time.time_ns() - time.monotonic_ns()
+
+# Shared read-only default so records without metadata do not allocate a dict
+EMPTY_METADATA: Mapping[str, Any] = MappingProxyType({})
+
+
+@dataclass(slots=True)
+class StreamRecord:
+    """
+    Compact in-process stream event.
+
+    Records are passed by reference through the stream queues: no validation, no dict
+    round-trip and an integer monotonic timestamp. to_dict/from_dict are the wire form
+    for buses that cross a process boundary.
+    """
+    event_type: str
+    source: str
+    content: str
+    segment_id: int
+    task_id: Optional[str] = None
+    metadata: Mapping[str, Any] = field(default_factory=lambda: EMPTY_METADATA)
+    ts_ns: int = field(default_factory=time.monotonic_ns)
+
+    @property
+    def timestamp(self) -> datetime:
+        """Wall-clock UTC time of the event (naive, like datetime.utcnow())"""
+        wall_ns = self.ts_ns + _MONOTONIC_TO_WALL_NS
+        return datetime.fromtimestamp(wall_ns / 1e9, tz=timezone.utc).replace(tzinfo=None)
+
+    def to_dict(self) -> dict:
+        """Serialize for transmission outside the process"""
+        return {
+            "event_type": self.event_type,
+            "source": self.source,
+            "content": self.content,
+            "segment_id": self.segment_id,
+            "task_id": self.task_id,
+            "metadata": dict(self.metadata),
+            "timestamp": self.timestamp.isoformat()
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'StreamRecord':
+        """Rebuild a record from to_dict() output (or StreamEvent.to_dict())"""
+        timestamp = data.get("timestamp")
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp)
+        if isinstance(timestamp, datetime):
+            if timestamp.tzinfo is None:
+                timestamp = timestamp.replace(tzinfo=timezone.utc)
+            ts_ns = int(timestamp.timestamp() * 1e9) - _MONOTONIC_TO_WALL_NS
+        else:
+            ts_ns = time.monotonic_ns()
+
+        return cls(
+            event_type=data["event_type"],
+            source=data["source"],
+            content=data.get("content", ""),
+            segment_id=data.get("segment_id", 0),
+            task_id=data.get("task_id"),
+            metadata=data.get("metadata") or EMPTY_METADATA,
+            ts_ns=ts_ns
+        )
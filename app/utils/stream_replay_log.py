@@ -0,0 +1,77 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, AsyncGenerator, Deque, Dict, Tuple
+
+
+class ReplayLog:
+    """
+    Bounded in-process log of the SSE frames of one run, for InMemoryStreamBus.
+
+    Frames get monotonic sequence numbers starting at 1. Readers follow the run live and
+    can start after any sequence number still in the ring; the oldest frames are evicted
+    once the log is full.
+    """
+
+    def __init__(self, thread_id: str, capacity: int):
+        self.thread_id = thread_id
+        self.created_at = time.time()
+        self._frames: Deque[Tuple[int, str]] = deque(maxlen=capacity)
+        self._last_seq = 0
+        self._done = False
+        self._changed = asyncio.Condition()
+
+        # Readers following the run, and since when there has been none
+        self.readers = 0
+        self.reader_idle_since = self.created_at
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    async def append(self, frame: str) -> int:
+        async with self._changed:
+            self._last_seq += 1
+            self._frames.append((self._last_seq, frame))
+            self._changed.notify_all()
+            return self._last_seq
+
+    async def finish(self):
+        async with self._changed:
+            self._done = True
+            self._changed.notify_all()
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "thread_id": self.thread_id,
+            "last_seq": self._last_seq,
+            "done": self._done,
+            "readers": self.readers,
+            "reader_idle_since": self.reader_idle_since,
+        }
+
+    async def frames_after(self, last_seq: int = 0) -> AsyncGenerator[Tuple[int, str], None]:
+        """
+        Yield (seq, frame) for every frame after last_seq, following the run until it ends.
+        Frames already evicted from the ring are skipped; the first yielded seq shows the gap.
+        """
+        self.readers += 1
+        try:
+            cursor = last_seq
+            while True:
+                async with self._changed:
+                    while self._last_seq <= cursor and not self._done:
+                        await self._changed.wait()
+                    pending = [(seq, frame) for seq, frame in self._frames if seq > cursor]
+                    done = self._done
+
+                for seq, frame in pending:
+                    cursor = seq
+                    yield seq, frame
+
+                if done and cursor >= self._last_seq:
+                    return
+        finally:
+            self.readers -= 1
+            if self.readers == 0:
+                self.reader_idle_since = time.time()
@@ -1,6 +1,43 @@
 from langchain_core.runnables import Runnable
-from typing import Any
+from typing import Any, AsyncIterable, AsyncGenerator, Dict, TypeVar
+import asyncio
+
+T = TypeVar("T")
 
 async def stream_generator(graph: Runnable, inputs: Any, stream_mode: str = "messages"):
     async for chunk in graph.astream(inputs, stream_mode=stream_mode):
-        yield chunk
\ No newline at end of file
+        yield chunk
+
+
+async def merge_async_streams(*streams: AsyncIterable[T]) -> AsyncGenerator[T, None]:
+    """
+    Merge several async iterables into one, yielding items in arrival order.
+
+    Each source has at most one pending __anext__ and the merge only wakes up when one
+    of them produces an item or finishes, so an idle merge costs no CPU. Ends when every
+    source is exhausted; closing the merge cancels the sources that are still running.
+    """
+    iterators = [stream.__aiter__() for stream in streams]
+    pending: Dict[asyncio.Future, Any] = {
+        asyncio.ensure_future(iterator.__anext__()): iterator for iterator in iterators
+    }
+
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                iterator = pending.pop(future)
+                try:
+                    item = future.result()
+                except StopAsyncIteration:
+                    continue
+                pending[asyncio.ensure_future(iterator.__anext__())] = iterator
+                yield item
+    finally:
+        for future in pending:
+            future.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        for iterator in iterators:
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
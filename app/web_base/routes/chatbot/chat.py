@@ -1,9 +1,13 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Header, HTTPException
 from fastapi.responses import StreamingResponse
+from typing import Optional
 import json
 
 from app.web_base.models.API_models import APIRequest
 from app.web_base.services.chat_service import ChatService
+from app.web_base.services.event_converter import StreamEventConverter
+from app.web_base.services.stream_replay import StreamReplayManager, parse_event_id
+from app.utils.stream_queue_manager import StreamQueueManager
 
 router = APIRouter()
 
@@ -54,6 +58,72 @@ async def chat_stream_handler(request: APIRequest):
     )
 
 
+@router.get("/chat-stream/{thread_id}/resume", status_code=200)
+async def chat_stream_resume_handler(
+    thread_id: str,
+    last_event_id: Optional[str] = Header(default=None),
+    run_id: Optional[str] = None,
+):
+    """
+    Resume a chat stream after a dropped connection.
+    Replays the frames after Last-Event-ID (run_id:seq) and follows the run live, without re-running the graph.
+    Without Last-Event-ID the given run_id, or else the thread's latest run, is replayed from the start.
+    """
+    event_run_id, last_seq = parse_event_id(last_event_id)
+    replay_manager = StreamReplayManager.get_instance()
+    requested_run_id = event_run_id or run_id
+    if requested_run_id:
+        replay = await replay_manager.get_run(requested_run_id)
+    else:
+        replay = await replay_manager.get_latest_run(thread_id)
+
+    if replay is None or replay.thread_id != thread_id:
+        raise HTTPException(status_code=404, detail="No resumable run found for this thread")
+
+    return StreamingResponse(
+        ChatService.resume(replay, last_seq),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
+@router.get("/chat-stream/{thread_id}/watch", status_code=200)
+async def chat_stream_watch_handler(thread_id: str, from_start: bool = True):
+    """
+    Observe the running chat of a thread (ops dashboards, audit).
+    Read-only subscription to the thread's stream queue: never consumes the user's events and never re-runs the graph.
+    """
+    queue_manager = StreamQueueManager.get_instance()
+    queue_ids = await queue_manager.find_thread_queues(thread_id)
+    subscription = await queue_manager.subscribe(queue_ids[0], from_start=from_start) if queue_ids else None
+
+    if subscription is None:
+        raise HTTPException(status_code=404, detail="No running chat found for this thread")
+
+    async def watch_events():
+        try:
+            async for event in subscription:
+                frame = StreamEventConverter.convert_queue_event(event)
+                if frame:
+                    yield frame
+        finally:
+            await subscription.close()
+
+    return StreamingResponse(
+        watch_events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
 @router.delete("/clear-history", status_code=200)
 async def clear_history_handler():
     """Clear all conversation history from SQLite database"""
@@ -4,6 +4,16 @@ Prevents cold starts by pinging every 40 minutes.
 """
 
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.utils.stream_queue_manager import StreamQueueManager
+from app.AI.supervisor_workflow.head_quarter.nodes.router import RouterMetrics
+from app.AI.supervisor_workflow.head_quarter.nodes.assessment.semantic_cache import AssessmentSemanticCache
+from app.AI.supervisor_workflow.departments.utils.bulkhead import BulkheadRegistry
+from app.AI.core.llm import get_all_hedge_stats, get_response_cache_stats, get_http_pool_stats, get_rate_limit_stats, \
+    get_single_flight_stats
+from app.utils.startup_timer import StartupTimer
+from app.web_base.services.warm_up import WarmUpManager
 
 router = APIRouter(prefix="/health", tags=["Health"])
 
@@ -12,15 +22,29 @@ router = APIRouter(prefix="/health", tags=["Health"])
 async def wake_up_service():
     """
     Simple wake-up endpoint for Render cron jobs.
-    Returns immediately to prevent cold starts.
+    Warms the worker up if it is not yet (returns immediately once it is).
     """
+    report = await WarmUpManager.get_instance().warm_up()
     return {
         "success": True,
         "status": "awake",
-        "message": "Service is warm and ready"
+        "message": "Service is warm and ready" if report["status"] == "ready" else f"Service is awake ({report['status']})",
+        "warm_up": report
     }
 
 
+@router.get("/ready")
+async def readiness():
+    """
+    Readiness probe: 200 once warm-up has finished, 503 before.
+    """
+    report = WarmUpManager.get_instance().get_report()
+    return JSONResponse(
+        status_code=200 if report["ready"] else 503,
+        content={"success": report["ready"], **report}
+    )
+
+
 @router.get("/ping")
 async def ping():
     """
@@ -29,4 +53,114 @@ async def ping():
     return {
         "success": True,
         "status": "pong"
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/streams")
+async def stream_stats():
+    """
+    Stream queue leak accounting: active and reaped queues, buffered bytes.
+    """
+    return {
+        "success": True,
+        **(await StreamQueueManager.get_instance().get_lifecycle_stats())
+    }
+
+
+@router.get("/router")
+async def router_stats():
+    """
+    Fast-path router hit rate and lexical confidence distribution, for tuning the threshold.
+    """
+    return {
+        "success": True,
+        **RouterMetrics.get_instance().get_stats()
+    }
+
+
+@router.get("/assessment-cache")
+async def assessment_cache_stats():
+    """
+    Assessment semantic cache: entries, hit rate and average similarity of hits.
+    """
+    return {
+        "success": True,
+        **AssessmentSemanticCache.get_instance().get_stats()
+    }
+
+
+@router.get("/bulkheads")
+async def bulkhead_stats():
+    """
+    Per-department concurrency, wait queue and queue-wait-time metrics.
+    """
+    return {
+        "success": True,
+        "departments": BulkheadRegistry.get_instance().get_stats()
+    }
+
+
+@router.get("/llm-hedging")
+async def llm_hedging_stats():
+    """
+    Hedged LLM requests per node: hedge rate, primary/backup wins and the current hedge delay.
+    """
+    return {
+        "success": True,
+        "nodes": get_all_hedge_stats()
+    }
+
+
+@router.get("/llm-cache")
+async def llm_cache_stats():
+    """
+    LLM response cache: entries held, memory/disk hits and misses per node.
+    """
+    return {
+        "success": True,
+        **get_response_cache_stats()
+    }
+
+
+@router.get("/llm-single-flight")
+async def llm_single_flight_stats():
+    """
+    LLM single-flight coalescing: calls in flight, upstream requests and coalescing ratio per node.
+    """
+    return {
+        "success": True,
+        **get_single_flight_stats()
+    }
+
+
+@router.get("/http-pools")
+async def http_pool_stats():
+    """
+    Shared HTTP connection pools per provider host: connections, active/idle, queued requests.
+    """
+    return {
+        "success": True,
+        "hosts": get_http_pool_stats()
+    }
+
+
+@router.get("/llm-rate-limits")
+async def llm_rate_limit_stats():
+    """
+    Client-side LLM rate limiters per model: queue depth, wait times and bucket levels.
+    """
+    return {
+        "success": True,
+        "models": get_rate_limit_stats()
+    }
+
+
+@router.get("/startup")
+async def startup_report():
+    """
+    Startup phase timings and import-to-ready time of this worker.
+    """
+    return {
+        "success": True,
+        **StartupTimer.get_instance().get_report()
+    }
@@ -1,18 +1,26 @@
 from langchain_core.runnables import RunnableConfig
 from typing import Optional, AsyncGenerator
 import asyncio
+from contextlib import aclosing
 
 from app.web_base.models.API_models import APIRequest
 from app.AI.supervisor_workflow.shared.models.Chat import UserContext, ChatState
 from app.utils.logger import logger
 from app.utils.stream_queue_manager import StreamQueueManager
+from app.utils.stream_tools import merge_async_streams
 from app.AI.supervisor_workflow.shared.models.stream_models import create_stream_consumer
+from app.AI.supervisor_workflow.departments.utils.speculation import SpeculationRegistry
+from app.AI.supervisor_workflow.departments.utils.dependents import DependentTaskScheduler
 from .event_converter import StreamEventConverter
+from .stream_replay import RunReplay, StreamReplayManager
 
 
 class ChatService:
     """Clean, focused chat service with lightweight event conversion"""
 
+    # Use lightweight event converter
+    event_converter = StreamEventConverter
+
     def __init__(self, request: APIRequest, user_context: Optional[UserContext] = None):
         self.user_query = request.user_query
         self.thread_id = request.thread_id
@@ -22,8 +30,6 @@ class ChatService:
             preferred_language="en",
             thread_id=self.thread_id,
         )
-        # Use lightweight event converter
-        self.event_converter = StreamEventConverter
 
     async def _get_main_graph(self):
         """Lazy import of main_graph with PostgreSQL checkpointer"""
@@ -56,15 +62,15 @@ class ChatService:
     async def _create_queue_events(self, stream_consumer) -> AsyncGenerator[tuple[str, str], None]:
         """Generate events from the queue consumer"""
         try:
-            async for event in stream_consumer.consume_events(timeout_per_event=0.1):
+            async for event in stream_consumer.consume_events():
                 result = self.event_converter.convert_queue_event(event)
                 if result:
                     yield ("queue", result)
         except Exception as e:
             logger.error(f"Error consuming queue events: {e}")
 
-    async def _create_graph_events(self, graph, input_data: ChatState, config: RunnableConfig) -> AsyncGenerator[tuple[str, str], None]:
-        """Generate events from the graph"""
+    async def _create_graph_events(self, graph, input_data: ChatState, config: RunnableConfig, queue_id: str) -> AsyncGenerator[tuple[str, str], None]:
+        """Generate events from the graph and publish end-of-stream on the queue when it finishes"""
         try:
             async for chunk in graph.astream(
                 input_data,
@@ -81,16 +87,21 @@ class ChatService:
                             yield ("graph", result)
         except Exception as e:
             logger.error(f"Error in graph streaming: {e}")
+        finally:
+            # The graph has finished, so nothing else will publish to the queue
+            SpeculationRegistry.get_instance().discard_run(queue_id)
+            DependentTaskScheduler.get_instance().discard_run(queue_id)
+            await StreamQueueManager.get_instance().close_queue(queue_id)
 
-    async def run(self) -> AsyncGenerator[str, None]:
+    async def _stream_frames(self) -> AsyncGenerator[str, None]:
         """
-        Run the chat service with real-time streaming.
+        Run the graph and produce its SSE frames.
 
         Service controls orchestration, uses lightweight converter for event formatting.
         """
         # Service layer manages queue
         queue_manager = StreamQueueManager.get_instance()
-        queue_id = queue_manager.create_queue(self.thread_id)
+        queue_id = await queue_manager.create_queue(self.thread_id)
         stream_consumer = create_stream_consumer(queue_id)
 
         # Setup configuration and input data
@@ -98,53 +109,17 @@ class ChatService:
         input_data = self._create_input_data(queue_id)
         graph = await self._get_main_graph()
 
-        # Service layer controls event merging
-        internal_queue = asyncio.Queue()
-
-        async def queue_consumer_task():
-            """Background task for queue events"""
-            try:
-                async for source, event_data in self._create_queue_events(stream_consumer):
-                    await internal_queue.put((source, event_data))
-            except Exception as e:
-                logger.error(f"Error in queue consumer task: {e}")
-            finally:
-                await internal_queue.put(("queue_done", None))
-
-        async def graph_consumer_task():
-            """Background task for graph events"""
-            try:
-                async for source, event_data in self._create_graph_events(graph, input_data, config):
-                    await internal_queue.put((source, event_data))
-            except Exception as e:
-                logger.error(f"Error in graph consumer task: {e}")
-            finally:
-                await internal_queue.put(("graph_done", None))
-
-        # Service layer orchestrates
-        queue_task = asyncio.create_task(queue_consumer_task())
-        graph_task = asyncio.create_task(graph_consumer_task())
+        # Service layer controls event merging: one wakeup per event, no timeout polling.
+        # The graph stream closes the queue when it finishes, which ends the queue stream.
+        merged_events = merge_async_streams(
+            self._create_queue_events(stream_consumer),
+            self._create_graph_events(graph, input_data, config, queue_id),
+        )
 
         try:
-            graph_done = False
-            queue_done = False
-
-            while not (graph_done and queue_done):
-                try:
-                    source, event_data = await asyncio.wait_for(internal_queue.get(), timeout=0.1)
-
-                    if source == "graph_done":
-                        graph_done = True
-                    elif source == "queue_done":
-                        queue_done = True
-                    elif event_data:
-                        yield event_data
-
-                except asyncio.TimeoutError:
-                    continue
-                except Exception as e:
-                    logger.error(f"Error getting event from internal queue: {e}")
-                    break
+            async for source, event_data in merged_events:
+                if event_data:
+                    yield event_data
 
             # Final result is now streamed directly by the final response node
             # No need to send it here as it's handled by final_output events
@@ -157,14 +132,50 @@ class ChatService:
             )
             yield error_message
         finally:
-            # Service layer cleanup
-            for task in [queue_task, graph_task]:
-                if not task.done():
-                    task.cancel()
-                    try:
-                        await task
-                    except asyncio.CancelledError:
-                        pass
+            # Service layer cleanup: cancels whichever producer is still running
+            await merged_events.aclose()
+
+            await queue_manager.cleanup_queue(queue_id)
+
+    async def _record_run(self, replay: RunReplay):
+        """Produce the run's frames into its replay log, independently of any client connection"""
+        replay_manager = StreamReplayManager.get_instance()
+        try:
+            async for frame in self._stream_frames():
+                await replay_manager.append(replay, frame)
+        except Exception as e:
+            logger.error(f"Error in chat run {replay.run_id}: {e}")
+            await replay_manager.append(replay, self.event_converter.format_sse_message(f"Error: {str(e)}", 'error'))
+        finally:
+            await replay_manager.finish(replay)
 
-            queue_manager.cleanup_queue(queue_id)
+    async def run(self) -> AsyncGenerator[str, None]:
+        """
+        Run the chat service with real-time streaming.
 
+        The graph runs in a background task that records every frame in a per-run replay
+        log on the stream bus, so a client that disconnects can resume with Last-Event-ID
+        (see resume) without the run being restarted. The run is cancelled once no client
+        has followed it for STREAM_REPLAY_IDLE_TTL seconds.
+        """
+        replay_manager = StreamReplayManager.get_instance()
+        replay = await replay_manager.start_run(self.thread_id)
+        replay_manager.produce(replay, self._record_run(replay))
+
+        async for frame in self.resume(replay):
+            yield frame
+
+    @classmethod
+    async def resume(cls, replay: RunReplay, last_seq: int = 0) -> AsyncGenerator[str, None]:
+        """
+        Stream the frames of a run after last_seq, each tagged with an SSE id of run_id:seq.
+        Follows the run live until it ends; frames already evicted from the log are reported
+        with a single replay_gap message.
+        """
+        expected_seq = last_seq + 1
+        async with aclosing(StreamReplayManager.get_instance().frames_after(replay, last_seq)) as frames:
+            async for seq, frame in frames:
+                if seq > expected_seq:
+                    yield cls.event_converter.format_sse_message("", 'replay_gap', missed=seq - expected_seq)
+                expected_seq = seq + 1
+                yield f"id: {replay.event_id(seq)}\n{frame}"
@@ -1,55 +1,95 @@
 import json
+from json.encoder import encode_basestring_ascii
+from functools import lru_cache
 from typing import Dict, Callable, Optional, Any
 
+# Variable string fields of a frame are encoded with the stdlib C string encoder, which is
+# what json.dumps uses for str and is faster than any full encoder for a single string.
+_encode_json_string: Callable[[str], str] = encode_basestring_ascii
+
+# Optional fast JSON backend for whole payloads, the stdlib encoder is used when orjson is not installed
+try:
+    import orjson
+
+    def _fast_dumps(value: Any) -> str:
+        return orjson.dumps(value).decode()
+
+    JSON_BACKEND = "orjson"
+except ImportError:
+    _fast_dumps = json.dumps
+    JSON_BACKEND = "json"
+
+
+@lru_cache(maxsize=1024)
+def _frame_prefix(chunk_type: str, source: str, task_id: Optional[str], with_task_id: bool) -> str:
+    """Pre-encoded constant head of an SSE frame for one (type, source, task_id)"""
+    head = f'data: {{"type": {json.dumps(chunk_type)}, "source": {json.dumps(source)}'
+    if with_task_id:
+        head += f', "task_id": {json.dumps(task_id)}'
+    return head + ', "chunk": '
+
 
 class StreamEventConverter:
     """Lightweight utility for converting stream events to client format"""
 
-    @staticmethod
-    def format_sse_message(chunk_text: str, chunk_type: str, **kwargs) -> str:
+    # Pluggable encoder for dict payloads, see set_json_encoder
+    json_dumps: Callable[[Any], str] = staticmethod(_fast_dumps)
+
+    @classmethod
+    def set_json_encoder(cls, dumps: Callable[[Any], str]):
+        """Replace the JSON encoder used for dict SSE payloads (must return str)"""
+        cls.json_dumps = staticmethod(dumps)
+
+    @classmethod
+    def format_sse_message(cls, chunk_text: str, chunk_type: str, **kwargs) -> str:
         """Format a message for Server-Sent Events (SSE) streaming"""
         data = {"chunk": chunk_text, "type": chunk_type}
         data.update(kwargs)
-        return f"data: {json.dumps(data)}\n\n"
+        return f"data: {cls.json_dumps(data)}\n\n"
 
     @classmethod
-    def convert_queue_event(cls, event) -> Optional[str]:
-        """Convert queue events to client format"""
-        handlers = {
-            "thought": lambda: cls.format_sse_message(
-                event.content,
-                'thought',
-                source=event.source,
-                segment_id=event.segment_id,
-                task_id=event.task_id,
-                timestamp=event.timestamp.isoformat() if hasattr(event.timestamp, 'isoformat') else str(event.timestamp)
-            ),
-            "thought_complete": lambda: cls.format_sse_message(
-                "",
-                'thought_complete',
-                source=event.source,
-                segment_id=event.segment_id,
-                task_id=event.task_id,
-                total_length=event.metadata.get('total_length', 0)
-            ),
-            "final_output": lambda: cls.format_sse_message(
-                event.content,
-                'final_output',
-                source=event.source,
-                segment_id=event.segment_id,
-                timestamp=event.timestamp.isoformat() if hasattr(event.timestamp, 'isoformat') else str(event.timestamp)
-            ),
-            "final_output_complete": lambda: cls.format_sse_message(
-                "",
-                'final_output_complete',
-                source=event.source,
-                segment_id=event.segment_id,
-                total_length=event.metadata.get('total_length', 0)
-            )
-        }
+    def _encode_thought(cls, event) -> str:
+        return (
+            f'{_frame_prefix("thought", event.source, event.task_id, True)}{_encode_json_string(event.content)}'
+            f', "segment_id": {event.segment_id}, "timestamp": "{event.timestamp.isoformat()}"}}\n\n'
+        )
+
+    @classmethod
+    def _encode_thought_complete(cls, event) -> str:
+        return (
+            f'{_frame_prefix("thought_complete", event.source, event.task_id, True)}""'
+            f', "segment_id": {event.segment_id}, "total_length": {int(event.metadata.get("total_length", 0))}}}\n\n'
+        )
+
+    @classmethod
+    def _encode_final_output(cls, event) -> str:
+        return (
+            f'{_frame_prefix("final_output", event.source, None, False)}{_encode_json_string(event.content)}'
+            f', "segment_id": {event.segment_id}, "timestamp": "{event.timestamp.isoformat()}"}}\n\n'
+        )
+
+    @classmethod
+    def _encode_final_output_complete(cls, event) -> str:
+        return (
+            f'{_frame_prefix("final_output_complete", event.source, None, False)}""'
+            f', "segment_id": {event.segment_id}, "total_length": {int(event.metadata.get("total_length", 0))}}}\n\n'
+        )
 
-        handler = handlers.get(event.event_type)
-        return handler() if handler else None
+    _QUEUE_EVENT_ENCODERS: Dict[str, str] = {
+        "thought": "_encode_thought",
+        "thought_complete": "_encode_thought_complete",
+        "final_output": "_encode_final_output",
+        "final_output_complete": "_encode_final_output_complete",
+    }
+
+    @classmethod
+    def convert_queue_event(cls, event) -> Optional[str]:
+        """
+        Convert queue events to client format.
+        Only the variable fields (chunk, segment_id, timestamp/total_length) are encoded per event.
+        """
+        encoder_name = cls._QUEUE_EVENT_ENCODERS.get(event.event_type)
+        return getattr(cls, encoder_name)(event) if encoder_name else None
 
     @classmethod
     def convert_graph_event(cls, stream_content: Dict[str, Any]) -> Optional[str]:
@@ -90,4 +130,4 @@ class StreamEventConverter:
             "thread_id": thread_id,
             "final_output": final_output,
         }
-        return f"data: {json.dumps(result)}\n\n"
\ No newline at end of file
+        return f"data: {cls.json_dumps(result)}\n\n"
@@ -0,0 +1,145 @@
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Dict, Optional, Tuple
+from uuid import uuid4
+
+from app.utils.logger import logger
+from app.utils.stream_bus import StreamBus
+from app.utils.stream_queue_manager import StreamQueueManager
+
+# Frames kept per run for reconnecting clients, and number of runs kept on the stream bus
+STREAM_REPLAY_BUFFER_SIZE = int(os.environ.get("STREAM_REPLAY_BUFFER_SIZE", "2000"))
+STREAM_REPLAY_MAX_RUNS = int(os.environ.get("STREAM_REPLAY_MAX_RUNS", "256"))
+# A run that no client has followed for this many seconds is cancelled
+STREAM_REPLAY_IDLE_TTL = float(os.environ.get("STREAM_REPLAY_IDLE_TTL", "120"))
+
+
+def format_event_id(run_id: str, seq: int) -> str:
+    return f"{run_id}:{seq}"
+
+
+def parse_event_id(event_id: Optional[str]) -> Tuple[Optional[str], int]:
+    """
+    Split a Last-Event-ID value into (run_id, seq).
+    A bare run id resumes from the start of that run; a missing or invalid id gives (None, 0).
+    """
+    if not event_id:
+        return None, 0
+
+    run_id, _, seq = event_id.strip().rpartition(":")
+    if not run_id:
+        return event_id.strip(), 0
+    try:
+        return run_id, int(seq)
+    except ValueError:
+        return None, 0
+
+
+@dataclass(frozen=True)
+class RunReplay:
+    """Handle of one run's replay log on the stream bus"""
+    thread_id: str
+    run_id: str
+
+    def event_id(self, seq: int) -> str:
+        return format_event_id(self.run_id, seq)
+
+
+class StreamReplayManager:
+    """
+    Singleton front of the run replay logs kept on the stream bus.
+
+    The logs live on the StreamQueueManager's bus, so with a cross-process bus
+    (STREAM_BUS_BACKEND=sqlite) a client reconnecting to any worker resumes the run;
+    the in-memory bus only serves reconnects that reach the worker running it.
+
+    Runs started in this worker are supervised: a run no client has followed for
+    STREAM_REPLAY_IDLE_TTL seconds is cancelled instead of running the graph for nobody.
+    """
+    _instance = None
+
+    def __init__(self, max_runs: int = STREAM_REPLAY_MAX_RUNS, capacity: int = STREAM_REPLAY_BUFFER_SIZE,
+                 idle_ttl: float = STREAM_REPLAY_IDLE_TTL):
+        self.max_runs = max_runs
+        self.capacity = capacity
+        self.idle_ttl = idle_ttl
+        # Supervisors of the runs produced by this worker, kept referenced until the run ends
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.abandoned_runs = 0
+
+    @classmethod
+    def get_instance(cls) -> 'StreamReplayManager':
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @property
+    def bus(self) -> StreamBus:
+        return StreamQueueManager.get_instance().bus
+
+    async def start_run(self, thread_id: str) -> RunReplay:
+        """Register a new run for a thread and return its replay handle"""
+        replay = RunReplay(thread_id=thread_id, run_id=f"run_{uuid4().hex[:12]}")
+        await self.bus.create_replay(replay.run_id, thread_id, self.capacity, self.max_runs)
+        return replay
+
+    def produce(self, replay: RunReplay, producer: Awaitable[None]):
+        """Run producer (which appends the run's frames) in the background, cancelling it once abandoned"""
+        self._tasks[replay.run_id] = asyncio.create_task(self._supervise(replay, producer))
+
+    async def _supervise(self, replay: RunReplay, producer: Awaitable[None]):
+        task = asyncio.ensure_future(producer)
+        check_interval = max(self.idle_ttl / 4, 0.05)
+        try:
+            while True:
+                done, _ = await asyncio.wait({task}, timeout=check_interval)
+                if done:
+                    return
+                if await self._is_abandoned(replay):
+                    self.abandoned_runs += 1
+                    logger.warning(f"No client followed run {replay.run_id} for {self.idle_ttl:.0f}s, cancelling it")
+                    task.cancel()
+                    await asyncio.wait({task})
+                    return
+        finally:
+            if not task.done():
+                task.cancel()
+            self._tasks.pop(replay.run_id, None)
+
+    async def _is_abandoned(self, replay: RunReplay) -> bool:
+        try:
+            info = await self.bus.replay_info(replay.run_id)
+        except Exception as e:
+            logger.error(f"Could not check the readers of run {replay.run_id}: {e}")
+            return False
+        if info is None:
+            # Evicted from the bus, nobody can resume it any more
+            return True
+        return info["readers"] == 0 and time.time() - info["reader_idle_since"] >= self.idle_ttl
+
+    async def append(self, replay: RunReplay, frame: str) -> int:
+        return await self.bus.append_replay(replay.run_id, frame)
+
+    async def finish(self, replay: RunReplay):
+        await self.bus.finish_replay(replay.run_id)
+
+    def frames_after(self, replay: RunReplay, last_seq: int = 0) -> AsyncIterator[Tuple[int, str]]:
+        """
+        Yield (seq, frame) for every frame after last_seq, following the run until it ends.
+        Frames already evicted from the log are skipped; the first yielded seq shows the gap.
+        """
+        return self.bus.read_replay(replay.run_id, last_seq)
+
+    async def get_run(self, run_id: str) -> Optional[RunReplay]:
+        info = await self.bus.replay_info(run_id)
+        return RunReplay(thread_id=info["thread_id"], run_id=run_id) if info else None
+
+    async def get_latest_run(self, thread_id: str) -> Optional[RunReplay]:
+        run_id = await self.bus.latest_replay(thread_id)
+        return RunReplay(thread_id=thread_id, run_id=run_id) if run_id else None
+
+    def get_active_runs_count(self) -> int:
+        """Number of runs this worker is still producing (for monitoring)"""
+        return len(self._tasks)
@@ -0,0 +1,120 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, Optional
+
+from app.utils.logger import logger
+from app.utils.startup_timer import StartupTimer
+
+# Set WARMUP_ON_STARTUP=false to start serving right away and initialize on the first request
+WARMUP_ON_STARTUP = os.environ.get("WARMUP_ON_STARTUP", "true").lower() == "true"
+# Open a pooled connection to each LLM provider during warm-up (one list-models request each)
+WARMUP_PRECONNECT = os.environ.get("WARMUP_PRECONNECT", "true").lower() == "true"
+WARMUP_PRECONNECT_TIMEOUT = float(os.environ.get("WARMUP_PRECONNECT_TIMEOUT", "5"))
+
+
+class WarmUpManager:
+    """
+    Singleton that brings the worker to a ready state once: compiles the main graph, opens and
+    sets up the checkpointer, creates the LLM clients and opens their provider connections.
+
+    Runs from the FastAPI lifespan and the wake-up endpoint; concurrent callers share one run.
+    A failing step is logged and leaves the worker "degraded", the lazy paths retry it on demand.
+    """
+    _instance = None
+
+    def __init__(self):
+        self.status = "pending"
+        self.steps: Dict[str, Dict[str, Any]] = {}
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def get_instance(cls) -> 'WarmUpManager':
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @property
+    def is_ready(self) -> bool:
+        return self.status in ("ready", "degraded")
+
+    async def warm_up(self) -> Dict[str, Any]:
+        if self.is_ready:
+            return self.get_report()
+
+        async with self._lock:
+            if self.is_ready:
+                return self.get_report()
+
+            self.status = "warming"
+            self.steps = {}
+            self.started_at = time.time()
+
+            await self._run_step("main_graph", self._warm_main_graph)
+            await self._run_step("llm_clients", self._warm_llm_clients)
+            if WARMUP_PRECONNECT:
+                await self._run_step("provider_connections", self._warm_provider_connections)
+
+            self.finished_at = time.time()
+            self.status = "ready" if all(step["ok"] for step in self.steps.values()) else "degraded"
+            StartupTimer.get_instance().mark_ready()
+            logger.info(f"Warm-up {self.status} in {(self.finished_at - self.started_at) * 1000:.0f} ms")
+
+        return self.get_report()
+
+    async def shutdown(self):
+        """Close the checkpointer connections; a later warm_up starts over"""
+        from app.AI.supervisor_workflow.head_quarter.main_graph import close_main_graph_with_checkpointer
+
+        async with self._lock:
+            try:
+                await close_main_graph_with_checkpointer()
+            except Exception as e:
+                logger.error(f"!! Error closing checkpointers: {e} !!")
+            self.status = "pending"
+
+    async def _run_step(self, name: str, step):
+        started = time.perf_counter()
+        try:
+            with StartupTimer.get_instance().phase(f"warm_up_{name}"):
+                detail = await step()
+            self.steps[name] = {"ok": True, "ms": round((time.perf_counter() - started) * 1000, 1)}
+            if detail:
+                self.steps[name]["detail"] = detail
+        except Exception as e:
+            logger.error(f"!! Warm-up step {name} failed: {e} !!")
+            self.steps[name] = {"ok": False, "ms": round((time.perf_counter() - started) * 1000, 1), "error": str(e)}
+
+    @staticmethod
+    async def _warm_main_graph():
+        from app.AI.supervisor_workflow.head_quarter.main_graph import get_main_graph_with_checkpointer
+        await get_main_graph_with_checkpointer()
+
+    @staticmethod
+    async def _warm_llm_clients():
+        # The department subgraphs created theirs while the graph was built
+        from app.AI.supervisor_workflow.head_quarter.nodes.assessment.assessment_node import get_llm as get_assessment_llm
+        from app.AI.supervisor_workflow.head_quarter.nodes.aggregator.aggregator_node import get_llm as get_aggregator_llm
+
+        # Client creation is synchronous and retries with sleeps on failure
+        for get_llm in (get_assessment_llm, get_aggregator_llm):
+            await asyncio.to_thread(get_llm)
+
+    @staticmethod
+    async def _warm_provider_connections() -> Dict[str, bool]:
+        from app.AI.core.llm import LLMFactory
+        results = await LLMFactory.preconnect(timeout=WARMUP_PRECONNECT_TIMEOUT)
+        if results and not any(results.values()):
+            raise ConnectionError("no LLM provider could be reached")
+        return results
+
+    def get_report(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "ready": self.is_ready,
+            "duration_ms": round((self.finished_at - self.started_at) * 1000, 1)
+            if self.started_at and self.finished_at else None,
+            "steps": self.steps,
+        }
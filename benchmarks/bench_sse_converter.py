@@ -0,0 +1,101 @@
+"""
+Microbenchmark: SSE frame encoding of queue events.
+
+Compares the previous StreamEventConverter.convert_queue_event (handlers dict of lambdas
+rebuilt per event + json.dumps of a fresh dict) with the cached-prefix frame builder.
+
+Usage:
+    python benchmarks/bench_sse_converter.py [n_events]
+"""
+
+import json
+import sys
+import time
+
+from app.utils.stream_record import StreamRecord
+from app.web_base.services.event_converter import StreamEventConverter
+
+
+def legacy_format_sse_message(chunk_text: str, chunk_type: str, **kwargs) -> str:
+    data = {"chunk": chunk_text, "type": chunk_type}
+    data.update(kwargs)
+    return f"data: {json.dumps(data)}\n\n"
+
+
+def legacy_convert_queue_event(event):
+    handlers = {
+        "thought": lambda: legacy_format_sse_message(
+            event.content,
+            'thought',
+            source=event.source,
+            segment_id=event.segment_id,
+            task_id=event.task_id,
+            timestamp=event.timestamp.isoformat() if hasattr(event.timestamp, 'isoformat') else str(event.timestamp)
+        ),
+        "thought_complete": lambda: legacy_format_sse_message(
+            "",
+            'thought_complete',
+            source=event.source,
+            segment_id=event.segment_id,
+            task_id=event.task_id,
+            total_length=event.metadata.get('total_length', 0)
+        ),
+        "final_output": lambda: legacy_format_sse_message(
+            event.content,
+            'final_output',
+            source=event.source,
+            segment_id=event.segment_id,
+            timestamp=event.timestamp.isoformat() if hasattr(event.timestamp, 'isoformat') else str(event.timestamp)
+        ),
+        "final_output_complete": lambda: legacy_format_sse_message(
+            "",
+            'final_output_complete',
+            source=event.source,
+            segment_id=event.segment_id,
+            total_length=event.metadata.get('total_length', 0)
+        )
+    }
+    handler = handlers.get(event.event_type)
+    return handler() if handler else None
+
+
+def make_events(n: int):
+    text = "The quick brown fox jumps over the lazy dog, \"quoted\" and ünïcode. " * 2
+    events = []
+    for i in range(n):
+        if i % 2:
+            events.append(StreamRecord(event_type="thought", source="WebDepartment", content=text[:64], segment_id=i, task_id="task_001"))
+        else:
+            events.append(StreamRecord(event_type="final_output", source="FinalResponse", content=text[:64], segment_id=i))
+    return events
+
+
+def bench(convert, events) -> float:
+    start = time.perf_counter()
+    for event in events:
+        convert(event)
+    return time.perf_counter() - start
+
+
+def main(n: int):
+    events = make_events(n)
+
+    # Both encoders must produce the same JSON payloads
+    events[:2] = [
+        StreamRecord(event_type="thought_complete", source="WebDepartment", content="", segment_id=3, task_id="task_001", metadata={"total_length": 120}),
+        StreamRecord(event_type="final_output_complete", source="FinalResponse", content="", segment_id=0, metadata={"total_length": 640}),
+    ]
+    for event in events[:4]:
+        old = json.loads(legacy_convert_queue_event(event)[len("data: "):])
+        new = json.loads(StreamEventConverter.convert_queue_event(event)[len("data: "):])
+        assert old == new, (old, new)
+
+    for name, convert in (("legacy converter", legacy_convert_queue_event),
+                          ("cached-prefix converter", StreamEventConverter.convert_queue_event)):
+        bench(convert, events[:1000])  # warm-up
+        elapsed = bench(convert, events)
+        print(f"{name:<36} {n / elapsed:>12,.0f} frames/s  ({elapsed * 1e6 / n:.2f} us/frame)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
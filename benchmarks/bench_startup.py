@@ -0,0 +1,54 @@
+"""
+Benchmark: process startup, from the first import to a compiled main graph.
+
+Each run is a fresh interpreter that imports app.main (what uvicorn does) and then builds
+the main graph the first request needs. Reports the wall time of both steps and the phase
+timings recorded by StartupTimer.
+
+Usage:
+    python benchmarks/bench_startup.py [runs]
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+
+_CHILD = """
+import json, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+from app.AI.supervisor_workflow.head_quarter.main_graph import get_main_graph
+get_main_graph()
+compiled = time.perf_counter()
+from app.utils.startup_timer import StartupTimer
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "graph_ms": (compiled - imported) * 1000,
+    "phases_ms": StartupTimer.get_instance().get_report()["phases_ms"],
+}))
+"""
+
+
+def run_once() -> dict:
+    result = subprocess.run([sys.executable, "-c", _CHILD], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    results = [run_once() for _ in range(runs)]
+
+    for key in ("import_ms", "graph_ms"):
+        values = [result[key] for result in results]
+        print(f"{key:<12} median {statistics.median(values):8.1f}  min {min(values):8.1f}  max {max(values):8.1f}")
+
+    print("phases (median ms):")
+    for phase in results[0]["phases_ms"]:
+        values = [result["phases_ms"].get(phase, 0.0) for result in results]
+        print(f"  {phase:<22} {statistics.median(values):8.1f}")
+
+
+if __name__ == "__main__":
+    main()
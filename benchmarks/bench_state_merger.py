@@ -0,0 +1,146 @@
+"""
+Microbenchmark: the supervisor state reducer.
+
+Compares the previous create_state_merger (walks model_fields and scans each field's
+metadata on every merge) with the precompiled merge plan. Every department completion
+merges one partial update into the supervisor state, so a plan with N tasks costs
+N merges of a growing state.
+
+Usage:
+    python benchmarks/bench_state_merger.py [repeats]
+"""
+
+import sys
+import time
+from operator import add, or_
+
+from app.AI.supervisor_workflow.shared.models.Assessment import Task, CompletedTask, TaskStatus
+from app.AI.supervisor_workflow.shared.models.Nodes import NodeNames_Dept
+from app.AI.supervisor_workflow.shared.models.state_models import SupervisorState
+from app.AI.supervisor_workflow.shared.utils.stateUtils import create_state_merger, upsert_by_task_id
+
+TASK_COUNTS = (1, 5, 10, 25, 50, 100)
+
+
+def legacy_create_state_merger(model_class):
+    """Previous implementation: scans model_fields and their metadata on every merge"""
+
+    def merge_states(left, right):
+        """
+        Generic state merger for concurrent updates.
+        Partial (dict) updates are merged field by field; a full model instance replaces the
+        state, which is how nodes reset it (e.g. a new turn or a new plan).
+        """
+        if isinstance(right, model_class):
+            return right
+
+        def get_field_value(obj, field_name):
+            """Get field value from either object or dict"""
+            if isinstance(obj, dict):
+                return obj.get(field_name)
+            return getattr(obj, field_name, None)
+
+        def merge_field(field_name, field_info, left_val, right_val):
+            """Merge field values based on operator annotations"""
+            # Check for operator annotations
+            if hasattr(field_info, 'metadata') and field_info.metadata:
+                for annotation in field_info.metadata:
+                    if annotation == add:
+                        # List concatenation: left + right
+                        left_list = left_val if left_val is not None else []
+                        right_list = right_val if right_val is not None else []
+                        return left_list + right_list
+                    elif annotation == or_:
+                        # Set union: left | right
+                        left_set = left_val if left_val is not None else set()
+                        right_set = right_val if right_val is not None else set()
+                        return left_set | right_set
+                    elif annotation == upsert_by_task_id:
+                        # Custom upsert behavior for task lists
+                        left_list = left_val if left_val is not None else []
+                        right_list = right_val if right_val is not None else []
+                        return upsert_by_task_id(left_list, right_list)
+
+            # No operator annotation - right wins (latest update)
+            return right_val if right_val is not None else left_val
+
+        # Build merged data for the model
+        merged_data = {}
+
+        # Process each field in the model
+        for field_name, field_info in model_class.model_fields.items():
+            left_val = get_field_value(left, field_name)
+            right_val = get_field_value(right, field_name)
+
+            # Skip fields not provided in partial updates (dicts)
+            if isinstance(right, dict) and field_name not in right:
+                merged_data[field_name] = left_val
+            else:
+                merged_data[field_name] = merge_field(field_name, field_info, left_val, right_val)
+
+        # Create new instance with merged data
+        return model_class(**{k: v for k, v in merged_data.items() if v is not None})
+
+    return merge_states
+
+
+def build_run(task_count: int):
+    """Initial state with task_count dispatched tasks, and one completion update per task"""
+    tasks = [
+        Task(
+            task_id=f"task_{i:03d}",
+            priority=1,
+            description=f"Task {i}",
+            expected_output="An answer",
+            suggested_department=NodeNames_Dept.GENERAL_KNOWLEDGE,
+        )
+        for i in range(task_count)
+    ]
+    initial = SupervisorState(dispatched_tasks=tasks, dispatched_task_ids={task.task_id for task in tasks})
+    updates = [
+        {
+            "completed_tasks": [CompletedTask(
+                task_id=task.task_id,
+                status=TaskStatus.SUCCESS,
+                from_department=NodeNames_Dept.GENERAL_KNOWLEDGE,
+                department_output="Done",
+            )],
+            "completed_task_ids": {task.task_id},
+        }
+        for task in tasks
+    ]
+    return initial, updates
+
+
+def run(merge, initial, updates):
+    state = initial
+    for update in updates:
+        state = merge(state, update)
+    return state
+
+
+def bench(merge, initial, updates, repeats: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeats):
+        run(merge, initial, updates)
+    return (time.perf_counter() - started) / repeats
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    legacy_merge = legacy_create_state_merger(SupervisorState)
+    planned_merge = create_state_merger(SupervisorState)
+
+    print(f"{'tasks':>6} {'legacy ms':>11} {'planned ms':>11} {'per merge us':>13} {'speedup':>8}")
+    for task_count in TASK_COUNTS:
+        initial, updates = build_run(task_count)
+        assert run(legacy_merge, initial, updates) == run(planned_merge, initial, updates)
+
+        legacy = bench(legacy_merge, initial, updates, repeats)
+        planned = bench(planned_merge, initial, updates, repeats)
+        print(f"{task_count:>6} {legacy * 1000:>11.3f} {planned * 1000:>11.3f} "
+              f"{planned / task_count * 1e6:>13.1f} {legacy / planned:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
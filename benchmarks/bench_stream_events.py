@@ -0,0 +1,46 @@
+"""
+Microbenchmark: in-process stream event path.
+
+Compares the legacy path (pydantic StreamEvent -> to_dict -> queue -> StreamEvent.from_dict)
+with the StreamRecord path (slotted record passed by reference through the queue).
+
+Usage:
+    python benchmarks/bench_stream_events.py [n_events]
+"""
+
+import asyncio
+import sys
+import time
+
+from app.AI.supervisor_workflow.shared.models.stream_models import StreamEvent
+from app.utils.stream_record import StreamRecord
+
+
+async def legacy_path(n: int) -> float:
+    queue: asyncio.Queue = asyncio.Queue()
+    start = time.perf_counter()
+    for i in range(n):
+        event = StreamEvent(event_type="thought", source="WebDepartment", content="x", segment_id=i, task_id="task_001")
+        await queue.put(event.to_dict())
+        StreamEvent.from_dict(await queue.get())
+    return time.perf_counter() - start
+
+
+async def record_path(n: int) -> float:
+    queue: asyncio.Queue = asyncio.Queue()
+    start = time.perf_counter()
+    for i in range(n):
+        await queue.put(StreamRecord(event_type="thought", source="WebDepartment", content="x", segment_id=i, task_id="task_001"))
+        await queue.get()
+    return time.perf_counter() - start
+
+
+async def main(n: int):
+    for name, bench in (("legacy StreamEvent dict round-trip", legacy_path), ("StreamRecord by reference", record_path)):
+        await bench(min(n, 1000))  # warm-up
+        elapsed = await bench(n)
+        print(f"{name:<36} {n / elapsed:>12,.0f} events/s  ({elapsed * 1e6 / n:.2f} us/event)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000))